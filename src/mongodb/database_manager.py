@@ -17,16 +17,20 @@ class DatabaseManager:
     """Manages MongoDB connections and provides access to collections."""
     
     def __init__(self, connection_string: str = "mongodb://localhost:27017/", 
-                 database_name: str = "birds_of_play"):
+                 database_name: str = "birds_of_play",
+                 client_options: Optional[Dict[str, Any]] = None):
         """
         Initialize the database manager.
         
         Args:
             connection_string: MongoDB connection string
             database_name: Name of the database to use
+            client_options: Extra keyword arguments for MongoClient
+                (pool size, compressors, timeouts, ...)
         """
         self.connection_string = connection_string
         self.database_name = database_name
+        self.client_options = client_options or {}
         self.client: Optional[MongoClient] = None
         self.database: Optional[Database] = None
         self._collections: Dict[str, Collection] = {}
@@ -42,7 +46,7 @@ class DatabaseManager:
             True if connection successful, False otherwise
         """
         try:
-            self.client = MongoClient(self.connection_string)
+            self.client = MongoClient(self.connection_string, **self.client_options)
             # Test the connection
             self.client.admin.command('ping')
             
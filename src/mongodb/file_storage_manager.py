@@ -6,14 +6,91 @@ This replaces the inefficient base64 storage in MongoDB documents.
 """
 
 import os
+import mmap
 import uuid
 import shutil
 import logging
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
 import cv2
 import numpy as np
 from datetime import datetime
+from functools import lru_cache
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJPF_GRAY, TJSAMP_420, TJSAMP_GRAY
+    _turbo_jpeg = TurboJPEG()
+    HAS_TURBOJPEG = True
+except (ImportError, OSError, RuntimeError):
+    # Python package or the libturbojpeg shared library is missing
+    HAS_TURBOJPEG = False
+
+JPEG_MAGIC = b"\xff\xd8"
+
+# Pack files roll over once they reach this size
+PACK_MAX_BYTES = 1024 * 1024 * 1024
+
+# Baseline, non-optimised JPEG: the fastest libjpeg encode path
+JPEG_ENCODE_FLAGS = [cv2.IMWRITE_JPEG_PROGRESSIVE, 0, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+
+
+def encode_jpeg(image: np.ndarray, quality: int = 95) -> Optional[bytes]:
+    """
+    Encode a BGR image as baseline 4:2:0 JPEG (or a single-channel image
+    as grayscale JPEG).
+    
+    Uses libjpeg-turbo's SIMD encoder when available, otherwise OpenCV
+    with progressive and Huffman optimisation explicitly disabled.
+    
+    Args:
+        image: OpenCV image (numpy array)
+        quality: JPEG quality (1-100)
+        
+    Returns:
+        Encoded JPEG bytes or None if encoding failed
+    """
+    if HAS_TURBOJPEG:
+        if image.ndim == 2:
+            return _turbo_jpeg.encode(image[:, :, np.newaxis], quality=quality, pixel_format=TJPF_GRAY,
+                                      jpeg_subsample=TJSAMP_GRAY)
+        return _turbo_jpeg.encode(image, quality=quality, pixel_format=TJPF_BGR,
+                                  jpeg_subsample=TJSAMP_420)
+    
+    success, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality] + JPEG_ENCODE_FLAGS)
+    return buffer.tobytes() if success else None
+
+
+def decode_jpeg(data: bytes, keep_grayscale: bool = False) -> Optional[np.ndarray]:
+    """
+    Decode encoded image bytes to a BGR image.
+    
+    JPEGs are decoded with libjpeg-turbo when available; anything else,
+    or a JPEG turbojpeg rejects, goes through cv2.imdecode.
+    
+    Args:
+        data: Encoded image bytes
+        keep_grayscale: If True, decode grayscale JPEGs (e.g. color=False
+            thumbnails) to a single channel instead of expanding them to BGR
+        
+    Returns:
+        Decoded BGR (or single-channel) image or None if decoding failed
+    """
+    if HAS_TURBOJPEG and data[:2] == JPEG_MAGIC:
+        try:
+            if keep_grayscale and _turbo_jpeg.decode_header(data)[2] == TJSAMP_GRAY:
+                return _turbo_jpeg.decode(data, pixel_format=TJPF_GRAY)[:, :, 0]
+            return _turbo_jpeg.decode(data, pixel_format=TJPF_BGR)
+        except OSError as e:
+            logging.getLogger(__name__).debug(f"turbojpeg decode failed, falling back to OpenCV: {e}")
+    flags = cv2.IMREAD_UNCHANGED if keep_grayscale else cv2.IMREAD_COLOR
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flags)
+
+
+@lru_cache(maxsize=4096)
+def _ensure_shard_dir(shard_dir: str) -> None:
+    """Create a shard directory once per process; later calls are cache hits."""
+    os.makedirs(shard_dir, exist_ok=True)
+
 
 class FileStorageManager:
     """Manages local file storage for frame images with UUID-based organization."""
@@ -30,8 +107,14 @@ class FileStorageManager:
         self.processed_path = self.base_path / "processed"
         self.original_thumbnails_path = self.base_path / "original_thumbnails"
         self.processed_thumbnails_path = self.base_path / "processed_thumbnails"
+        self.packs_path = self.base_path / "packs"
         self.logger = logging.getLogger(__name__)
         
+        # Pack file state: appends and mmap refreshes are serialised
+        self._pack_lock = threading.Lock()
+        self._pack_index: Optional[int] = None
+        self._pack_maps: Dict[str, mmap.mmap] = {}
+        
         # Create directory structure
         self._ensure_directories()
         
@@ -47,6 +130,50 @@ class FileStorageManager:
             self.logger.error(f"Failed to create storage directories: {e}")
             raise
     
+    def _frame_file_path(self, storage_path: Path, frame_uuid: str, create: bool = False) -> Path:
+        """
+        Build the sharded path for a frame file: ``<storage>/ab/cd/<uuid>.jpg``.
+        
+        Two levels of UUID-prefix buckets keep every directory small, so
+        lookups stay cheap as the frame count grows.
+        
+        Args:
+            storage_path: Image directory (original, processed or a thumbnail dir)
+            frame_uuid: Unique identifier for the frame
+            create: Create the shard directory if needed (for writes)
+            
+        Returns:
+            Path to the frame file
+        """
+        shard_dir = storage_path / frame_uuid[:2] / frame_uuid[2:4]
+        if create:
+            _ensure_shard_dir(str(shard_dir))
+        return shard_dir / f"{frame_uuid}.jpg"
+    
+    def _existing_file_path(self, storage_path: Path, frame_uuid: str) -> Path:
+        """Resolve a frame file, falling back to the legacy flat layout."""
+        file_path = self._frame_file_path(storage_path, frame_uuid)
+        if not file_path.exists():
+            flat_path = storage_path / f"{frame_uuid}.jpg"
+            if flat_path.exists():
+                return flat_path
+        return file_path
+    
+    def _read_image(self, file_path: Path, keep_grayscale: bool = False) -> Optional[np.ndarray]:
+        """
+        Read and decode an image file.
+        
+        Args:
+            file_path: Image file to read
+            keep_grayscale: If True, grayscale JPEGs stay single-channel
+            
+        Returns:
+            Decoded BGR (or single-channel) image or None if decoding failed
+        """
+        if HAS_TURBOJPEG:
+            return decode_jpeg(file_path.read_bytes(), keep_grayscale)
+        return cv2.imread(str(file_path), cv2.IMREAD_UNCHANGED if keep_grayscale else cv2.IMREAD_COLOR)
+    
     def save_frame(self, frame: np.ndarray, frame_uuid: str, 
                    image_type: str = "processed", quality: int = 95) -> Optional[str]:
         """
@@ -70,15 +197,13 @@ class FileStorageManager:
             else:
                 raise ValueError(f"Invalid image_type: {image_type}")
             
-            # Create filename with UUID
-            filename = f"{frame_uuid}.jpg"
-            file_path = storage_path / filename
+            file_path = self._frame_file_path(storage_path, frame_uuid, create=True)
             
             # Save image with specified quality
-            success = cv2.imwrite(str(file_path), frame, 
-                                [cv2.IMWRITE_JPEG_QUALITY, quality])
+            jpeg_bytes = encode_jpeg(frame, quality)
             
-            if success:
+            if jpeg_bytes is not None:
+                file_path.write_bytes(jpeg_bytes)
                 self.logger.debug(f"Saved {image_type} frame: {file_path}")
                 return str(file_path)
             else:
@@ -89,8 +214,41 @@ class FileStorageManager:
             self.logger.error(f"Error saving {image_type} frame {frame_uuid}: {e}")
             return None
     
+    def save_encoded_frame(self, jpeg_bytes: bytes, frame_uuid: str,
+                           image_type: str = "processed") -> Optional[str]:
+        """
+        Save an already JPEG-encoded frame to local storage as-is.
+        
+        Args:
+            jpeg_bytes: JPEG-encoded frame
+            frame_uuid: Unique identifier for the frame
+            image_type: Type of image ("original" or "processed")
+            
+        Returns:
+            Path to saved image file or None if failed
+        """
+        try:
+            # Determine storage path
+            if image_type == "original":
+                storage_path = self.original_path
+            elif image_type == "processed":
+                storage_path = self.processed_path
+            else:
+                raise ValueError(f"Invalid image_type: {image_type}")
+            
+            file_path = self._frame_file_path(storage_path, frame_uuid, create=True)
+            file_path.write_bytes(jpeg_bytes)
+            
+            self.logger.debug(f"Saved encoded {image_type} frame: {file_path}")
+            return str(file_path)
+                
+        except Exception as e:
+            self.logger.error(f"Error saving encoded {image_type} frame {frame_uuid}: {e}")
+            return None
+    
     def save_thumbnail(self, frame: np.ndarray, frame_uuid: str, 
-                      image_type: str = "processed", thumbnail_size: Tuple[int, int] = (320, 240)) -> Optional[str]:
+                      image_type: str = "processed", thumbnail_size: Tuple[int, int] = (320, 240),
+                      color: bool = True) -> Optional[str]:
         """
         Save a thumbnail version of a frame.
         
@@ -99,6 +257,8 @@ class FileStorageManager:
             frame_uuid: Unique identifier for the frame
             image_type: Type of image ("original" or "processed")
             thumbnail_size: Size of thumbnail (width, height)
+            color: If False, store a single-channel grayscale JPEG, which is
+                smaller and cheaper to encode and decode
             
         Returns:
             Path to saved thumbnail file or None if failed
@@ -112,18 +272,18 @@ class FileStorageManager:
             else:
                 raise ValueError(f"Invalid image_type: {image_type}")
             
-            # Create filename with UUID
-            filename = f"{frame_uuid}.jpg"
-            file_path = storage_path / filename
+            file_path = self._frame_file_path(storage_path, frame_uuid, create=True)
             
             # Resize frame to thumbnail size
             thumbnail = cv2.resize(frame, thumbnail_size, interpolation=cv2.INTER_AREA)
+            if not color and thumbnail.ndim == 3:
+                thumbnail = cv2.cvtColor(thumbnail, cv2.COLOR_BGR2GRAY)
             
             # Save thumbnail with lower quality for smaller file size
-            success = cv2.imwrite(str(file_path), thumbnail, 
-                                [cv2.IMWRITE_JPEG_QUALITY, 75])
+            jpeg_bytes = encode_jpeg(thumbnail, 75)
             
-            if success:
+            if jpeg_bytes is not None:
+                file_path.write_bytes(jpeg_bytes)
                 self.logger.debug(f"Saved {image_type} thumbnail: {file_path}")
                 return str(file_path)
             else:
@@ -154,16 +314,16 @@ class FileStorageManager:
             else:
                 raise ValueError(f"Invalid image_type: {image_type}")
             
-            # Create filename with UUID
-            filename = f"{frame_uuid}.jpg"
-            file_path = storage_path / filename
+            file_path = self._existing_file_path(storage_path, frame_uuid)
             
             if not file_path.exists():
                 self.logger.warning(f"Thumbnail not found: {file_path}")
                 return None
             
             # Load thumbnail
-            thumbnail = cv2.imread(str(file_path))
+            # Grayscale thumbnails stay single-channel; expanding them to BGR
+            # would give back the decode savings of storing them as gray
+            thumbnail = self._read_image(file_path, keep_grayscale=True)
             if thumbnail is not None:
                 self.logger.debug(f"Loaded {image_type} thumbnail: {file_path}")
                 return thumbnail
@@ -190,7 +350,7 @@ class FileStorageManager:
             success = True
             
             if image_type in ["original", "both"]:
-                original_path = self.original_thumbnails_path / f"{frame_uuid}.jpg"
+                original_path = self._existing_file_path(self.original_thumbnails_path, frame_uuid)
                 if original_path.exists():
                     original_path.unlink()
                     self.logger.debug(f"Deleted original thumbnail: {original_path}")
@@ -198,7 +358,7 @@ class FileStorageManager:
                     self.logger.warning(f"Original thumbnail not found: {original_path}")
             
             if image_type in ["processed", "both"]:
-                processed_path = self.processed_thumbnails_path / f"{frame_uuid}.jpg"
+                processed_path = self._existing_file_path(self.processed_thumbnails_path, frame_uuid)
                 if processed_path.exists():
                     processed_path.unlink()
                     self.logger.debug(f"Deleted processed thumbnail: {processed_path}")
@@ -238,7 +398,7 @@ class FileStorageManager:
                 processed_thumbnail_path = self.save_thumbnail(processed_frame, frame_uuid, "processed")
             
             if original_path and processed_path:
-                self.logger.info(f"Saved both frames for UUID: {frame_uuid}")
+                self.logger.debug("Saved both frames for UUID: %s", frame_uuid)
                 return original_path, processed_path, original_thumbnail_path, processed_thumbnail_path
             else:
                 # Clean up partial saves
@@ -276,16 +436,14 @@ class FileStorageManager:
             else:
                 raise ValueError(f"Invalid image_type: {image_type}")
             
-            # Create filename with UUID
-            filename = f"{frame_uuid}.jpg"
-            file_path = storage_path / filename
+            file_path = self._existing_file_path(storage_path, frame_uuid)
             
             if not file_path.exists():
                 self.logger.warning(f"Frame not found: {file_path}")
                 return None
             
             # Load image
-            frame = cv2.imread(str(file_path))
+            frame = self._read_image(file_path)
             if frame is not None:
                 self.logger.debug(f"Loaded {image_type} frame: {file_path}")
                 return frame
@@ -312,7 +470,7 @@ class FileStorageManager:
             success = True
             
             if image_type in ["original", "both"]:
-                original_path = self.original_path / f"{frame_uuid}.jpg"
+                original_path = self._existing_file_path(self.original_path, frame_uuid)
                 if original_path.exists():
                     original_path.unlink()
                     self.logger.debug(f"Deleted original frame: {original_path}")
@@ -320,7 +478,7 @@ class FileStorageManager:
                     self.logger.warning(f"Original frame not found: {original_path}")
             
             if image_type in ["processed", "both"]:
-                processed_path = self.processed_path / f"{frame_uuid}.jpg"
+                processed_path = self._existing_file_path(self.processed_path, frame_uuid)
                 if processed_path.exists():
                     processed_path.unlink()
                     self.logger.debug(f"Deleted processed frame: {processed_path}")
@@ -349,8 +507,8 @@ class FileStorageManager:
             success = True
             
             # Delete full-resolution images
-            original_path = self.original_path / f"{frame_uuid}.jpg"
-            processed_path = self.processed_path / f"{frame_uuid}.jpg"
+            original_path = self._existing_file_path(self.original_path, frame_uuid)
+            processed_path = self._existing_file_path(self.processed_path, frame_uuid)
             
             if original_path.exists():
                 original_path.unlink()
@@ -389,13 +547,13 @@ class FileStorageManager:
         """
         try:
             if image_type == "both":
-                original_exists = (self.original_path / f"{frame_uuid}.jpg").exists()
-                processed_exists = (self.processed_path / f"{frame_uuid}.jpg").exists()
+                original_exists = (self._existing_file_path(self.original_path, frame_uuid)).exists()
+                processed_exists = (self._existing_file_path(self.processed_path, frame_uuid)).exists()
                 return original_exists and processed_exists
             elif image_type == "original":
-                return (self.original_path / f"{frame_uuid}.jpg").exists()
+                return (self._existing_file_path(self.original_path, frame_uuid)).exists()
             elif image_type == "processed":
-                return (self.processed_path / f"{frame_uuid}.jpg").exists()
+                return (self._existing_file_path(self.processed_path, frame_uuid)).exists()
             else:
                 raise ValueError(f"Invalid image_type: {image_type}")
                 
@@ -424,13 +582,13 @@ class FileStorageManager:
             
             # Count original frames
             if self.original_path.exists():
-                original_files = list(self.original_path.glob("*.jpg"))
+                original_files = list(self.original_path.rglob("*.jpg"))
                 stats["original_count"] = len(original_files)
                 stats["original_size_bytes"] = sum(f.stat().st_size for f in original_files)
             
             # Count processed frames
             if self.processed_path.exists():
-                processed_files = list(self.processed_path.glob("*.jpg"))
+                processed_files = list(self.processed_path.rglob("*.jpg"))
                 stats["processed_count"] = len(processed_files)
                 stats["processed_size_bytes"] = sum(f.stat().st_size for f in processed_files)
             
@@ -458,7 +616,7 @@ class FileStorageManager:
             
             # Clean up original frames
             if self.original_path.exists():
-                for file_path in self.original_path.glob("*.jpg"):
+                for file_path in self.original_path.rglob("*.jpg"):
                     if file_path.stat().st_mtime < cutoff_time:
                         file_path.unlink()
                         deleted_count += 1
@@ -466,7 +624,7 @@ class FileStorageManager:
             
             # Clean up processed frames
             if self.processed_path.exists():
-                for file_path in self.processed_path.glob("*.jpg"):
+                for file_path in self.processed_path.rglob("*.jpg"):
                     if file_path.stat().st_mtime < cutoff_time:
                         file_path.unlink()
                         deleted_count += 1
@@ -480,3 +638,151 @@ class FileStorageManager:
         except Exception as e:
             self.logger.error(f"Error cleaning up old frames: {e}")
             return 0
+    
+    def shard_existing_files(self) -> int:
+        """
+        Move frames written with the old flat layout into UUID-prefix shards.
+        
+        Safe to re-run: files already inside a shard are left alone.
+        
+        Returns:
+            Number of files moved
+        """
+        moved_count = 0
+        for storage_path in (self.original_path, self.processed_path,
+                             self.original_thumbnails_path, self.processed_thumbnails_path):
+            if not storage_path.exists():
+                continue
+            try:
+                with os.scandir(storage_path) as entries:
+                    flat_files = [entry.name for entry in entries
+                                  if entry.is_file() and entry.name.endswith(".jpg")]
+                for name in flat_files:
+                    frame_uuid = name[:-len(".jpg")]
+                    target = self._frame_file_path(storage_path, frame_uuid, create=True)
+                    os.replace(storage_path / name, target)
+                    moved_count += 1
+            except Exception as e:
+                self.logger.error(f"Error sharding files in {storage_path}: {e}")
+        
+        if moved_count > 0:
+            self.logger.info(f"Moved {moved_count} flat frame files into shards")
+        
+        return moved_count
+    
+    def _current_pack_path(self) -> Path:
+        """Return the pack file to append to, rolling over full packs (lock held)."""
+        if self._pack_index is None:
+            # Compare pack numbers as integers: frames_shard1000 sorts before
+            # frames_shard999 as a string
+            self._pack_index = max((int(pack_path.stem[len("frames_shard"):])
+                                    for pack_path in self.packs_path.glob("frames_shard*.pack")), default=0)
+        
+        pack_path = self.packs_path / f"frames_shard{self._pack_index:03d}.pack"
+        if pack_path.exists() and pack_path.stat().st_size >= PACK_MAX_BYTES:
+            self._pack_index += 1
+            pack_path = self.packs_path / f"frames_shard{self._pack_index:03d}.pack"
+        return pack_path
+    
+    def save_frames_packed(self, frame_uuids: List[str],
+                           jpeg_frames: List[bytes]) -> Dict[str, Dict[str, Any]]:
+        """
+        Append encoded frames to a shared pack file instead of one file each.
+        
+        A batch costs one open and one write regardless of its size, and
+        reads map the pack once instead of opening a file per frame. Packs
+        roll over after PACK_MAX_BYTES (a batch never spans two packs).
+        
+        Args:
+            frame_uuids: Unique identifiers for the frames
+            jpeg_frames: JPEG-encoded frames (same order as frame_uuids)
+            
+        Returns:
+            Mapping of frame UUID to its location
+            ({"pack_file", "pack_offset", "pack_length"}); empty if failed
+        """
+        try:
+            with self._pack_lock:
+                self.packs_path.mkdir(parents=True, exist_ok=True)
+                pack_path = self._current_pack_path()
+                
+                with open(pack_path, "ab") as pack:
+                    offset = pack.tell()
+                    pack.write(b"".join(jpeg_frames))
+            
+            locations = {}
+            for frame_uuid, jpeg_bytes in zip(frame_uuids, jpeg_frames):
+                locations[frame_uuid] = {
+                    "pack_file": pack_path.name,
+                    "pack_offset": offset,
+                    "pack_length": len(jpeg_bytes)
+                }
+                offset += len(jpeg_bytes)
+            
+            self.logger.debug(f"Packed {len(locations)} frames into {pack_path}")
+            return locations
+            
+        except Exception as e:
+            self.logger.error(f"Error packing {len(frame_uuids)} frames: {e}")
+            return {}
+    
+    def load_packed_frame(self, pack_file: str, offset: int, length: int) -> Optional[np.ndarray]:
+        """
+        Load a frame stored in a pack file.
+        
+        Each pack is memory-mapped once and re-mapped only when it has
+        grown past the requested range.
+        
+        Args:
+            pack_file: Pack file name (as returned by save_frames_packed)
+            offset: Byte offset of the frame in the pack
+            length: Encoded length of the frame
+            
+        Returns:
+            OpenCV frame (numpy array) or None if not found
+        """
+        try:
+            with self._pack_lock:
+                pack_map = self._pack_maps.get(pack_file)
+                if pack_map is None or offset + length > len(pack_map):
+                    # Superseded maps are left to the garbage collector rather
+                    # than closed, since other threads may still be slicing them
+                    with open(self.packs_path / pack_file, "rb") as pack:
+                        pack_map = mmap.mmap(pack.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._pack_maps[pack_file] = pack_map
+            
+            # Copy the slice outside the lock so parallel reads don't serialize
+            data = pack_map[offset:offset + length]
+            
+            frame = decode_jpeg(data)
+            if frame is None:
+                self.logger.error(f"Failed to decode packed frame: {pack_file}@{offset}")
+            return frame
+            
+        except Exception as e:
+            self.logger.error(f"Error loading packed frame {pack_file}@{offset}: {e}")
+            return None
+    
+    def delete_all_packs(self) -> int:
+        """
+        Delete every pack file under this storage path.
+        
+        Pack files are shared by many frames, so they can only be removed
+        as a whole (e.g. for benchmark storage).
+        
+        Returns:
+            Number of pack files deleted
+        """
+        deleted_count = 0
+        with self._pack_lock:
+            for pack_map in self._pack_maps.values():
+                pack_map.close()
+            self._pack_maps.clear()
+            self._pack_index = None
+            
+            if self.packs_path.exists():
+                for pack_path in self.packs_path.glob("frames_shard*.pack"):
+                    pack_path.unlink()
+                    deleted_count += 1
+        
+        return deleted_count
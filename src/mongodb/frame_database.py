@@ -7,13 +7,46 @@ Handles storage and retrieval of captured frames with associated metadata.
 import uuid
 import base64
 import logging
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
-import cv2
 import numpy as np
 from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+from pymongo.write_concern import WriteConcern
+try:
+    import pybase64
+    HAS_PYBASE64 = True
+except ImportError:
+    HAS_PYBASE64 = False
 
 from .database_manager import DatabaseManager
+from .file_storage_manager import encode_jpeg, decode_jpeg
+
+# Fire-and-forget writes for throughput benchmarks; failures go unreported
+UNACKNOWLEDGED = WriteConcern(w=0)
+
+# Limits for one insert_many call; base64 frames are large, so the byte cap
+# keeps each batch well below MongoDB's 16 MB message size
+BULK_INSERT_MAX_DOCS = 100
+BULK_INSERT_MAX_BYTES = 12 * 1024 * 1024
+
+# Default projection for metadata reads: leave every base64 image on the server
+METADATA_PROJECTION = {"frame_data": 0, "original_frame_data": 0}
+
+
+def _b64encode(data: bytes) -> str:
+    """Base64-encode bytes to str, using SIMD pybase64 when available."""
+    if HAS_PYBASE64:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode('ascii')
+
+
+def _b64decode(encoded: str) -> bytes:
+    """Base64-decode a str, using SIMD pybase64 when available."""
+    if HAS_PYBASE64:
+        return pybase64.b64decode(encoded)
+    return base64.b64decode(encoded)
 
 
 class FrameDatabase:
@@ -42,14 +75,29 @@ class FrameDatabase:
         """
         try:
             # Encode frame as JPEG
-            _, buffer = cv2.imencode('.jpg', frame)
+            buffer = encode_jpeg(frame)
+            if buffer is None:
+                self.logger.error("Failed to encode frame as JPEG")
+                return ""
             # Convert to base64
-            encoded = base64.b64encode(buffer).decode('utf-8')
+            encoded = _b64encode(buffer)
             return encoded
         except Exception as e:
             self.logger.error(f"Failed to encode frame: {e}")
             return ""
     
+    def _encode_jpeg_bytes(self, jpeg_bytes: bytes) -> str:
+        """
+        Base64-encode an already JPEG-encoded frame.
+        
+        Args:
+            jpeg_bytes: JPEG-encoded frame
+            
+        Returns:
+            Base64 encoded string of the frame
+        """
+        return _b64encode(jpeg_bytes)
+    
     def _decode_frame(self, encoded_frame: str) -> Optional[np.ndarray]:
         """
         Decode a base64 string back to frame.
@@ -62,10 +110,9 @@ class FrameDatabase:
         """
         try:
             # Decode base64
-            buffer = base64.b64decode(encoded_frame)
-            # Decode JPEG
-            frame = cv2.imdecode(np.frombuffer(buffer, np.uint8), cv2.IMREAD_COLOR)
-            return frame
+            buffer = _b64decode(encoded_frame)
+            # Decode JPEG, preferring libjpeg-turbo's SIMD decoder
+            return decode_jpeg(buffer)
         except Exception as e:
             self.logger.error(f"Failed to decode frame: {e}")
             return None
@@ -119,6 +166,49 @@ class FrameDatabase:
             self.logger.error(f"Failed to save frame: {e}")
             return None
     
+    def save_frame_preencoded(self, jpeg_bytes: bytes, frame_shape: Tuple[int, ...],
+                              metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Save an already JPEG-encoded frame, skipping the OpenCV encode.
+        
+        Args:
+            jpeg_bytes: JPEG-encoded frame
+            frame_shape: Shape of the decoded frame
+            metadata: Additional metadata to store with the frame
+            
+        Returns:
+            UUID of the saved frame or None if failed
+        """
+        try:
+            collection = self.db_manager.get_collection(self.collection_name)
+            if collection is None:
+                return None
+            
+            frame_uuid = str(uuid.uuid4())
+            
+            document = {
+                "_id": frame_uuid,
+                "frame_data": self._encode_jpeg_bytes(jpeg_bytes),
+                "frame_shape": frame_shape,
+                "frame_dtype": "uint8",
+                "timestamp": datetime.utcnow(),
+                "created_at": datetime.utcnow(),
+                "metadata": metadata or {}
+            }
+            
+            result = collection.insert_one(document)
+            
+            if result.inserted_id:
+                self.logger.info(f"Saved pre-encoded frame with UUID: {frame_uuid}")
+                return frame_uuid
+            else:
+                self.logger.error("Failed to insert frame into database")
+                return None
+                
+        except Exception as e:
+            self.logger.error(f"Failed to save pre-encoded frame: {e}")
+            return None
+    
     def save_frame_with_original(self, original_frame: np.ndarray, processed_frame: np.ndarray, 
                                 metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """
@@ -175,6 +265,113 @@ class FrameDatabase:
             self.logger.error(f"Failed to save frame with original: {e}")
             return None
     
+    def save_frames_bulk(self, frames: List[np.ndarray],
+                         metadatas: Optional[List[Optional[Dict[str, Any]]]] = None,
+                         workers: int = 1,
+                         jpeg_frames: Optional[List[bytes]] = None,
+                         acknowledged: bool = True) -> List[str]:
+        """
+        Save many frames using batched insert_many calls.
+        
+        Frames are inserted in chunks bounded by both document count and
+        encoded size. With several workers, JPEG encoding (which releases
+        the GIL) runs in a thread pool while this thread inserts the
+        batches that are already complete.
+        
+        Args:
+            frames: OpenCV frames to save
+            metadatas: Metadata for each frame (same order as frames)
+            workers: Number of encoder threads
+            jpeg_frames: Already JPEG-encoded frames (same order as frames);
+                when given, only the base64 step is performed
+            acknowledged: If False, insert with w=0 and skip the server
+                acknowledgement; failed inserts are then not detected
+            
+        Returns:
+            UUIDs of the saved frames
+        """
+        try:
+            collection = self.db_manager.get_collection(self.collection_name)
+            if collection is None:
+                return []
+            
+            if not acknowledged:
+                collection = collection.with_options(write_concern=UNACKNOWLEDGED)
+            
+            if metadatas is None:
+                metadatas = [None] * len(frames)
+            
+            saved_uuids = []
+            batch = []
+            batch_bytes = 0
+            
+            executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+            try:
+                if jpeg_frames is not None:
+                    encode, inputs = self._encode_jpeg_bytes, jpeg_frames
+                else:
+                    encode, inputs = self._encode_frame, frames
+                
+                # Encoded results arrive in input order as workers finish them
+                if executor is not None:
+                    encoded_frames = executor.map(encode, inputs)
+                else:
+                    encoded_frames = map(encode, inputs)
+                
+                for frame, metadata, encoded_frame in zip(frames, metadatas, encoded_frames):
+                    if not encoded_frame:
+                        continue
+                    
+                    if batch and (len(batch) >= BULK_INSERT_MAX_DOCS or
+                                  batch_bytes + len(encoded_frame) > BULK_INSERT_MAX_BYTES):
+                        saved_uuids.extend(self._insert_documents(collection, batch))
+                        batch = []
+                        batch_bytes = 0
+                    
+                    batch.append({
+                        "_id": str(uuid.uuid4()),
+                        "frame_data": encoded_frame,
+                        "frame_shape": frame.shape,
+                        "frame_dtype": str(frame.dtype),
+                        "timestamp": datetime.utcnow(),
+                        "created_at": datetime.utcnow(),
+                        "metadata": metadata or {}
+                    })
+                    batch_bytes += len(encoded_frame)
+                
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=True)
+            
+            if batch:
+                saved_uuids.extend(self._insert_documents(collection, batch))
+            
+            self.logger.info(f"Saved {len(saved_uuids)} of {len(frames)} frames in bulk")
+            return saved_uuids
+            
+        except Exception as e:
+            self.logger.error(f"Failed to save frames in bulk: {e}")
+            return []
+    
+    def _insert_documents(self, collection: Collection, documents: List[Dict[str, Any]]) -> List[str]:
+        """
+        Insert a batch of frame documents with one unordered insert_many.
+        
+        Args:
+            collection: Target collection
+            documents: Frame documents to insert
+            
+        Returns:
+            UUIDs of the documents that were inserted
+        """
+        try:
+            collection.insert_many(documents, ordered=False)
+            return [document["_id"] for document in documents]
+        except BulkWriteError as e:
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            self.logger.error(f"Bulk insert failed for {len(failed)} of {len(documents)} frames")
+            return [document["_id"] for index, document in enumerate(documents) if index not in failed]
+    
     def get_frame(self, frame_uuid: str) -> Optional[np.ndarray]:
         """
         Retrieve a frame by UUID.
@@ -250,12 +447,14 @@ class FrameDatabase:
             self.logger.error(f"Failed to retrieve original frame: {e}")
             return None
     
-    def get_frame_metadata(self, frame_uuid: str) -> Optional[Dict[str, Any]]:
+    def get_frame_metadata(self, frame_uuid: str,
+                           projection: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
         """
         Get metadata for a frame without loading the frame data.
         
         Args:
             frame_uuid: UUID of the frame
+            projection: MongoDB projection; defaults to excluding all base64 image fields
             
         Returns:
             Frame metadata or None if not found
@@ -265,10 +464,10 @@ class FrameDatabase:
             if collection is None:
                 return None
             
-            # Find document by UUID, excluding frame data
+            # Find document by UUID, excluding frame data to save bandwidth
             document = collection.find_one(
                 {"_id": frame_uuid}, 
-                {"frame_data": 0}  # Exclude frame data to save bandwidth
+                projection if projection is not None else METADATA_PROJECTION
             )
             
             if not document:
@@ -281,6 +480,86 @@ class FrameDatabase:
             self.logger.error(f"Failed to retrieve frame metadata {frame_uuid}: {e}")
             return None
     
+    def get_many_metadata(self, frame_uuids: List[str],
+                          projection: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        """
+        Get metadata for several frames with a single query.
+        
+        Args:
+            frame_uuids: UUIDs of the frames
+            projection: MongoDB projection; defaults to excluding all base64 image fields
+            
+        Returns:
+            List of frame metadata dictionaries (frames not found are omitted)
+        """
+        try:
+            collection = self.db_manager.get_collection(self.collection_name)
+            if collection is None:
+                return []
+            
+            frame_uuids = list(frame_uuids)
+            cursor = collection.find(
+                {"_id": {"$in": frame_uuids}},
+                projection if projection is not None else METADATA_PROJECTION
+            ).batch_size(max(len(frame_uuids), 1))
+            
+            return list(cursor)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve metadata for {len(frame_uuids)} frames: {e}")
+            return []
+    
+    def get_frames(self, frame_uuids: List[str], workers: int = 1) -> List[Optional[np.ndarray]]:
+        """
+        Retrieve several frames with a single query.
+        
+        With several workers, frames are decoded in a thread pool while
+        the rest of the cursor is still being read.
+        
+        Args:
+            frame_uuids: UUIDs of the frames to retrieve
+            workers: Number of threads decoding frames
+            
+        Returns:
+            Frames in the order of frame_uuids (None for frames not found)
+        """
+        try:
+            collection = self.db_manager.get_collection(self.collection_name)
+            if collection is None:
+                return [None] * len(frame_uuids)
+            
+            frame_uuids = list(frame_uuids)
+            cursor = collection.find(
+                {"_id": {"$in": frame_uuids}},
+                {"frame_data": 1}
+            ).batch_size(max(len(frame_uuids), 1))
+            
+            executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+            try:
+                # Start decoding each frame as soon as its document comes off the
+                # cursor, overlapping decode work with the remaining fetches
+                decoded = {}
+                for document in cursor:
+                    encoded_frame = document.get("frame_data", "")
+                    if not encoded_frame:
+                        continue
+                    if executor is not None:
+                        decoded[document["_id"]] = executor.submit(self._decode_frame, encoded_frame)
+                    else:
+                        decoded[document["_id"]] = self._decode_frame(encoded_frame)
+                
+                if executor is not None:
+                    decoded = {frame_uuid: future.result() for frame_uuid, future in decoded.items()}
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=True)
+            
+            return [decoded.get(frame_uuid) for frame_uuid in frame_uuids]
+            
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve {len(frame_uuids)} frames: {e}")
+            return [None] * len(frame_uuids)
+    
     def list_frames(self, limit: int = 100, skip: int = 0) -> List[Dict[str, Any]]:
         """
         List frames in the database (metadata only, no frame data).
@@ -339,6 +618,29 @@ class FrameDatabase:
             self.logger.error(f"Failed to delete frame {frame_uuid}: {e}")
             return False
     
+    def delete_frames_bulk(self, frame_uuids: List[str]) -> int:
+        """
+        Delete many frames with a single delete_many.
+        
+        Args:
+            frame_uuids: UUIDs of the frames to delete
+            
+        Returns:
+            Number of frames deleted
+        """
+        try:
+            collection = self.db_manager.get_collection(self.collection_name)
+            if collection is None:
+                return 0
+            
+            result = collection.delete_many({"_id": {"$in": list(frame_uuids)}})
+            self.logger.info(f"Deleted {result.deleted_count} of {len(frame_uuids)} frames")
+            return result.deleted_count
+                
+        except Exception as e:
+            self.logger.error(f"Failed to delete frames in bulk: {e}")
+            return 0
+    
     def get_frame_count(self) -> int:
         """
         Get total number of frames in the database.
@@ -7,33 +7,58 @@ This replaces the inefficient base64 storage approach.
 
 import uuid
 import logging
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 import cv2
 import numpy as np
 from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+from pymongo.write_concern import WriteConcern
 
 from .database_manager import DatabaseManager
 from .file_storage_manager import FileStorageManager
+from .lmdb_storage_manager import LMDBStorageManager
+
+# Fire-and-forget writes for throughput benchmarks; failures go unreported
+UNACKNOWLEDGED = WriteConcern(w=0)
+
+# Documents per insert_many call; documents hold only metadata and paths
+BULK_INSERT_MAX_DOCS = 100
+
+# Default projection for metadata reads
+METADATA_PROJECTION = {"_id": 1, "frame_shape": 1, "original_frame_shape": 1,
+                       "frame_dtype": 1, "original_frame_dtype": 1,
+                       "timestamp": 1, "created_at": 1, "metadata": 1,
+                       "original_image_path": 1, "processed_image_path": 1}
 
 
 class FrameDatabaseV2:
     """Manages frame storage using local files with MongoDB metadata."""
     
-    def __init__(self, db_manager: DatabaseManager, storage_path: str = "data/frames"):
+    def __init__(self, db_manager: DatabaseManager, storage_path: str = "data/frames",
+                 storage_backend: str = "files"):
         """
         Initialize the frame database.
         
         Args:
             db_manager: Database manager instance
             storage_path: Base path for local file storage
+            storage_backend: "files" for one JPEG file per image, or "lmdb"
+                to keep the images in an LMDB environment under storage_path
         """
         self.db_manager = db_manager
         self.collection_name = "captured_frames"
+        self.storage_backend = storage_backend
         self.logger = logging.getLogger(__name__)
         
         # Initialize file storage manager
-        self.file_storage = FileStorageManager(storage_path)
+        if storage_backend == "files":
+            self.file_storage = FileStorageManager(storage_path)
+        elif storage_backend == "lmdb":
+            self.file_storage = LMDBStorageManager(storage_path)
+        else:
+            raise ValueError(f"Invalid storage_backend: {storage_backend}")
         
         # Create indexes
         self._create_indexes()
@@ -113,6 +138,56 @@ class FrameDatabaseV2:
             self.logger.error(f"Failed to save frame: {e}")
             return None
     
+    def save_frame_preencoded(self, jpeg_bytes: bytes, frame_shape: Tuple[int, ...],
+                              metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Save an already JPEG-encoded frame, skipping the OpenCV encode.
+        
+        The bytes are written unchanged and no thumbnail is generated,
+        since that would require decoding the frame.
+        
+        Args:
+            jpeg_bytes: JPEG-encoded frame
+            frame_shape: Shape of the decoded frame
+            metadata: Additional metadata to store with the frame
+            
+        Returns:
+            UUID of the saved frame or None if failed
+        """
+        try:
+            collection = self.db_manager.get_collection(self.collection_name)
+            if collection is None:
+                return None
+            
+            frame_uuid = str(uuid.uuid4())
+            
+            file_path = self.file_storage.save_encoded_frame(jpeg_bytes, frame_uuid, "processed")
+            if not file_path:
+                return None
+            
+            document = {
+                "_id": frame_uuid,
+                "processed_image_path": file_path,
+                "frame_shape": frame_shape,
+                "frame_dtype": "uint8",
+                "timestamp": datetime.utcnow(),
+                "created_at": datetime.utcnow(),
+                "metadata": metadata or {}
+            }
+            
+            result = collection.insert_one(document)
+            
+            if result.inserted_id:
+                self.logger.info(f"Saved pre-encoded frame with UUID: {frame_uuid}")
+                return frame_uuid
+            else:
+                self.file_storage.delete_frame(frame_uuid, "processed")
+                return None
+                
+        except Exception as e:
+            self.logger.error(f"Failed to save pre-encoded frame: {e}")
+            return None
+    
     def save_frame_with_original(self, original_frame: np.ndarray, processed_frame: np.ndarray, 
                                 metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """
@@ -172,7 +247,315 @@ class FrameDatabaseV2:
         except Exception as e:
             self.logger.error(f"Failed to save frame with original: {e}")
             return None
+
+    def save_frames_bulk(self, frames: List[np.ndarray],
+                         metadatas: Optional[List[Optional[Dict[str, Any]]]] = None,
+                         workers: int = 1,
+                         jpeg_frames: Optional[List[bytes]] = None,
+                         acknowledged: bool = True) -> List[str]:
+        """
+        Save many frames to local storage with batched insert_many calls.
+        
+        With several workers, image files are encoded and written in a
+        thread pool while this thread inserts the completed batches.
+        
+        Args:
+            frames: OpenCV frames to save
+            metadatas: Metadata for each frame (same order as frames)
+            workers: Number of threads encoding and writing image files
+            jpeg_frames: Already JPEG-encoded frames (same order as frames);
+                when given, the bytes are written as-is without thumbnails
+            acknowledged: If False, insert with w=0 and skip the server
+                acknowledgement; failed inserts (and their orphaned files)
+                are then not detected
+            
+        Returns:
+            UUIDs of the saved frames
+        """
+        try:
+            collection = self.db_manager.get_collection(self.collection_name)
+            if collection is None:
+                return []
+            
+            if not acknowledged:
+                collection = collection.with_options(write_concern=UNACKNOWLEDGED)
+            
+            if metadatas is None:
+                metadatas = [None] * len(frames)
+            
+            saved_uuids = []
+            batch = []
+            
+            executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+            try:
+                if jpeg_frames is not None:
+                    write, inputs = self._write_encoded_frame_file, jpeg_frames
+                else:
+                    write, inputs = self._write_frame_files, frames
+                
+                # File writes complete in input order as workers finish them
+                if executor is not None:
+                    saved_files = executor.map(write, inputs)
+                else:
+                    saved_files = map(write, inputs)
+                
+                for frame, metadata, (frame_uuid, file_path, thumbnail_path) in zip(frames, metadatas, saved_files):
+                    if not file_path:
+                        continue
+                    
+                    batch.append({
+                        "_id": frame_uuid,
+                        "processed_image_path": file_path,
+                        "processed_thumbnail_path": thumbnail_path,
+                        "frame_shape": frame.shape,
+                        "frame_dtype": str(frame.dtype),
+                        "timestamp": datetime.utcnow(),
+                        "created_at": datetime.utcnow(),
+                        "metadata": metadata or {}
+                    })
+                    
+                    if len(batch) >= BULK_INSERT_MAX_DOCS:
+                        saved_uuids.extend(self._insert_documents(collection, batch))
+                        batch = []
+                
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=True)
+            
+            if batch:
+                saved_uuids.extend(self._insert_documents(collection, batch))
+            
+            self.logger.info(f"Saved {len(saved_uuids)} of {len(frames)} frames in bulk")
+            return saved_uuids
+            
+        except Exception as e:
+            self.logger.error(f"Failed to save frames in bulk: {e}")
+            return []
+    
+    def save_frames_packed(self, jpeg_frames: List[bytes], frame_shapes: List[Tuple[int, ...]],
+                           metadatas: Optional[List[Optional[Dict[str, Any]]]] = None,
+                           acknowledged: bool = True) -> List[str]:
+        """
+        Save already JPEG-encoded frames into a pack file with one insert_many.
+        
+        Documents record the pack location instead of a per-frame file path.
+        
+        Args:
+            jpeg_frames: JPEG-encoded frames
+            frame_shapes: Shape of each decoded frame (same order)
+            metadatas: Metadata for each frame (same order)
+            acknowledged: If False, insert with w=0 and skip the server
+                acknowledgement
+            
+        Returns:
+            UUIDs of the saved frames
+            
+        Raises:
+            ValueError: If the storage backend has no pack files (not "files")
+        """
+        self._require_pack_files()
+        
+        try:
+            collection = self.db_manager.get_collection(self.collection_name)
+            if collection is None:
+                return []
+            
+            if not acknowledged:
+                collection = collection.with_options(write_concern=UNACKNOWLEDGED)
+            
+            if metadatas is None:
+                metadatas = [None] * len(jpeg_frames)
+            
+            frame_uuids = [str(uuid.uuid4()) for _ in jpeg_frames]
+            locations = self.file_storage.save_frames_packed(frame_uuids, jpeg_frames)
+            if not locations:
+                return []
+            
+            documents = [{
+                "_id": frame_uuid,
+                **locations[frame_uuid],
+                "frame_shape": frame_shape,
+                "frame_dtype": "uint8",
+                "timestamp": datetime.utcnow(),
+                "created_at": datetime.utcnow(),
+                "metadata": metadata or {}
+            } for frame_uuid, frame_shape, metadata in zip(frame_uuids, frame_shapes, metadatas)]
+            
+            try:
+                collection.insert_many(documents, ordered=False)
+            except BulkWriteError as e:
+                # The other documents were inserted; their frames stay usable.
+                # Bytes of the failed ones remain in the shared pack, which is
+                # only ever removed as a whole
+                failed = {error["index"] for error in e.details.get("writeErrors", [])}
+                self.logger.error(f"Bulk insert failed for {len(failed)} of {len(documents)} packed frames")
+                return [frame_uuid for index, frame_uuid in enumerate(frame_uuids) if index not in failed]
+            
+            self.logger.info(f"Saved {len(documents)} packed frames")
+            return frame_uuids
+            
+        except Exception as e:
+            self.logger.error(f"Failed to save packed frames: {e}")
+            return []
     
+    def get_frames_packed(self, frame_uuids: List[str], workers: int = 1) -> List[Optional[np.ndarray]]:
+        """
+        Retrieve several packed frames with a single query.
+        
+        Args:
+            frame_uuids: UUIDs of the frames to retrieve
+            workers: Number of threads decoding frames
+            
+        Returns:
+            Frames in the order of frame_uuids (None for frames not found)
+            
+        Raises:
+            ValueError: If the storage backend has no pack files (not "files")
+        """
+        self._require_pack_files()
+        
+        try:
+            collection = self.db_manager.get_collection(self.collection_name)
+            if collection is None:
+                return [None] * len(frame_uuids)
+            
+            frame_uuids = list(frame_uuids)
+            cursor = collection.find(
+                {"_id": {"$in": frame_uuids}},
+                {"pack_file": 1, "pack_offset": 1, "pack_length": 1}
+            ).batch_size(max(len(frame_uuids), 1))
+            locations = {frame_doc["_id"]: frame_doc for frame_doc in cursor if "pack_file" in frame_doc}
+            
+            def load(frame_uuid: str) -> Optional[np.ndarray]:
+                location = locations.get(frame_uuid)
+                if location is None:
+                    return None
+                return self.file_storage.load_packed_frame(
+                    location["pack_file"], location["pack_offset"], location["pack_length"]
+                )
+            
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    return list(executor.map(load, frame_uuids))
+            return [load(frame_uuid) for frame_uuid in frame_uuids]
+            
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve {len(frame_uuids)} packed frames: {e}")
+            return [None] * len(frame_uuids)
+    
+    def _require_pack_files(self):
+        """Raise ValueError unless frames can be packed with this storage backend."""
+        if self.storage_backend != "files":
+            raise ValueError(f"Packed frames require storage_backend='files', not '{self.storage_backend}'; "
+                             f"use save_frames_bulk / get_frames instead")
+    
+    def _write_frame_files(self, frame: np.ndarray) -> Tuple[str, Optional[str], Optional[str]]:
+        """
+        Write a frame and its thumbnail under a new UUID.
+        
+        Args:
+            frame: OpenCV frame (numpy array)
+            
+        Returns:
+            Tuple of (frame_uuid, file_path, thumbnail_path); file_path is None if failed
+        """
+        frame_uuid = str(uuid.uuid4())
+        file_path = self.file_storage.save_frame(frame, frame_uuid, "processed")
+        if not file_path:
+            return frame_uuid, None, None
+        thumbnail_path = self.file_storage.save_thumbnail(frame, frame_uuid, "processed")
+        return frame_uuid, file_path, thumbnail_path
+    
+    def _write_encoded_frame_file(self, jpeg_bytes: bytes) -> Tuple[str, Optional[str], Optional[str]]:
+        """
+        Write an already JPEG-encoded frame under a new UUID (no thumbnail).
+        
+        Args:
+            jpeg_bytes: JPEG-encoded frame
+            
+        Returns:
+            Tuple of (frame_uuid, file_path, None); file_path is None if failed
+        """
+        frame_uuid = str(uuid.uuid4())
+        return frame_uuid, self.file_storage.save_encoded_frame(jpeg_bytes, frame_uuid, "processed"), None
+    
+    def _insert_documents(self, collection: Collection, documents: List[Dict[str, Any]]) -> List[str]:
+        """
+        Insert a batch of frame documents with one unordered insert_many.
+        
+        Files of documents that fail to insert are removed again.
+        
+        Args:
+            collection: Target collection
+            documents: Frame documents to insert
+            
+        Returns:
+            UUIDs of the documents that were inserted
+        """
+        try:
+            collection.insert_many(documents, ordered=False)
+            return [document["_id"] for document in documents]
+        except BulkWriteError as e:
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            self.logger.error(f"Bulk insert failed for {len(failed)} of {len(documents)} frames")
+            for index in failed:
+                self.file_storage.delete_frame(documents[index]["_id"], "both")
+                self.file_storage.delete_thumbnail(documents[index]["_id"], "both")
+            return [document["_id"] for index, document in enumerate(documents) if index not in failed]
+    
+    def save_frame_files(self, frame_uuid: str, processed_frame: np.ndarray,
+                         original_frame: Optional[np.ndarray] = None) -> Optional[Dict[str, Any]]:
+        """
+        Write frame images for an existing frame document without touching MongoDB.
+
+        The caller is responsible for applying the returned fields to the
+        document, which lets bulk jobs such as the migration batch their updates.
+
+        Args:
+            frame_uuid: UUID of the existing frame document
+            processed_frame: Processed frame with overlays/annotations
+            original_frame: Original clean frame, if available
+
+        Returns:
+            Dictionary of fields to $set on the frame document or None if failed
+        """
+        try:
+            if original_frame is not None:
+                original_path, processed_path, original_thumbnail_path, processed_thumbnail_path = self.file_storage.save_both_frames(
+                    original_frame, processed_frame, frame_uuid, create_thumbnails=True
+                )
+
+                if not original_path or not processed_path:
+                    return None
+
+                return {
+                    "original_image_path": original_path,
+                    "processed_image_path": processed_path,
+                    "original_thumbnail_path": original_thumbnail_path,
+                    "processed_thumbnail_path": processed_thumbnail_path,
+                    "frame_shape": processed_frame.shape,
+                    "original_frame_shape": original_frame.shape,
+                    "frame_dtype": str(processed_frame.dtype),
+                    "original_frame_dtype": str(original_frame.dtype)
+                }
+
+            file_path = self.file_storage.save_frame(processed_frame, frame_uuid, "processed")
+            if not file_path:
+                return None
+
+            thumbnail_path = self.file_storage.save_thumbnail(processed_frame, frame_uuid, "processed")
+
+            return {
+                "processed_image_path": file_path,
+                "processed_thumbnail_path": thumbnail_path,
+                "frame_shape": processed_frame.shape,
+                "frame_dtype": str(processed_frame.dtype)
+            }
+
+        except Exception as e:
+            self.logger.error(f"Failed to save frame files {frame_uuid}: {e}")
+            return None
+
     def get_frame(self, frame_uuid: str, image_type: str = "processed") -> Optional[np.ndarray]:
         """
         Retrieve a frame from local storage.
@@ -208,12 +591,14 @@ class FrameDatabaseV2:
             self.logger.error(f"Failed to retrieve frame {frame_uuid}: {e}")
             return None
     
-    def get_frame_metadata(self, frame_uuid: str) -> Optional[Dict[str, Any]]:
+    def get_frame_metadata(self, frame_uuid: str,
+                           projection: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
         """
         Get frame metadata without loading the image data.
         
         Args:
             frame_uuid: UUID of the frame
+            projection: MongoDB projection; defaults to the metadata and path fields
             
         Returns:
             Frame metadata dictionary or None if not found
@@ -226,10 +611,7 @@ class FrameDatabaseV2:
             # Project to exclude image data (not needed since we don't store it)
             frame_doc = collection.find_one(
                 {"_id": frame_uuid},
-                {"_id": 1, "frame_shape": 1, "original_frame_shape": 1, 
-                 "frame_dtype": 1, "original_frame_dtype": 1, 
-                 "timestamp": 1, "created_at": 1, "metadata": 1,
-                 "original_image_path": 1, "processed_image_path": 1}
+                projection if projection is not None else METADATA_PROJECTION
             )
             
             if frame_doc:
@@ -243,6 +625,89 @@ class FrameDatabaseV2:
             self.logger.error(f"Failed to retrieve frame metadata {frame_uuid}: {e}")
             return None
     
+    def get_many_metadata(self, frame_uuids: List[str],
+                          projection: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        """
+        Get metadata for several frames with a single query.
+        
+        Args:
+            frame_uuids: UUIDs of the frames
+            projection: MongoDB projection; defaults to the metadata and path fields
+            
+        Returns:
+            List of frame metadata dictionaries (frames not found are omitted)
+        """
+        try:
+            collection = self.db_manager.get_collection(self.collection_name)
+            if collection is None:
+                return []
+            
+            frame_uuids = list(frame_uuids)
+            cursor = collection.find(
+                {"_id": {"$in": frame_uuids}},
+                projection if projection is not None else METADATA_PROJECTION
+            ).batch_size(max(len(frame_uuids), 1))
+            
+            return list(cursor)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve metadata for {len(frame_uuids)} frames: {e}")
+            return []
+    
+    def get_frames(self, frame_uuids: List[str], image_type: str = "processed",
+                   workers: int = 1) -> List[Optional[np.ndarray]]:
+        """
+        Retrieve several frames, checking the database with a single query.
+        
+        With several workers, the file reads run in a thread pool and start
+        before the query, so disk I/O overlaps the database round-trip.
+        
+        Args:
+            frame_uuids: UUIDs of the frames to retrieve
+            image_type: Type of image ("original" or "processed")
+            workers: Number of threads loading and decoding files
+            
+        Returns:
+            Frames in the order of frame_uuids (None for frames not found)
+        """
+        try:
+            collection = self.db_manager.get_collection(self.collection_name)
+            if collection is None:
+                return [None] * len(frame_uuids)
+            
+            frame_uuids = list(frame_uuids)
+            executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+            try:
+                # Start the file reads before querying MongoDB so disk I/O and
+                # decoding overlap the round-trip; frames without a document
+                # are discarded below
+                if executor is not None:
+                    pending = [executor.submit(self.file_storage.load_frame, frame_uuid, image_type)
+                               for frame_uuid in frame_uuids]
+                
+                cursor = collection.find(
+                    {"_id": {"$in": frame_uuids}},
+                    {"_id": 1}
+                ).batch_size(max(len(frame_uuids), 1))
+                known_uuids = {frame_doc["_id"] for frame_doc in cursor}
+                
+                if executor is not None:
+                    frames = [future.result() for future in pending]
+                else:
+                    frames = [self.file_storage.load_frame(frame_uuid, image_type)
+                              if frame_uuid in known_uuids else None
+                              for frame_uuid in frame_uuids]
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=True)
+            
+            return [frame if frame_uuid in known_uuids else None
+                    for frame_uuid, frame in zip(frame_uuids, frames)]
+            
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve {len(frame_uuids)} frames: {e}")
+            return [None] * len(frame_uuids)
+    
     def list_frames(self, limit: int = 100, skip: int = 0, 
                    source: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -314,6 +779,45 @@ class FrameDatabaseV2:
             self.logger.error(f"Failed to delete frame {frame_uuid}: {e}")
             return False
     
+    def delete_frames_bulk(self, frame_uuids: List[str], workers: int = 8,
+                           delete_files: bool = True) -> int:
+        """
+        Delete many frames with a single delete_many, then remove their files.
+        
+        Args:
+            frame_uuids: UUIDs of the frames to delete
+            workers: Number of threads unlinking files
+            delete_files: If False, only delete the documents (e.g. for packed
+                frames, whose pack files are shared)
+            
+        Returns:
+            Number of frames deleted from the database
+        """
+        try:
+            collection = self.db_manager.get_collection(self.collection_name)
+            if collection is None:
+                return 0
+            
+            frame_uuids = list(frame_uuids)
+            result = collection.delete_many({"_id": {"$in": frame_uuids}})
+            
+            # Unlinks are independent syscalls, so overlap them
+            if delete_files:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    list(executor.map(self._delete_frame_files, frame_uuids))
+            
+            self.logger.info(f"Deleted {result.deleted_count} of {len(frame_uuids)} frames")
+            return result.deleted_count
+                
+        except Exception as e:
+            self.logger.error(f"Failed to delete frames in bulk: {e}")
+            return 0
+    
+    def _delete_frame_files(self, frame_uuid: str):
+        """Delete all image files (full-resolution and thumbnails) of a frame."""
+        self.file_storage.delete_frame(frame_uuid, "both")
+        self.file_storage.delete_thumbnail(frame_uuid, "both")
+    
     def get_frame_count(self) -> int:
         """
         Get the total number of frames in the database.
@@ -0,0 +1,363 @@
+"""
+LMDB Storage Manager for Birds of Play
+
+Stores frame images as JPEG blobs in an LMDB environment keyed by UUID.
+Drop-in alternative to FileStorageManager: reads are B+-tree lookups in a
+memory-mapped file instead of an open() per image file.
+"""
+
+import uuid
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+import cv2
+import numpy as np
+try:
+    import lmdb
+    HAS_LMDB = True
+except ImportError:
+    HAS_LMDB = False
+
+from .file_storage_manager import encode_jpeg, decode_jpeg
+
+# Virtual address space reserved for the environment; the data file only
+# grows as frames are written
+LMDB_MAP_SIZE = 1 << 40
+
+# One named sub-database per image kind
+LMDB_DATABASES = ("original", "processed", "original_thumbnails", "processed_thumbnails")
+
+
+class LMDBStorageManager:
+    """Manages frame images stored in an LMDB environment."""
+    
+    def __init__(self, base_storage_path: str = "data/frames"):
+        """
+        Initialize the LMDB storage manager.
+        
+        Args:
+            base_storage_path: Directory holding the LMDB environment
+        """
+        if not HAS_LMDB:
+            raise ImportError("lmdb is required for LMDB storage (pip install lmdb)")
+        
+        self.base_path = Path(base_storage_path) / "lmdb"
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+        
+        self.env = lmdb.open(str(self.base_path), map_size=LMDB_MAP_SIZE, subdir=True,
+                             writemap=True, max_dbs=len(LMDB_DATABASES))
+        self._dbs = {name: self.env.open_db(name.encode()) for name in LMDB_DATABASES}
+        
+        self.logger.info(f"LMDB storage initialized at: {self.base_path}")
+    
+    def _db(self, image_type: str, thumbnail: bool = False):
+        """Return the sub-database for an image type."""
+        if image_type not in ("original", "processed"):
+            raise ValueError(f"Invalid image_type: {image_type}")
+        return self._dbs[f"{image_type}_thumbnails" if thumbnail else image_type]
+    
+    def _put(self, image_type: str, frame_uuid: str, jpeg_bytes: bytes,
+             thumbnail: bool = False) -> str:
+        """Store a blob in a short write transaction and return its location."""
+        with self.env.begin(write=True, db=self._db(image_type, thumbnail)) as txn:
+            txn.put(uuid.UUID(frame_uuid).bytes, jpeg_bytes)
+        kind = f"{image_type}_thumbnails" if thumbnail else image_type
+        return f"lmdb://{kind}/{frame_uuid}"
+    
+    def _get(self, image_type: str, frame_uuid: str, thumbnail: bool = False) -> Optional[bytes]:
+        """Fetch a blob in a short read transaction."""
+        with self.env.begin(db=self._db(image_type, thumbnail), buffers=True) as txn:
+            data = txn.get(uuid.UUID(frame_uuid).bytes)
+            # Copy out of the map before the transaction ends
+            return bytes(data) if data is not None else None
+    
+    def _delete(self, image_type: str, frame_uuid: str, thumbnail: bool = False) -> bool:
+        """Delete a blob; returns whether it existed."""
+        with self.env.begin(write=True, db=self._db(image_type, thumbnail)) as txn:
+            return txn.delete(uuid.UUID(frame_uuid).bytes)
+    
+    def save_frame(self, frame: np.ndarray, frame_uuid: str,
+                   image_type: str = "processed", quality: int = 95) -> Optional[str]:
+        """
+        Save a frame image to LMDB.
+        
+        Args:
+            frame: OpenCV frame (numpy array)
+            frame_uuid: Unique identifier for the frame
+            image_type: Type of image ("original" or "processed")
+            quality: JPEG quality (1-100)
+        
+        Returns:
+            Location of the stored image or None if failed
+        """
+        try:
+            jpeg_bytes = encode_jpeg(frame, quality)
+            if jpeg_bytes is None:
+                self.logger.error(f"Failed to encode {image_type} frame: {frame_uuid}")
+                return None
+            
+            return self._put(image_type, frame_uuid, jpeg_bytes)
+        
+        except Exception as e:
+            self.logger.error(f"Error saving {image_type} frame {frame_uuid}: {e}")
+            return None
+    
+    def save_encoded_frame(self, jpeg_bytes: bytes, frame_uuid: str,
+                           image_type: str = "processed") -> Optional[str]:
+        """
+        Save an already JPEG-encoded frame to LMDB as-is.
+        
+        Args:
+            jpeg_bytes: JPEG-encoded frame
+            frame_uuid: Unique identifier for the frame
+            image_type: Type of image ("original" or "processed")
+        
+        Returns:
+            Location of the stored image or None if failed
+        """
+        try:
+            return self._put(image_type, frame_uuid, jpeg_bytes)
+        
+        except Exception as e:
+            self.logger.error(f"Error saving encoded {image_type} frame {frame_uuid}: {e}")
+            return None
+    
+    def save_thumbnail(self, frame: np.ndarray, frame_uuid: str,
+                       image_type: str = "processed", thumbnail_size: Tuple[int, int] = (320, 240),
+                       color: bool = True) -> Optional[str]:
+        """
+        Save a thumbnail version of a frame.
+        
+        Args:
+            frame: OpenCV frame (numpy array)
+            frame_uuid: Unique identifier for the frame
+            image_type: Type of image ("original" or "processed")
+            thumbnail_size: Size of thumbnail (width, height)
+            color: If False, store a single-channel grayscale JPEG
+        
+        Returns:
+            Location of the stored thumbnail or None if failed
+        """
+        try:
+            thumbnail = cv2.resize(frame, thumbnail_size, interpolation=cv2.INTER_AREA)
+            if not color and thumbnail.ndim == 3:
+                thumbnail = cv2.cvtColor(thumbnail, cv2.COLOR_BGR2GRAY)
+            jpeg_bytes = encode_jpeg(thumbnail, 75)
+            if jpeg_bytes is None:
+                self.logger.error(f"Failed to encode {image_type} thumbnail: {frame_uuid}")
+                return None
+            
+            return self._put(image_type, frame_uuid, jpeg_bytes, thumbnail=True)
+        
+        except Exception as e:
+            self.logger.error(f"Error saving {image_type} thumbnail {frame_uuid}: {e}")
+            return None
+    
+    def save_both_frames(self, original_frame: np.ndarray, processed_frame: np.ndarray,
+                         frame_uuid: str, quality: int = 95, create_thumbnails: bool = True) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+        """
+        Save both original and processed frames with optional thumbnails.
+        
+        Args:
+            original_frame: Original clean frame
+            processed_frame: Processed frame with overlays
+            frame_uuid: Unique identifier for the frame
+            quality: JPEG quality (1-100)
+            create_thumbnails: Whether to create thumbnail versions
+        
+        Returns:
+            Tuple of (original, processed, original_thumbnail, processed_thumbnail) locations or (None, None, None, None) if failed
+        """
+        original_path = self.save_frame(original_frame, frame_uuid, "original", quality)
+        processed_path = self.save_frame(processed_frame, frame_uuid, "processed", quality)
+        
+        original_thumbnail_path = None
+        processed_thumbnail_path = None
+        
+        if create_thumbnails:
+            original_thumbnail_path = self.save_thumbnail(original_frame, frame_uuid, "original")
+            processed_thumbnail_path = self.save_thumbnail(processed_frame, frame_uuid, "processed")
+        
+        if original_path and processed_path:
+            return original_path, processed_path, original_thumbnail_path, processed_thumbnail_path
+        
+        # Clean up partial saves
+        self.delete_frame(frame_uuid, "both")
+        self.delete_thumbnail(frame_uuid, "both")
+        return None, None, None, None
+    
+    def load_frame(self, frame_uuid: str, image_type: str = "processed") -> Optional[np.ndarray]:
+        """
+        Load a frame image from LMDB.
+        
+        Args:
+            frame_uuid: Unique identifier for the frame
+            image_type: Type of image ("original" or "processed")
+        
+        Returns:
+            OpenCV frame (numpy array) or None if not found
+        """
+        try:
+            data = self._get(image_type, frame_uuid)
+            if data is None:
+                self.logger.warning(f"Frame not found in LMDB: {frame_uuid}")
+                return None
+            
+            frame = decode_jpeg(data)
+            if frame is None:
+                self.logger.error(f"Failed to decode {image_type} frame: {frame_uuid}")
+            return frame
+        
+        except Exception as e:
+            self.logger.error(f"Error loading {image_type} frame {frame_uuid}: {e}")
+            return None
+    
+    def load_thumbnail(self, frame_uuid: str, image_type: str = "processed") -> Optional[np.ndarray]:
+        """
+        Load a thumbnail image from LMDB.
+        
+        Args:
+            frame_uuid: Unique identifier for the frame
+            image_type: Type of image ("original" or "processed")
+        
+        Returns:
+            OpenCV frame (numpy array) or None if not found
+        """
+        try:
+            data = self._get(image_type, frame_uuid, thumbnail=True)
+            if data is None:
+                self.logger.warning(f"Thumbnail not found in LMDB: {frame_uuid}")
+                return None
+            
+            thumbnail = decode_jpeg(data, keep_grayscale=True)
+            if thumbnail is None:
+                self.logger.error(f"Failed to decode {image_type} thumbnail: {frame_uuid}")
+            return thumbnail
+        
+        except Exception as e:
+            self.logger.error(f"Error loading {image_type} thumbnail {frame_uuid}: {e}")
+            return None
+    
+    def delete_frame(self, frame_uuid: str, image_type: str = "both") -> bool:
+        """
+        Delete frame images from LMDB.
+        
+        Args:
+            frame_uuid: Unique identifier for the frame
+            image_type: Type of image ("original", "processed", or "both")
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            for kind in ("original", "processed"):
+                if image_type in [kind, "both"]:
+                    self._delete(kind, frame_uuid)
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Error deleting frame {frame_uuid}: {e}")
+            return False
+    
+    def delete_thumbnail(self, frame_uuid: str, image_type: str = "both") -> bool:
+        """
+        Delete thumbnail images from LMDB.
+        
+        Args:
+            frame_uuid: Unique identifier for the frame
+            image_type: Type of image ("original", "processed", or "both")
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            for kind in ("original", "processed"):
+                if image_type in [kind, "both"]:
+                    self._delete(kind, frame_uuid, thumbnail=True)
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Error deleting thumbnail {frame_uuid}: {e}")
+            return False
+    
+    def delete_full_resolution_images(self, frame_uuid: str, keep_thumbnails: bool = True) -> bool:
+        """
+        Delete full-resolution images while optionally keeping thumbnails.
+        
+        Args:
+            frame_uuid: Unique identifier for the frame
+            keep_thumbnails: Whether to keep thumbnail versions
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        success = self.delete_frame(frame_uuid, "both")
+        if not keep_thumbnails:
+            success = self.delete_thumbnail(frame_uuid, "both") and success
+        return success
+    
+    def frame_exists(self, frame_uuid: str, image_type: str = "processed") -> bool:
+        """
+        Check if frame images exist in LMDB.
+        
+        Args:
+            frame_uuid: Unique identifier for the frame
+            image_type: Type of image ("original", "processed", or "both")
+        
+        Returns:
+            True if the frame exists, False otherwise
+        """
+        try:
+            if image_type == "both":
+                return self.frame_exists(frame_uuid, "original") and self.frame_exists(frame_uuid, "processed")
+            with self.env.begin(db=self._db(image_type), buffers=True) as txn:
+                return txn.get(uuid.UUID(frame_uuid).bytes) is not None
+        
+        except Exception as e:
+            self.logger.error(f"Error checking frame existence {frame_uuid}: {e}")
+            return False
+    
+    def get_storage_stats(self) -> Dict[str, Any]:
+        """
+        Get storage statistics.
+        
+        Returns:
+            Dictionary with storage statistics
+        """
+        try:
+            stats = {"base_path": str(self.base_path)}
+            with self.env.begin() as txn:
+                for kind in ("original", "processed"):
+                    stats[f"{kind}_count"] = txn.stat(self._dbs[kind])["entries"]
+            
+            info = self.env.info()
+            stats["total_size_bytes"] = (info["last_pgno"] + 1) * self.env.stat()["psize"]
+            
+            return stats
+        
+        except Exception as e:
+            self.logger.error(f"Error getting storage stats: {e}")
+            return {}
+    
+    def shard_existing_files(self) -> int:
+        """
+        Nothing to shard: LMDB keeps all frames in one environment.
+        
+        Returns:
+            Number of files moved (always 0)
+        """
+        return 0
+    
+    def delete_all_packs(self) -> int:
+        """
+        Nothing to delete: LMDB storage never writes pack files.
+        
+        Returns:
+            Number of pack files deleted (always 0)
+        """
+        return 0
+    
+    def close(self):
+        """Close the LMDB environment."""
+        self.env.close()
@@ -7,12 +7,59 @@ to the new efficient file-based storage system.
 
 import os
 import sys
-import base64
+import queue
+import binascii
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 import argparse
 from datetime import datetime
+import cv2
+import numpy as np
+from pymongo import IndexModel, UpdateOne
+from pymongo.errors import BulkWriteError
+from pymongo.write_concern import WriteConcern
+try:
+    import pybase64
+    HAS_PYBASE64 = True
+except ImportError:
+    HAS_PYBASE64 = False
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbo_jpeg = TurboJPEG()
+    HAS_TURBOJPEG = True
+except (ImportError, OSError, RuntimeError):
+    # Python package or the libturbojpeg shared library is missing
+    HAS_TURBOJPEG = False
+
+JPEG_MAGIC = b"\xff\xd8"
+
+# --decode-scale factor -> cv2.imdecode flag (libjpeg DCT-domain downscaling)
+IMDECODE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+# MongoClient settings for the bulk transfer. Base64 payloads are highly
+# compressible ASCII, so wire compression cuts network volume several-fold;
+# zlib is always available as a fallback when zstd/snappy are not installed.
+MIGRATION_CLIENT_OPTIONS = {
+    "compressors": "zstd,snappy,zlib",
+    "maxPoolSize": 64,
+    "socketTimeoutMS": 600000,
+    "retryWrites": False,
+}
+
+# index_information() fields that are not IndexModel options
+INDEX_INFO_SKIP_FIELDS = ("key", "v", "ns", "background")
+
+# Seconds the prefetch thread waits on a full queue before re-checking
+# whether the migration loop has stopped
+PREFETCH_PUT_TIMEOUT = 0.5
 
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
@@ -23,21 +70,59 @@ from mongodb.frame_database_v2 import FrameDatabaseV2  # New version
 from mongodb.file_storage_manager import FileStorageManager
 
 
+def _decode_base64(encoded: str) -> bytes:
+    """
+    Decode a base64 payload stored in MongoDB.
+    
+    Uses the SIMD decoder from pybase64 when it is installed. Otherwise calls
+    binascii directly, which accepts the ASCII str as-is and so skips the
+    extra multi-MB copy that base64.b64decode makes when encoding it to bytes.
+    
+    Args:
+        encoded: Base64 string
+        
+    Returns:
+        Decoded bytes
+    """
+    if HAS_PYBASE64:
+        return pybase64.b64decode(encoded)
+    return binascii.a2b_base64(encoded)
+
+
 class MigrationManager:
     """Manages migration from base64 storage to file storage."""
     
-    def __init__(self, storage_path: str = "data/frames"):
+    def __init__(self, storage_path: str = "data/frames", compress: bool = True,
+                 decode_scale: int = 1):
         """
         Initialize the migration manager.
         
+        The migration uses its own MongoClient tuned for bulk transfer
+        (MIGRATION_CLIENT_OPTIONS): wire compression, a pool large enough
+        for the worker threads, long socket timeouts and no retryable
+        writes, since the migration is restartable. The client lives for
+        the duration of the migration.
+        
         Args:
             storage_path: Base path for new file storage
+            compress: If False, disable wire compression (e.g. when MongoDB
+                runs on the same host and CPU is the bottleneck)
+            decode_scale: Downscale factor (1, 2, 4 or 8) applied while decoding
+                JPEGs. Anything but 1 stores reduced-resolution frames, so only
+                use it when the original resolution need not be preserved.
         """
+        if decode_scale not in IMDECODE_FLAGS:
+            raise ValueError(f"Invalid decode_scale: {decode_scale}")
+        
         self.storage_path = storage_path
+        self.decode_scale = decode_scale
         self.logger = logging.getLogger(__name__)
         
         # Initialize database connections
-        self.db_manager = DatabaseManager()
+        client_options = dict(MIGRATION_CLIENT_OPTIONS)
+        if not compress:
+            client_options.pop("compressors")
+        self.db_manager = DatabaseManager(client_options=client_options)
         if not self.db_manager.connect():
             raise RuntimeError("Failed to connect to MongoDB")
         
@@ -46,6 +131,39 @@ class MigrationManager:
         self.new_frame_db = FrameDatabaseV2(self.db_manager, storage_path)
         self.file_storage = FileStorageManager(storage_path)
         
+        # Path updates are buffered and flushed with one bulk_write per batch
+        self._pending_updates: List[UpdateOne] = []
+        self._pending_lock = threading.Lock()
+        
+    def _decode_image(self, image_data: bytes) -> Optional[np.ndarray]:
+        """
+        Decode encoded image bytes into an OpenCV frame.
+        
+        JPEG payloads are decoded with libjpeg-turbo when available, which is
+        considerably faster than the libjpeg bundled with many OpenCV builds.
+        Anything else, or a JPEG turbojpeg rejects, goes through cv2.imdecode.
+        With a decode_scale above 1 both decoders downscale during decoding,
+        skipping most of the IDCT work.
+        
+        Args:
+            image_data: Encoded (JPEG) image bytes
+            
+        Returns:
+            Decoded BGR frame or None if decoding failed
+        """
+        if HAS_TURBOJPEG and image_data[:2] == JPEG_MAGIC:
+            try:
+                if self.decode_scale == 1:
+                    return _turbo_jpeg.decode(image_data, pixel_format=TJPF_BGR)
+                return _turbo_jpeg.decode(image_data, pixel_format=TJPF_BGR,
+                                          scaling_factor=(1, self.decode_scale))
+            except OSError as e:
+                self.logger.debug("turbojpeg decode failed, falling back to OpenCV: %s", e)
+        
+        # frombuffer is a zero-copy view over the decoded base64 payload
+        return cv2.imdecode(np.frombuffer(image_data, dtype=np.uint8),
+                            IMDECODE_FLAGS[self.decode_scale])
+    
     def migrate_frame(self, frame_doc: Dict[str, Any]) -> bool:
         """
         Migrate a single frame from base64 to file storage.
@@ -54,71 +172,226 @@ class MigrationManager:
             frame_doc: MongoDB document with base64 frame data
             
         Returns:
-            True if successful, False otherwise
+            True if the files were written and the path update was queued,
+            False otherwise
         """
         try:
             frame_uuid = frame_doc["_id"]
-            self.logger.info(f"Migrating frame: {frame_uuid}")
+            self.logger.debug("Migrating frame: %s", frame_uuid)
             
             # Decode base64 frame data
             frame_data = None
             original_frame_data = None
             
             if "frame_data" in frame_doc and frame_doc["frame_data"]:
-                frame_data = base64.b64decode(frame_doc["frame_data"])
+                frame_data = _decode_base64(frame_doc["frame_data"])
             
             if "original_frame_data" in frame_doc and frame_doc["original_frame_data"]:
-                original_frame_data = base64.b64decode(frame_doc["original_frame_data"])
+                original_frame_data = _decode_base64(frame_doc["original_frame_data"])
             
             # Convert to OpenCV frames
-            processed_frame = None
-            original_frame = None
-            
-            if frame_data:
-                import cv2
-                import numpy as np
-                nparr = np.frombuffer(frame_data, np.uint8)
-                processed_frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            if original_frame_data:
-                import cv2
-                import numpy as np
-                nparr = np.frombuffer(original_frame_data, np.uint8)
-                original_frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            # Save to new file-based system
-            if original_frame is not None and processed_frame is not None:
-                # Both frames available
-                success = self.new_frame_db.save_frame_with_original(
-                    original_frame, processed_frame, frame_doc.get("metadata", {})
-                )
-            elif processed_frame is not None:
-                # Only processed frame available
-                success = self.new_frame_db.save_frame(
-                    processed_frame, frame_doc.get("metadata", {})
-                )
-            else:
-                self.logger.warning(f"No valid frame data found for: {frame_uuid}")
+            processed_frame = self._decode_image(frame_data) if frame_data else None
+            original_frame = self._decode_image(original_frame_data) if original_frame_data else None
+            
+            if processed_frame is None:
+                self.logger.warning("No valid frame data found for: %s", frame_uuid)
                 return False
             
-            if success:
-                self.logger.info(f"Successfully migrated frame: {frame_uuid}")
-                return True
-            else:
-                self.logger.error(f"Failed to save migrated frame: {frame_uuid}")
+            # Write files under the existing UUID; the document update is queued
+            fields = self.new_frame_db.save_frame_files(frame_uuid, processed_frame, original_frame)
+            if not fields:
+                self.logger.error("Failed to save migrated frame: %s", frame_uuid)
                 return False
+            
+            with self._pending_lock:
+                self._pending_updates.append(UpdateOne({"_id": frame_uuid}, {"$set": fields}))
+            self.logger.debug("Successfully migrated frame: %s", frame_uuid)
+            return True
                 
         except Exception as e:
-            self.logger.error(f"Error migrating frame {frame_doc.get('_id', 'unknown')}: {e}")
+            self.logger.error("Error migrating frame %s: %s", frame_doc.get('_id', 'unknown'), e)
             return False
     
-    def migrate_all_frames(self, batch_size: int = 100, dry_run: bool = False) -> Dict[str, int]:
+    def _flush_pending_updates(self, collection) -> int:
+        """
+        Apply all queued path updates with a single unordered bulk write.
+        
+        Migration is idempotent and restartable, so the bulk write skips
+        waiting for the journal.
+        
+        Args:
+            collection: captured_frames collection
+            
+        Returns:
+            Number of queued updates that failed to apply
+        """
+        if not self._pending_updates:
+            return 0
+        
+        updates = self._pending_updates
+        self._pending_updates = []
+        
+        bulk_collection = collection.with_options(write_concern=WriteConcern(w=1, j=False))
+        try:
+            bulk_collection.bulk_write(updates, ordered=False)
+            return 0
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            self.logger.error("Bulk path update failed for %d frames", len(write_errors))
+            return len(write_errors)
+    
+    def _prefetch_batches(self, collection, batch_size: int, batch_queue: queue.Queue,
+                          stop: threading.Event):
+        """
+        Fetch batches of frame documents ahead of the migration loop.
+        
+        Runs on a background thread so the next batch is read from MongoDB
+        while the current one is being decoded and written to disk. Pages by
+        _id range rather than skip() so each query is an index range scan.
+        
+        Args:
+            collection: captured_frames collection
+            batch_size: Number of documents per batch
+            batch_queue: Queue receiving document lists, then None when done
+            stop: Set by the consumer when it stops reading the queue
+        """
+        try:
+            last_id = None
+            while not stop.is_set():
+                query = {} if last_id is None else {"_id": {"$gt": last_id}}
+                cursor = collection.find(query).sort("_id", 1).limit(batch_size).batch_size(batch_size)
+                batch = list(cursor)
+                
+                if batch:
+                    if not self._put_batch(batch_queue, batch, stop):
+                        return
+                    last_id = batch[-1]["_id"]
+                
+                if len(batch) < batch_size:
+                    break
+        except Exception as e:
+            # Hand the error to the consumer instead of dying silently
+            if not self._put_batch(batch_queue, e, stop):
+                return
+        
+        self._put_batch(batch_queue, None, stop)
+    
+    def _put_batch(self, batch_queue: queue.Queue, item, stop: threading.Event) -> bool:
+        """
+        Put an item on the prefetch queue unless the consumer has stopped.
+        
+        Args:
+            batch_queue: Prefetch queue
+            item: Batch, exception or None end marker
+            stop: Set by the consumer when it stops reading the queue
+            
+        Returns:
+            True if the item was queued, False if the consumer is gone
+        """
+        while not stop.is_set():
+            try:
+                batch_queue.put(item, timeout=PREFETCH_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _drop_secondary_indexes(self, collection) -> int:
+        """
+        Drop the non-unique secondary indexes so bulk writes do not maintain them.
+        
+        Unique indexes (and _id) are kept, so duplicates cannot slip in while
+        the others are gone. The index specs are saved in the migration_state
+        collection before anything is dropped, so an interrupted run can still
+        restore them.
+        
+        Args:
+            collection: Collection whose indexes should be dropped
+            
+        Returns:
+            Number of indexes dropped
+        """
+        state = self.db_manager.get_collection("migration_state")
+        if state is None:
+            raise RuntimeError("Failed to get migration_state collection")
+        
+        state_id = f"indexes:{collection.name}"
+        saved = state.find_one({"_id": state_id}) or {}
+        specs = {spec["name"]: spec for spec in saved.get("indexes", [])}
+        
+        index_info = {name: info for name, info in collection.index_information().items()
+                      if name != "_id_" and not info.get("unique")}
+        for name, info in index_info.items():
+            if name in specs:
+                continue
+            spec = {field: value for field, value in info.items()
+                    if field not in INDEX_INFO_SKIP_FIELDS}
+            spec["name"] = name
+            spec["key"] = [list(key) for key in info["key"]]
+            specs[name] = spec
+        
+        state.update_one(
+            {"_id": state_id},
+            {"$set": {"indexes": list(specs.values()), "updated_at": datetime.now()}},
+            upsert=True
+        )
+        
+        dropped = 0
+        for name in index_info:
+            collection.drop_index(name)
+            dropped += 1
+        
+        self.logger.info("Dropped %d indexes on %s (specs saved to migration_state)", dropped, collection.name)
+        return dropped
+    
+    def _restore_indexes(self, collection) -> int:
+        """
+        Recreate indexes saved by _drop_secondary_indexes.
+        
+        Args:
+            collection: Collection whose indexes should be recreated
+            
+        Returns:
+            Number of indexes recreated
+        """
+        state = self.db_manager.get_collection("migration_state")
+        if state is None:
+            raise RuntimeError("Failed to get migration_state collection")
+        
+        state_id = f"indexes:{collection.name}"
+        saved = state.find_one({"_id": state_id})
+        if not saved or not saved.get("indexes"):
+            return 0
+        
+        models = []
+        for spec in saved["indexes"]:
+            options = {field: value for field, value in spec.items() if field != "key"}
+            keys = [tuple(key) for key in spec["key"]]
+            models.append(IndexModel(keys, background=True, **options))
+        
+        collection.create_indexes(models)
+        state.delete_one({"_id": state_id})
+        
+        self.logger.info("Recreated %d indexes on %s", len(models), collection.name)
+        return len(models)
+    
+    def migrate_all_frames(self, batch_size: int = 100, dry_run: bool = False,
+                           exact_count: bool = False, drop_indexes: bool = False,
+                           workers: int = 1) -> Dict[str, int]:
         """
         Migrate all frames from base64 storage to file storage.
         
         Args:
             batch_size: Number of frames to process in each batch
             dry_run: If True, only count frames without migrating
+            exact_count: If True, count documents with a collection scan instead
+                of using the (approximate) collection metadata count
+            drop_indexes: If True, drop the non-unique secondary indexes for the
+                duration of the migration and rebuild them afterwards (a killed
+                run's indexes are rebuilt by the next run)
+            workers: Number of threads decoding and writing frames concurrently;
+                cv2 and file I/O release the GIL, so disk writes overlap with
+                the Mongo prefetch and with each other
             
         Returns:
             Dictionary with migration statistics
@@ -128,9 +401,14 @@ class MigrationManager:
             if collection is None:
                 raise RuntimeError("Failed to get captured_frames collection")
             
-            # Get total count
-            total_frames = collection.count_documents({})
-            self.logger.info(f"Found {total_frames} frames to migrate")
+            # Get total count; only used for progress reporting, so the O(1)
+            # metadata estimate is enough unless an exact figure is requested
+            if exact_count:
+                total_frames = collection.count_documents({})
+                self.logger.info("Found %d frames to migrate", total_frames)
+            else:
+                total_frames = collection.estimated_document_count()
+                self.logger.info("Found ~%d frames to migrate (estimated)", total_frames)
             
             if dry_run:
                 return {
@@ -148,50 +426,123 @@ class MigrationManager:
                 "skipped": 0
             }
             
-            # Process frames in batches
-            skip = 0
-            while skip < total_frames:
-                self.logger.info(f"Processing batch: {skip + 1} to {min(skip + batch_size, total_frames)}")
-                
-                # Get batch of frames
-                cursor = collection.find({}).skip(skip).limit(batch_size)
+            # Secondary indexes only slow the $set flurry; rebuild them afterwards
+            if drop_indexes:
+                self._drop_secondary_indexes(collection)
+            else:
+                # Rebuild any indexes an interrupted earlier run left dropped
+                self._restore_indexes(collection)
+            
+            executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+            stop_prefetch = threading.Event()
+            
+            try:
+                # Process frames in batches while the next batch is prefetched
+                batch_queue: queue.Queue = queue.Queue(maxsize=2)
+                producer = threading.Thread(
+                    target=self._prefetch_batches,
+                    args=(collection, batch_size, batch_queue, stop_prefetch),
+                    daemon=True
+                )
+                producer.start()
                 
-                for frame_doc in cursor:
-                    try:
-                        # Check if frame already migrated (has file paths)
+                processed = 0
+                while True:
+                    batch = batch_queue.get()
+                    if batch is None:
+                        break
+                    if isinstance(batch, Exception):
+                        raise batch
+                    
+                    self.logger.info("Processing batch: %d to %d", processed + 1, processed + len(batch))
+                    
+                    # Check if frames already migrated (have file paths)
+                    to_migrate = []
+                    for frame_doc in batch:
                         if "original_image_path" in frame_doc or "processed_image_path" in frame_doc:
-                            self.logger.debug(f"Frame already migrated: {frame_doc['_id']}")
+                            self.logger.debug("Frame already migrated: %s", frame_doc['_id'])
                             stats["skipped"] += 1
-                            continue
-                        
-                        # Migrate frame
-                        if self.migrate_frame(frame_doc):
+                        else:
+                            to_migrate.append(frame_doc)
+                    
+                    # Migrate frames; migrate_frame handles its own errors
+                    if executor is not None:
+                        results = executor.map(self.migrate_frame, to_migrate)
+                    else:
+                        results = map(self.migrate_frame, to_migrate)
+                    
+                    for migrated in results:
+                        if migrated:
                             stats["migrated"] += 1
                         else:
                             stats["failed"] += 1
-                            
-                    except Exception as e:
-                        self.logger.error(f"Error processing frame {frame_doc.get('_id', 'unknown')}: {e}")
-                        stats["failed"] += 1
-                
-                skip += batch_size
-                
-                # Log progress
-                progress = (skip / total_frames) * 100
-                self.logger.info(f"Migration progress: {progress:.1f}% ({stats['migrated']} migrated, {stats['failed']} failed)")
+                    
+                    # Attach the new file paths for the whole batch in one round-trip
+                    update_failures = self._flush_pending_updates(collection)
+                    stats["migrated"] -= update_failures
+                    stats["failed"] += update_failures
+                    
+                    processed += len(batch)
+                    
+                    # Log progress
+                    # total_frames may be an estimate, so clamp the percentage
+                    progress = min(processed / total_frames, 1.0) * 100 if total_frames else 100.0
+                    self.logger.info("Migration progress: %.1f%% (%d migrated, %d failed)",
+                                     progress, stats["migrated"], stats["failed"])
+            
+            finally:
+                # Release the producer if the loop ended early (e.g. on an error)
+                stop_prefetch.set()
+                if executor is not None:
+                    executor.shutdown(wait=True)
+                if drop_indexes:
+                    self._restore_indexes(collection)
             
             return stats
             
         except Exception as e:
-            self.logger.error(f"Error during migration: {e}")
+            self.logger.error("Error during migration: %s", e)
             return {"error": str(e)}
     
-    def verify_migration(self, sample_size: int = 10) -> Dict[str, Any]:
+    def _scan_stored_files(self, directory: Path) -> Dict[str, int]:
+        """
+        List stored image files with a single scan of the storage tree.
+        
+        Walks the UUID-prefix shard directories as well as any legacy flat files.
+        
+        Args:
+            directory: Storage directory to scan
+            
+        Returns:
+            Dictionary mapping file name to size in bytes
+        """
+        if not directory.exists():
+            return {}
+        
+        files = {}
+        pending = [directory]
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        pending.append(entry.path)
+                    elif entry.is_file():
+                        files[entry.name] = entry.stat().st_size
+        return files
+    
+    def verify_migration(self, sample_size: int = 10, deep_verify: bool = False,
+                         deep_sample_size: int = 3) -> Dict[str, Any]:
         """
         Verify that migration was successful by checking sample frames.
         
+        Existence is checked against one scan of each storage directory
+        instead of loading every sampled frame. Decoding is only done with
+        deep_verify, and then only for a small sub-sample.
+        
         Args:
             sample_size: Number of frames to verify
+            deep_verify: If True, also decode a sub-sample of the stored frames
+            deep_sample_size: Number of existing frames to decode when deep_verify is set
             
         Returns:
             Verification results
@@ -201,8 +552,18 @@ class MigrationManager:
             if collection is None:
                 raise RuntimeError("Failed to get captured_frames collection")
             
-            # Get sample frames
-            sample_frames = list(collection.find({}).limit(sample_size))
+            # Get sample frames; only the path fields are inspected, so any
+            # base64 payloads (including *_backup fields) stay on the server
+            sample_frames = list(collection.find(
+                {},
+                projection={"original_image_path": 1, "processed_image_path": 1}
+            ).limit(sample_size))
+            
+            # One scan per directory, then O(1) lookups per document
+            stored_files = {
+                "processed_image_path": self._scan_stored_files(self.file_storage.processed_path),
+                "original_image_path": self._scan_stored_files(self.file_storage.original_path)
+            }
             
             verification_results = {
                 "total_checked": len(sample_frames),
@@ -213,27 +574,35 @@ class MigrationManager:
                 "errors": []
             }
             
+            deep_checked = 0
             for frame_doc in sample_frames:
                 frame_uuid = frame_doc["_id"]
                 
                 try:
-                    # Check if files exist
-                    has_original = "original_image_path" in frame_doc
-                    has_processed = "processed_image_path" in frame_doc
+                    path_fields = [field for field in stored_files if field in frame_doc]
+                    if not path_fields:
+                        verification_results["file_missing"] += 1
+                        verification_results["errors"].append(f"No file paths for frame: {frame_uuid}")
+                        continue
                     
-                    if has_original or has_processed:
-                        verification_results["file_exists"] += 1
-                        
-                        # Try to load frame
-                        frame = self.new_frame_db.get_frame(frame_uuid, "processed")
+                    # Every referenced file must be present and non-empty
+                    missing = [field for field in path_fields
+                               if stored_files[field].get(Path(frame_doc[field]).name, 0) <= 0]
+                    if missing:
+                        verification_results["file_missing"] += 1
+                        verification_results["errors"].append(f"Missing or empty files for frame {frame_uuid}: {missing}")
+                        continue
+                    
+                    verification_results["file_exists"] += 1
+                    
+                    if deep_verify and deep_checked < deep_sample_size:
+                        deep_checked += 1
+                        frame = self.file_storage.load_frame(frame_uuid, "processed")
                         if frame is not None:
                             verification_results["load_successful"] += 1
                         else:
                             verification_results["load_failed"] += 1
                             verification_results["errors"].append(f"Failed to load frame: {frame_uuid}")
-                    else:
-                        verification_results["file_missing"] += 1
-                        verification_results["errors"].append(f"No file paths for frame: {frame_uuid}")
                         
                 except Exception as e:
                     verification_results["load_failed"] += 1
@@ -242,15 +611,43 @@ class MigrationManager:
             return verification_results
             
         except Exception as e:
-            self.logger.error(f"Error during verification: {e}")
+            self.logger.error("Error during verification: %s", e)
             return {"error": str(e)}
     
-    def cleanup_old_data(self, keep_backup: bool = True) -> bool:
+    def _id_ranges(self, collection, chunks: int) -> List[Dict[str, Any]]:
+        """
+        Split the collection into roughly equal _id ranges.
+        
+        Args:
+            collection: Collection to split
+            chunks: Target number of ranges
+            
+        Returns:
+            List of _id range filters covering the whole collection
+        """
+        buckets = list(collection.aggregate(
+            [{"$bucketAuto": {"groupBy": "$_id", "buckets": chunks}}],
+            allowDiskUse=True
+        ))
+        
+        # Bucket bounds are [min, max) except the last, which includes its max
+        ranges = []
+        for index, bucket in enumerate(buckets):
+            upper = "$lte" if index == len(buckets) - 1 else "$lt"
+            ranges.append({"$gte": bucket["_id"]["min"], upper: bucket["_id"]["max"]})
+        return ranges
+    
+    def cleanup_old_data(self, keep_backup: bool = True, drop_indexes: bool = False,
+                         chunks: int = 32) -> bool:
         """
         Clean up old base64 data from MongoDB after successful migration.
         
         Args:
             keep_backup: If True, rename fields instead of deleting them
+            drop_indexes: If True, drop the non-unique secondary indexes during
+                cleanup and rebuild them afterwards
+            chunks: Number of _id ranges to update separately, so no single
+                update holds the collection for the whole run
             
         Returns:
             True if successful, False otherwise
@@ -260,31 +657,50 @@ class MigrationManager:
             if collection is None:
                 return False
             
-            if keep_backup:
-                # Rename old fields to backup fields
-                result = collection.update_many(
-                    {"frame_data": {"$exists": True}},
-                    {"$rename": {
+            if drop_indexes:
+                self._drop_secondary_indexes(collection)
+            else:
+                # Rebuild any indexes an interrupted earlier run left dropped
+                self._restore_indexes(collection)
+            
+            try:
+                if keep_backup:
+                    # Rename old fields to backup fields
+                    match = {"frame_data": {"$exists": True}}
+                    update = {"$rename": {
                         "frame_data": "frame_data_backup",
                         "original_frame_data": "original_frame_data_backup"
                     }}
-                )
-                self.logger.info(f"Renamed {result.modified_count} documents to backup fields")
-            else:
-                # Remove old fields completely
-                result = collection.update_many(
-                    {},
-                    {"$unset": {
+                else:
+                    # Remove old fields completely
+                    match = {}
+                    update = {"$unset": {
                         "frame_data": "",
                         "original_frame_data": ""
                     }}
-                )
-                self.logger.info(f"Removed base64 data from {result.modified_count} documents")
+                
+                # One update_many per _id range keeps each write short
+                ranges = self._id_ranges(collection, chunks)
+                modified = 0
+                for chunk_index, id_range in enumerate(ranges, start=1):
+                    result = collection.update_many({**match, "_id": id_range}, update)
+                    modified += result.modified_count
+                    self.logger.info("Cleanup chunk %d/%d: %d documents updated",
+                                     chunk_index, len(ranges), result.modified_count)
+                
+                if keep_backup:
+                    self.logger.info("Renamed %d documents to backup fields", modified)
+                else:
+                    self.logger.info("Removed base64 data from %d documents", modified)
+            
+            finally:
+                if drop_indexes:
+                    self._restore_indexes(collection)
             
             return True
             
         except Exception as e:
-            self.logger.error(f"Error cleaning up old data: {e}")
+            self.logger.error("Error cleaning up old data: %s", e)
             return False
 
 
@@ -295,12 +711,27 @@ def main():
                        help="Base path for file storage (default: data/frames)")
     parser.add_argument("--batch-size", type=int, default=100,
                        help="Batch size for processing (default: 100)")
+    parser.add_argument("--workers", type=int, default=1,
+                       help="Threads decoding and writing frames concurrently (default: 1)")
+    parser.add_argument("--decode-scale", type=int, choices=sorted(IMDECODE_FLAGS), default=1,
+                       help="Downscale frames by this factor while decoding; "
+                            "anything but 1 loses resolution (default: 1)")
     parser.add_argument("--dry-run", action="store_true",
                        help="Count frames without migrating")
+    parser.add_argument("--exact-count", action="store_true",
+                       help="Count frames exactly (full collection scan) instead of estimating")
     parser.add_argument("--verify", action="store_true",
                        help="Verify migration results")
+    parser.add_argument("--deep-verify", action="store_true",
+                       help="With --verify, also decode a small sub-sample of the stored frames")
     parser.add_argument("--cleanup", action="store_true",
                        help="Clean up old base64 data after migration")
+    parser.add_argument("--no-compress", action="store_true",
+                       help="Disable MongoDB wire compression for the migration connection")
+    parser.add_argument("--drop-indexes", action="store_true",
+                       help="Drop non-unique secondary indexes during migration/cleanup and rebuild them afterwards")
+    parser.add_argument("--shard-existing", action="store_true",
+                       help="Move flat frame files into the sharded directory layout")
     parser.add_argument("--keep-backup", action="store_true",
                        help="Keep backup of old data when cleaning up")
     
@@ -314,18 +745,26 @@ def main():
     
     try:
         # Initialize migration manager
-        migration = MigrationManager(args.storage_path)
+        migration = MigrationManager(args.storage_path, compress=not args.no_compress,
+                                     decode_scale=args.decode_scale)
+        
+        if args.shard_existing:
+            # One-time move of flat files into shard directories
+            print("📂 Moving flat frame files into shard directories...")
+            moved = migration.file_storage.shard_existing_files()
+            print(f"✅ Moved {moved} files")
         
-        if args.verify:
+        elif args.verify:
             # Verify migration
             print("🔍 Verifying migration...")
-            results = migration.verify_migration()
+            results = migration.verify_migration(deep_verify=args.deep_verify)
             print(f"✅ Verification complete:")
             print(f"   Total checked: {results.get('total_checked', 0)}")
             print(f"   Files exist: {results.get('file_exists', 0)}")
             print(f"   Files missing: {results.get('file_missing', 0)}")
-            print(f"   Load successful: {results.get('load_successful', 0)}")
-            print(f"   Load failed: {results.get('load_failed', 0)}")
+            if args.deep_verify:
+                print(f"   Load successful: {results.get('load_successful', 0)}")
+                print(f"   Load failed: {results.get('load_failed', 0)}")
             
             if results.get('errors'):
                 print(f"   Errors: {len(results['errors'])}")
@@ -335,7 +774,7 @@ def main():
         elif args.cleanup:
             # Clean up old data
             print("🧹 Cleaning up old base64 data...")
-            success = migration.cleanup_old_data(args.keep_backup)
+            success = migration.cleanup_old_data(args.keep_backup, args.drop_indexes)
             if success:
                 print("✅ Cleanup completed successfully")
             else:
@@ -346,20 +785,25 @@ def main():
             print("🚀 Starting migration from base64 to file storage...")
             print(f"📁 Storage path: {args.storage_path}")
             print(f"📦 Batch size: {args.batch_size}")
+            print(f"🧵 Workers: {args.workers}")
             
             if args.dry_run:
                 print("🔍 DRY RUN - No actual migration will be performed")
             
-            stats = migration.migrate_all_frames(args.batch_size, args.dry_run)
+            stats = migration.migrate_all_frames(args.batch_size, args.dry_run, args.exact_count,
+                                                 args.drop_indexes, args.workers)
             
             print("\n📊 Migration Results:")
-            print(f"   Total frames: {stats.get('total_frames', 0)}")
+            total_label = "Total frames" if args.exact_count else "Total frames (estimated)"
+            print(f"   {total_label}: {stats.get('total_frames', 0)}")
             print(f"   Migrated: {stats.get('migrated', 0)}")
             print(f"   Failed: {stats.get('failed', 0)}")
             print(f"   Skipped: {stats.get('skipped', 0)}")
             
             if stats.get('migrated', 0) > 0:
-                success_rate = (stats['migrated'] / stats['total_frames']) * 100
+                # Rate over frames actually seen, since the total may be estimated
+                seen = stats['migrated'] + stats['failed'] + stats['skipped']
+                success_rate = (stats['migrated'] / seen) * 100
                 print(f"   Success rate: {success_rate:.1f}%")
             
             if not args.dry_run and stats.get('migrated', 0) > 0:
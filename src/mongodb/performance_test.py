@@ -9,7 +9,13 @@ import os
 import sys
 import time
 import uuid
+import queue
+import pickle
 import logging
+import tempfile
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import List, Dict, Any
 import numpy as np
@@ -21,14 +27,83 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 from mongodb.database_manager import DatabaseManager
 from mongodb.frame_database import FrameDatabase  # Old version
 from mongodb.frame_database_v2 import FrameDatabaseV2  # New version
+from mongodb.file_storage_manager import encode_jpeg
+from mongodb.lmdb_storage_manager import HAS_LMDB
+
+# Frames per save_frames_bulk call in the save benchmarks
+SAVE_BATCH_SIZE = 100
+
+# JPEG quality for the pre-encoded test frames (FileStorageManager default)
+TEST_JPEG_QUALITY = 95
+
+# Metadata timing should not pay for the base64 payloads
+BASE64_METADATA_PROJECTION = {"frame_data": 0, "original_frame_data": 0}
+
+# Threads for JPEG encode/decode; cv2 releases the GIL while coding
+CODEC_WORKERS = os.cpu_count() or 1
+
+# Size of the pre-rendered test frame overlay (shapes and "Frame " label)
+STAMP_HEIGHT = 220
+STAMP_WIDTH = 320
+
+# Timings use the monotonic perf_counter_ns clock, converted once per interval
+NS_PER_SECOND = 1_000_000_000
+
+# Save benchmarks insert with acknowledged writes unless run with
+# --unacknowledged-writes (w=0), which times encoding and storage media
+# rather than MongoDB acknowledgements but makes the inserts non-durable
+ACKNOWLEDGED_WRITES = True
+
+# Longest wait for unacknowledged inserts to become visible before the
+# read-back and cleanup steps, and the polling interval while waiting
+WRITE_BARRIER_TIMEOUT = 30.0
+WRITE_BARRIER_POLL = 0.01
+
+# Storage benchmarks in run order: (results key, log title, test method)
+STORAGE_TESTS = [
+    ("base64", "Base64 Storage", "test_base64_storage"),
+    ("file_storage", "File Storage", "test_file_storage"),
+    ("file_storage_with_original", "File Storage with Original", "test_file_storage_with_original"),
+    ("packed_storage", "Packed File Storage", "test_packed_storage"),
+    ("lmdb_storage", "LMDB Storage", "test_lmdb_storage"),
+]
+
+
+def _run_storage_test(test_method: str, frames_path: str, acknowledged_writes: bool) -> Dict[str, Any]:
+    """
+    Run one storage benchmark in a worker process.
+    
+    The worker opens its own MongoDB connection and loads the shared test
+    frames from frames_path, so no client or LMDB handle crosses processes.
+    
+    Args:
+        test_method: Name of the PerformanceTester test method to run
+        frames_path: Pickle of (test_frames, test_jpegs)
+        acknowledged_writes: Whether the save benchmarks wait for MongoDB
+            acknowledgements
+        
+    Returns:
+        Performance metrics from the test method
+    """
+    tester = PerformanceTester(acknowledged_writes)
+    with open(frames_path, "rb") as frames_file:
+        tester.test_frames, tester.test_jpegs = pickle.load(frames_file)
+    tester.warmup()
+    return getattr(tester, test_method)()
 
 
 class PerformanceTester:
     """Tests performance differences between storage methods."""
     
-    def __init__(self):
-        """Initialize the performance tester."""
+    def __init__(self, acknowledged_writes: bool = ACKNOWLEDGED_WRITES):
+        """
+        Initialize the performance tester.
+        
+        Args:
+            acknowledged_writes: If False, the save benchmarks insert with w=0
+        """
         self.logger = logging.getLogger(__name__)
+        self.acknowledged_writes = acknowledged_writes
         
         # Initialize database connections
         self.db_manager = DatabaseManager()
@@ -38,9 +113,19 @@ class PerformanceTester:
         # Initialize both frame databases
         self.old_frame_db = FrameDatabase(self.db_manager)
         self.new_frame_db = FrameDatabaseV2(self.db_manager, "data/performance_test")
+        self.lmdb_frame_db = (FrameDatabaseV2(self.db_manager, "data/performance_test", storage_backend="lmdb")
+                              if HAS_LMDB else None)
         
-        # Test data
+        # Build the secondary indexes before any timing so the save runs pay
+        # steady-state index maintenance rather than a mid-benchmark build
+        # (FrameDatabaseV2 creates its indexes on construction; lookups by
+        # UUID use the built-in unique _id index)
+        self.old_frame_db.create_indexes()
+        
+        # Test data; test_jpegs holds each test frame encoded once, so the
+        # save benchmarks measure storage cost rather than the JPEG codec
         self.test_frames = []
+        self.test_jpegs = []
         self.test_uuids = []
         
     def generate_test_frames(self, count: int = 100) -> List[np.ndarray]:
@@ -55,30 +140,101 @@ class PerformanceTester:
         """
         self.logger.info(f"Generating {count} test frames...")
         
+        # Generator API: draws uint8 noise directly instead of via int64
+        rng = np.random.default_rng()
+        
+        # The overlay is identical for every frame except the index digits:
+        # draw it once into a stamp and copy it in through its mask, so only
+        # the digits are rasterised per frame
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        (prefix_width, _), _ = cv2.getTextSize("Frame ", font, 1, 2)
+        stamp = np.zeros((STAMP_HEIGHT, STAMP_WIDTH, 3), dtype=np.uint8)
+        cv2.rectangle(stamp, (10, 10), (50, 50), (255, 0, 0), 2)
+        cv2.circle(stamp, (100, 100), 30, (0, 255, 0), -1)
+        cv2.putText(stamp, "Frame ", (200, 200), font, 1, (0, 0, 255), 2)
+        stamp_mask = stamp.any(axis=2)
+        
         frames = []
         for i in range(count):
             # Create frames of different sizes
             if i % 3 == 0:
                 # Small frame (320x240)
-                frame = np.random.randint(0, 255, (240, 320, 3), dtype=np.uint8)
+                frame = rng.integers(0, 256, (240, 320, 3), dtype=np.uint8)
             elif i % 3 == 1:
                 # Medium frame (640x480)
-                frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+                frame = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
             else:
                 # Large frame (1280x720)
-                frame = np.random.randint(0, 255, (720, 1280, 3), dtype=np.uint8)
+                frame = rng.integers(0, 256, (720, 1280, 3), dtype=np.uint8)
             
             # Add some structure to make it more realistic
-            cv2.rectangle(frame, (10, 10), (50, 50), (255, 0, 0), 2)
-            cv2.circle(frame, (100, 100), 30, (0, 255, 0), -1)
-            cv2.putText(frame, f"Frame {i}", (200, 200), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+            height = min(STAMP_HEIGHT, frame.shape[0])
+            width = min(STAMP_WIDTH, frame.shape[1])
+            region = frame[:height, :width]
+            mask = stamp_mask[:height, :width]
+            region[mask] = stamp[:height, :width][mask]
+            cv2.putText(frame, str(i), (200 + prefix_width, 200), font, 1, (0, 0, 255), 2)
             
             frames.append(frame)
         
         self.test_frames = frames
+        # Same encoder as the save paths, so pre-encoded runs store identical bytes
+        self.test_jpegs = [encode_jpeg(frame, TEST_JPEG_QUALITY) for frame in frames]
         self.logger.info(f"Generated {len(frames)} test frames")
         return frames
     
+    def warmup(self):
+        """
+        Exercise MongoDB and the storage backends once before any timing.
+        
+        Opens pooled connections, loads the collection's indexes and primes
+        the storage directories, so the first timed batch is not charged
+        for connection setup.
+        """
+        self.logger.info("Warming up connections and storage...")
+        
+        collection = self.db_manager.get_collection(self.new_frame_db.collection_name)
+        if collection is not None:
+            collection.find_one({}, {"_id": 1})
+            warmup_id = f"warmup_{uuid.uuid4()}"
+            collection.insert_one({"_id": warmup_id, "metadata": {"warmup": True}})
+            collection.delete_one({"_id": warmup_id})
+        
+        warmup_frame = np.zeros((32, 32, 3), dtype=np.uint8)
+        storages = [self.new_frame_db.file_storage]
+        if self.lmdb_frame_db is not None:
+            storages.append(self.lmdb_frame_db.file_storage)
+        for storage in storages:
+            warmup_uuid = str(uuid.uuid4())
+            if storage.save_frame(warmup_frame, warmup_uuid, "processed"):
+                storage.load_frame(warmup_uuid, "processed")
+                storage.delete_frame(warmup_uuid, "processed")
+    
+    def wait_for_writes(self, uuids: List[str]):
+        """
+        Block until the unacknowledged inserts of the given frames are visible.
+        
+        Barrier between a w=0 save benchmark and its read-back and cleanup,
+        which would otherwise race the inserts. No-op for acknowledged writes.
+        
+        Args:
+            uuids: UUIDs of the frames just saved
+        """
+        if self.acknowledged_writes or not uuids:
+            return
+        
+        collection = self.db_manager.get_collection(self.new_frame_db.collection_name)
+        if collection is None:
+            return
+        
+        query = {"_id": {"$in": uuids}}
+        deadline = time.monotonic() + WRITE_BARRIER_TIMEOUT
+        while collection.count_documents(query) < len(uuids):
+            if time.monotonic() > deadline:
+                self.logger.warning(f"Unacknowledged inserts still not visible after {WRITE_BARRIER_TIMEOUT}s")
+                return
+            time.sleep(WRITE_BARRIER_POLL)
+    
     def test_base64_storage(self) -> Dict[str, Any]:
         """
         Test storing frames using base64 in MongoDB.
@@ -88,49 +244,52 @@ class PerformanceTester:
         """
         self.logger.info("Testing base64 storage...")
         
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         uuids = []
-        
-        for i, frame in enumerate(self.test_frames):
-            metadata = {
-                "test_id": f"base64_test_{i}",
+        batch_times = []
+        
+        # Save in batches so each batch costs one insert_many round-trip
+        for batch_start in range(0, len(self.test_frames), SAVE_BATCH_SIZE):
+            batch = self.test_frames[batch_start:batch_start + SAVE_BATCH_SIZE]
+            jpegs = self.test_jpegs[batch_start:batch_start + SAVE_BATCH_SIZE]
+            metadatas = [{
+                "test_id": f"base64_test_{batch_start + i}",
                 "frame_size": frame.shape,
                 "timestamp": time.time()
-            }
+            } for i, frame in enumerate(batch)]
             
-            frame_uuid = self.old_frame_db.save_frame(frame, metadata)
-            if frame_uuid:
-                uuids.append(frame_uuid)
+            batch_start_time = time.perf_counter_ns()
+            uuids.extend(self.old_frame_db.save_frames_bulk(batch, metadatas, workers=CODEC_WORKERS,
+                                                            jpeg_frames=jpegs,
+                                                            acknowledged=self.acknowledged_writes))
+            batch_times.append((time.perf_counter_ns() - batch_start_time) / NS_PER_SECOND)
         
-        save_time = time.time() - start_time
+        save_time = (time.perf_counter_ns() - start_time) / NS_PER_SECOND
+        self.wait_for_writes(uuids)
         
         # Test retrieval
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         retrieved_frames = []
         
-        for frame_uuid in uuids[:10]:  # Test retrieval of first 10
-            frame = self.old_frame_db.get_frame(frame_uuid)
+        # Test retrieval of first 10: one query, decoding in parallel
+        for frame in self.old_frame_db.get_frames(uuids[:10], workers=CODEC_WORKERS):
             if frame is not None:
                 retrieved_frames.append(frame)
         
-        retrieval_time = time.time() - start_time
+        retrieval_time = (time.perf_counter_ns() - start_time) / NS_PER_SECOND
         
         # Test metadata retrieval
-        start_time = time.time()
-        metadata_list = []
-        
-        for frame_uuid in uuids[:10]:
-            metadata = self.old_frame_db.get_frame_metadata(frame_uuid)
-            if metadata:
-                metadata_list.append(metadata)
+        start_time = time.perf_counter_ns()
+        metadata_list = self.old_frame_db.get_many_metadata(uuids[:10], projection=BASE64_METADATA_PROJECTION)
         
-        metadata_time = time.time() - start_time
+        metadata_time = (time.perf_counter_ns() - start_time) / NS_PER_SECOND
         
         return {
             "method": "base64",
             "frames_saved": len(uuids),
             "save_time": save_time,
             "save_rate": len(uuids) / save_time,
+            "batch_times": batch_times,
             "retrieval_time": retrieval_time,
             "retrieval_rate": len(retrieved_frames) / retrieval_time,
             "metadata_time": metadata_time,
@@ -147,49 +306,167 @@ class PerformanceTester:
         """
         self.logger.info("Testing file storage...")
         
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         uuids = []
-        
-        for i, frame in enumerate(self.test_frames):
-            metadata = {
-                "test_id": f"file_test_{i}",
+        batch_times = []
+        
+        # Save in batches so each batch costs one insert_many round-trip
+        for batch_start in range(0, len(self.test_frames), SAVE_BATCH_SIZE):
+            batch = self.test_frames[batch_start:batch_start + SAVE_BATCH_SIZE]
+            jpegs = self.test_jpegs[batch_start:batch_start + SAVE_BATCH_SIZE]
+            metadatas = [{
+                "test_id": f"file_test_{batch_start + i}",
                 "frame_size": frame.shape,
                 "timestamp": time.time()
-            }
+            } for i, frame in enumerate(batch)]
             
-            frame_uuid = self.new_frame_db.save_frame(frame, metadata)
-            if frame_uuid:
-                uuids.append(frame_uuid)
+            batch_start_time = time.perf_counter_ns()
+            uuids.extend(self.new_frame_db.save_frames_bulk(batch, metadatas, workers=CODEC_WORKERS,
+                                                            jpeg_frames=jpegs,
+                                                            acknowledged=self.acknowledged_writes))
+            batch_times.append((time.perf_counter_ns() - batch_start_time) / NS_PER_SECOND)
         
-        save_time = time.time() - start_time
+        save_time = (time.perf_counter_ns() - start_time) / NS_PER_SECOND
+        self.wait_for_writes(uuids)
         
         # Test retrieval
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         retrieved_frames = []
         
-        for frame_uuid in uuids[:10]:  # Test retrieval of first 10
-            frame = self.new_frame_db.get_frame(frame_uuid)
+        # Test retrieval of first 10: one query, decoding in parallel
+        for frame in self.new_frame_db.get_frames(uuids[:10], workers=CODEC_WORKERS):
             if frame is not None:
                 retrieved_frames.append(frame)
         
-        retrieval_time = time.time() - start_time
+        retrieval_time = (time.perf_counter_ns() - start_time) / NS_PER_SECOND
         
         # Test metadata retrieval
-        start_time = time.time()
-        metadata_list = []
-        
-        for frame_uuid in uuids[:10]:
-            metadata = self.new_frame_db.get_frame_metadata(frame_uuid)
-            if metadata:
-                metadata_list.append(metadata)
+        start_time = time.perf_counter_ns()
+        metadata_list = self.new_frame_db.get_many_metadata(uuids[:10])
         
-        metadata_time = time.time() - start_time
+        metadata_time = (time.perf_counter_ns() - start_time) / NS_PER_SECOND
         
         return {
             "method": "file_storage",
             "frames_saved": len(uuids),
             "save_time": save_time,
             "save_rate": len(uuids) / save_time,
+            "batch_times": batch_times,
+            "retrieval_time": retrieval_time,
+            "retrieval_rate": len(retrieved_frames) / retrieval_time,
+            "metadata_time": metadata_time,
+            "metadata_rate": len(metadata_list) / metadata_time,
+            "uuids": uuids
+        }
+    
+    def test_packed_storage(self) -> Dict[str, Any]:
+        """
+        Test storing frames appended to pack files with offsets in MongoDB.
+        
+        Returns:
+            Performance metrics
+        """
+        self.logger.info("Testing packed file storage...")
+        
+        start_time = time.perf_counter_ns()
+        uuids = []
+        batch_times = []
+        
+        # One pack append and one insert_many per batch
+        for batch_start in range(0, len(self.test_frames), SAVE_BATCH_SIZE):
+            batch = self.test_frames[batch_start:batch_start + SAVE_BATCH_SIZE]
+            jpegs = self.test_jpegs[batch_start:batch_start + SAVE_BATCH_SIZE]
+            metadatas = [{
+                "test_id": f"packed_test_{batch_start + i}",
+                "frame_size": frame.shape,
+                "timestamp": time.time()
+            } for i, frame in enumerate(batch)]
+            
+            batch_start_time = time.perf_counter_ns()
+            uuids.extend(self.new_frame_db.save_frames_packed(jpegs, [frame.shape for frame in batch], metadatas,
+                                                              acknowledged=self.acknowledged_writes))
+            batch_times.append((time.perf_counter_ns() - batch_start_time) / NS_PER_SECOND)
+        
+        save_time = (time.perf_counter_ns() - start_time) / NS_PER_SECOND
+        self.wait_for_writes(uuids)
+        
+        # Test retrieval of first 10: one query, slices of the mapped pack
+        start_time = time.perf_counter_ns()
+        retrieved_frames = [frame for frame in self.new_frame_db.get_frames_packed(uuids[:10], workers=CODEC_WORKERS)
+                            if frame is not None]
+        
+        retrieval_time = (time.perf_counter_ns() - start_time) / NS_PER_SECOND
+        
+        # Test metadata retrieval
+        start_time = time.perf_counter_ns()
+        metadata_list = self.new_frame_db.get_many_metadata(uuids[:10])
+        
+        metadata_time = (time.perf_counter_ns() - start_time) / NS_PER_SECOND
+        
+        return {
+            "method": "packed_storage",
+            "frames_saved": len(uuids),
+            "save_time": save_time,
+            "save_rate": len(uuids) / save_time,
+            "batch_times": batch_times,
+            "retrieval_time": retrieval_time,
+            "retrieval_rate": len(retrieved_frames) / retrieval_time,
+            "metadata_time": metadata_time,
+            "metadata_rate": len(metadata_list) / metadata_time,
+            "uuids": uuids
+        }
+    
+    def test_lmdb_storage(self) -> Dict[str, Any]:
+        """
+        Test storing frames in LMDB with metadata in MongoDB.
+        
+        Returns:
+            Performance metrics
+        """
+        self.logger.info("Testing LMDB storage...")
+        
+        start_time = time.perf_counter_ns()
+        uuids = []
+        batch_times = []
+        
+        # Same batches as test_file_storage, written as LMDB records
+        for batch_start in range(0, len(self.test_frames), SAVE_BATCH_SIZE):
+            batch = self.test_frames[batch_start:batch_start + SAVE_BATCH_SIZE]
+            jpegs = self.test_jpegs[batch_start:batch_start + SAVE_BATCH_SIZE]
+            metadatas = [{
+                "test_id": f"lmdb_test_{batch_start + i}",
+                "frame_size": frame.shape,
+                "timestamp": time.time()
+            } for i, frame in enumerate(batch)]
+            
+            batch_start_time = time.perf_counter_ns()
+            uuids.extend(self.lmdb_frame_db.save_frames_bulk(batch, metadatas, workers=CODEC_WORKERS,
+                                                             jpeg_frames=jpegs,
+                                                             acknowledged=self.acknowledged_writes))
+            batch_times.append((time.perf_counter_ns() - batch_start_time) / NS_PER_SECOND)
+        
+        save_time = (time.perf_counter_ns() - start_time) / NS_PER_SECOND
+        self.wait_for_writes(uuids)
+        
+        # Test retrieval of first 10
+        start_time = time.perf_counter_ns()
+        retrieved_frames = [frame for frame in self.lmdb_frame_db.get_frames(uuids[:10], workers=CODEC_WORKERS)
+                            if frame is not None]
+        
+        retrieval_time = (time.perf_counter_ns() - start_time) / NS_PER_SECOND
+        
+        # Test metadata retrieval
+        start_time = time.perf_counter_ns()
+        metadata_list = self.lmdb_frame_db.get_many_metadata(uuids[:10])
+        
+        metadata_time = (time.perf_counter_ns() - start_time) / NS_PER_SECOND
+        
+        return {
+            "method": "lmdb_storage",
+            "frames_saved": len(uuids),
+            "save_time": save_time,
+            "save_rate": len(uuids) / save_time,
+            "batch_times": batch_times,
             "retrieval_time": retrieval_time,
             "retrieval_rate": len(retrieved_frames) / retrieval_time,
             "metadata_time": metadata_time,
@@ -206,10 +483,10 @@ class PerformanceTester:
         """
         self.logger.info("Testing file storage with original frames...")
         
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         uuids = []
         
-        for i, frame in enumerate(self.test_frames):
+        def save_with_original(i: int, frame: np.ndarray):
             # Create a "processed" version with some modifications
             processed_frame = frame.copy()
             cv2.rectangle(processed_frame, (0, 0), (50, 50), (255, 255, 0), 3)
@@ -220,27 +497,26 @@ class PerformanceTester:
                 "timestamp": time.time()
             }
             
-            frame_uuid = self.new_frame_db.save_frame_with_original(frame, processed_frame, metadata)
-            if frame_uuid:
-                uuids.append(frame_uuid)
+            return self.new_frame_db.save_frame_with_original(frame, processed_frame, metadata)
         
-        save_time = time.time() - start_time
+        # Encode and write frames in parallel; each worker does its own insert
+        with ThreadPoolExecutor(max_workers=CODEC_WORKERS) as executor:
+            for frame_uuid in executor.map(save_with_original, range(len(self.test_frames)), self.test_frames):
+                if frame_uuid:
+                    uuids.append(frame_uuid)
         
-        # Test retrieval of both types
-        start_time = time.time()
-        original_frames = []
-        processed_frames = []
+        save_time = (time.perf_counter_ns() - start_time) / NS_PER_SECOND
         
-        for frame_uuid in uuids[:10]:  # Test retrieval of first 10
-            original_frame = self.new_frame_db.get_frame(frame_uuid, "original")
-            processed_frame = self.new_frame_db.get_frame(frame_uuid, "processed")
-            
-            if original_frame is not None:
-                original_frames.append(original_frame)
-            if processed_frame is not None:
-                processed_frames.append(processed_frame)
+        # Test retrieval of both types (first 10), decoding in parallel
+        start_time = time.perf_counter_ns()
+        
+        originals = self.new_frame_db.get_frames(uuids[:10], "original", workers=CODEC_WORKERS)
+        processed = self.new_frame_db.get_frames(uuids[:10], "processed", workers=CODEC_WORKERS)
         
-        retrieval_time = time.time() - start_time
+        original_frames = [frame for frame in originals if frame is not None]
+        processed_frames = [frame for frame in processed if frame is not None]
+        
+        retrieval_time = (time.perf_counter_ns() - start_time) / NS_PER_SECOND
         
         return {
             "method": "file_storage_with_original",
@@ -264,20 +540,28 @@ class PerformanceTester:
         """
         self.logger.info(f"Cleaning up {method} test data...")
         
-        for frame_uuid in uuids:
-            if method == "base64":
-                self.old_frame_db.delete_frame(frame_uuid)
-            else:
-                self.new_frame_db.delete_frame(frame_uuid)
-        
-        self.logger.info(f"Cleaned up {len(uuids)} frames")
+        if method == "base64":
+            deleted = self.old_frame_db.delete_frames_bulk(uuids)
+        elif method == "lmdb_storage":
+            deleted = self.lmdb_frame_db.delete_frames_bulk(uuids)
+        elif method == "packed_storage":
+            deleted = self.new_frame_db.delete_frames_bulk(uuids, delete_files=False)
+            self.new_frame_db.file_storage.delete_all_packs()
+        else:
+            deleted = self.new_frame_db.delete_frames_bulk(uuids)
+        
+        self.logger.info(f"Cleaned up {deleted} frames")
     
-    def run_performance_test(self, frame_count: int = 100) -> Dict[str, Any]:
+    def run_performance_test(self, frame_count: int = 100, parallel: bool = False) -> Dict[str, Any]:
         """
         Run complete performance test comparing both methods.
         
         Args:
             frame_count: Number of frames to test with
+            parallel: Run the storage tests concurrently, one process each.
+                Shortens wall-clock time, but the tests then compete for
+                CPU, disk and MongoDB, so their rates are not comparable
+                with serial runs.
             
         Returns:
             Complete performance comparison
@@ -287,41 +571,42 @@ class PerformanceTester:
         # Generate test frames
         self.generate_test_frames(frame_count)
         
+        # Serial runs share this process's connections; parallel workers
+        # warm up their own
+        if not parallel:
+            self.warmup()
+        
+        # LMDB storage is an optional dependency
+        tests = [test for test in STORAGE_TESTS
+                 if test[0] != "lmdb_storage" or self.lmdb_frame_db is not None]
+        if len(tests) < len(STORAGE_TESTS):
+            self.logger.info("lmdb not installed, skipping LMDB storage test")
+        
         results = {}
         
         try:
-            # Test base64 storage
-            self.logger.info("=" * 50)
-            self.logger.info("Testing Base64 Storage")
-            self.logger.info("=" * 50)
-            results["base64"] = self.test_base64_storage()
-            
-            # Test file storage
-            self.logger.info("=" * 50)
-            self.logger.info("Testing File Storage")
-            self.logger.info("=" * 50)
-            results["file_storage"] = self.test_file_storage()
-            
-            # Test file storage with original
-            self.logger.info("=" * 50)
-            self.logger.info("Testing File Storage with Original")
-            self.logger.info("=" * 50)
-            results["file_storage_with_original"] = self.test_file_storage_with_original()
+            if parallel:
+                self._run_tests_parallel(tests, results)
+            else:
+                for key, title, test_method in tests:
+                    self.logger.info("=" * 50)
+                    self.logger.info(f"Testing {title}")
+                    self.logger.info("=" * 50)
+                    results[key] = getattr(self, test_method)()
             
-            # Calculate improvements
+            # Calculate improvements; only tests with the same workload (bulk
+            # saves of pre-encoded JPEGs, no thumbnails) are compared, so the
+            # with-original test, which encodes both frames and builds
+            # thumbnails one frame at a time, is reported on its own
             base64_save_rate = results["base64"]["save_rate"]
             file_save_rate = results["file_storage"]["save_rate"]
-            file_original_save_rate = results["file_storage_with_original"]["save_rate"]
             
             base64_retrieval_rate = results["base64"]["retrieval_rate"]
             file_retrieval_rate = results["file_storage"]["retrieval_rate"]
-            file_original_retrieval_rate = results["file_storage_with_original"]["retrieval_rate"]
             
             results["improvements"] = {
                 "save_speedup": file_save_rate / base64_save_rate if base64_save_rate > 0 else 0,
-                "retrieval_speedup": file_retrieval_rate / base64_retrieval_rate if base64_retrieval_rate > 0 else 0,
-                "save_speedup_with_original": file_original_save_rate / base64_save_rate if base64_save_rate > 0 else 0,
-                "retrieval_speedup_with_original": file_original_retrieval_rate / base64_retrieval_rate if base64_retrieval_rate > 0 else 0
+                "retrieval_speedup": file_retrieval_rate / base64_retrieval_rate if base64_retrieval_rate > 0 else 0
             }
             
         finally:
@@ -332,36 +617,83 @@ class PerformanceTester:
                 self.cleanup_test_data(results["file_storage"]["uuids"], "file_storage")
             if "file_storage_with_original" in results:
                 self.cleanup_test_data(results["file_storage_with_original"]["uuids"], "file_storage")
+            if "packed_storage" in results:
+                self.cleanup_test_data(results["packed_storage"]["uuids"], "packed_storage")
+            if "lmdb_storage" in results:
+                self.cleanup_test_data(results["lmdb_storage"]["uuids"], "lmdb_storage")
         
         return results
     
+    def _run_tests_parallel(self, tests: List[tuple], results: Dict[str, Any]):
+        """
+        Run storage tests concurrently in worker processes.
+        
+        Results are stored into results as each test completes, so the
+        caller can clean up whatever finished even if another test fails.
+        
+        Args:
+            tests: (results key, log title, test method) entries to run
+            results: Dictionary receiving each test's metrics
+        """
+        # Spawned workers share the frames through one pickle rather than
+        # regenerating them; spawn (not fork) keeps the parent's MongoClient
+        # and LMDB environment out of the children
+        with tempfile.NamedTemporaryFile(suffix=".pkl", delete=False) as frames_file:
+            pickle.dump((self.test_frames, self.test_jpegs), frames_file, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        try:
+            with ProcessPoolExecutor(max_workers=len(tests),
+                                     mp_context=multiprocessing.get_context("spawn")) as executor:
+                futures = {executor.submit(_run_storage_test, test_method, frames_file.name,
+                                           self.acknowledged_writes): (key, title)
+                           for key, title, test_method in tests}
+                for future in as_completed(futures):
+                    key, title = futures[future]
+                    results[key] = future.result()
+                    self.logger.info(f"Finished {title} test")
+        finally:
+            os.unlink(frames_file.name)
+    
     def print_results(self, results: Dict[str, Any]):
         """Print performance test results in a readable format."""
-        print("\n" + "=" * 80)
-        print("PERFORMANCE TEST RESULTS")
-        print("=" * 80)
+        # Build the whole report and write it once instead of line by line
+        lines = [
+            "",
+            "=" * 80,
+            "PERFORMANCE TEST RESULTS",
+            "=" * 80
+        ]
+        if not self.acknowledged_writes:
+            lines.append("Note: saves use unacknowledged (w=0) inserts; rates exclude MongoDB "
+                         "acknowledgement latency and the writes are not durable")
         
         for method, data in results.items():
             if method == "improvements":
                 continue
                 
-            print(f"\n{method.upper().replace('_', ' ')}:")
-            print(f"  Frames saved: {data['frames_saved']}")
-            print(f"  Save time: {data['save_time']:.2f} seconds")
-            print(f"  Save rate: {data['save_rate']:.2f} frames/second")
-            print(f"  Retrieval time: {data['retrieval_time']:.2f} seconds")
-            print(f"  Retrieval rate: {data['retrieval_rate']:.2f} frames/second")
+            lines.append(f"\n{method.upper().replace('_', ' ')}:")
+            if method == "file_storage_with_original":
+                lines.append("  (encodes original and processed frames and builds thumbnails per frame; "
+                             "not comparable with the bulk pre-encoded tests)")
+            lines.append(f"  Frames saved: {data['frames_saved']}")
+            lines.append(f"  Save time: {data['save_time']:.2f} seconds")
+            lines.append(f"  Save rate: {data['save_rate']:.2f} frames/second")
+            if data.get('batch_times'):
+                lines.append(f"  Batches: {len(data['batch_times'])} "
+                             f"(avg {sum(data['batch_times']) / len(data['batch_times']):.3f} seconds/batch)")
+            lines.append(f"  Retrieval time: {data['retrieval_time']:.2f} seconds")
+            lines.append(f"  Retrieval rate: {data['retrieval_rate']:.2f} frames/second")
             if 'metadata_time' in data:
-                print(f"  Metadata time: {data['metadata_time']:.2f} seconds")
-                print(f"  Metadata rate: {data['metadata_rate']:.2f} frames/second")
+                lines.append(f"  Metadata time: {data['metadata_time']:.2f} seconds")
+                lines.append(f"  Metadata rate: {data['metadata_rate']:.2f} frames/second")
         
         if "improvements" in results:
-            print(f"\nIMPROVEMENTS (File Storage vs Base64):")
-            print(f"  Save speedup: {results['improvements']['save_speedup']:.2f}x")
-            print(f"  Retrieval speedup: {results['improvements']['retrieval_speedup']:.2f}x")
-            print(f"  Save speedup (with original): {results['improvements']['save_speedup_with_original']:.2f}x")
-            print(f"  Retrieval speedup (with original): {results['improvements']['retrieval_speedup_with_original']:.2f}x")
-
+            lines.append(f"\nIMPROVEMENTS (File Storage vs Base64):")
+            lines.append(f"  Save speedup: {results['improvements']['save_speedup']:.2f}x")
+            lines.append(f"  Retrieval speedup: {results['improvements']['retrieval_speedup']:.2f}x")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
 def main():
     """Main performance test function."""
@@ -370,22 +702,34 @@ def main():
     parser = argparse.ArgumentParser(description="Performance test: Base64 vs File Storage")
     parser.add_argument("--frames", type=int, default=100,
                        help="Number of frames to test with (default: 100)")
+    parser.add_argument("--parallel", action="store_true",
+                       help="Run the storage tests concurrently in separate processes")
+    parser.add_argument("--unacknowledged-writes", action="store_true",
+                       help="Save with unacknowledged (w=0) inserts; rates then exclude MongoDB "
+                            "acknowledgement latency and the test writes are not durable")
     parser.add_argument("--verbose", action="store_true",
                        help="Enable verbose logging")
     
     args = parser.parse_args()
     
-    # Setup logging
+    # Setup logging: records are queued by the benchmark threads and written
+    # to the console by a listener thread, keeping log I/O out of the timings
     log_level = logging.DEBUG if args.verbose else logging.INFO
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(log_queue, console_handler)
+    logging.basicConfig(level=log_level, handlers=[QueueHandler(log_queue)])
+    log_listener.start()
     
     try:
-        # Run performance test
-        tester = PerformanceTester()
-        results = tester.run_performance_test(args.frames)
+        try:
+            # Run performance test
+            tester = PerformanceTester(acknowledged_writes=not args.unacknowledged_writes)
+            results = tester.run_performance_test(args.frames, parallel=args.parallel)
+        finally:
+            # Flush pending log records before the report
+            log_listener.stop()
         
         # Print results
         tester.print_results(results)
@@ -0,0 +1,151 @@
+"""
+Tests for bulk frame saves and batched retrieval.
+
+Round-trips frames through save_frames_bulk / get_frames for the base64,
+file and LMDB backends, and through the pack files. Needs a local MongoDB;
+the tests are skipped when none is reachable.
+"""
+
+import os
+import sys
+import numpy as np
+import cv2
+import pytest
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mongodb.database_manager import DatabaseManager
+from mongodb.frame_database import FrameDatabase
+from mongodb.frame_database_v2 import FrameDatabaseV2
+from mongodb.lmdb_storage_manager import HAS_LMDB
+
+pytestmark = pytest.mark.integration
+
+# Separate database so the tests never touch captured frames
+TEST_DATABASE = "birds_of_play_test"
+
+# Mean absolute pixel difference allowed for JPEG round-trips
+MAX_MEAN_DIFF = 5.0
+
+
+def create_test_frames(count: int = 5) -> list:
+    """Create smooth test frames (JPEG-friendly, so round-trips stay close)."""
+    frames = []
+    for i in range(count):
+        frame = np.zeros((120 + 20 * i, 160, 3), dtype=np.uint8)
+        cv2.rectangle(frame, (10, 10), (60, 60), (255, 0, 0), -1)
+        cv2.circle(frame, (110, 60), 30, (0, 255, 0), -1)
+        cv2.putText(frame, str(i), (20, 100), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        frames.append(frame)
+    return frames
+
+
+@pytest.fixture
+def db_manager():
+    """Connected database manager for the test database."""
+    manager = DatabaseManager(database_name=TEST_DATABASE,
+                              client_options={"serverSelectionTimeoutMS": 2000})
+    if not manager.connect():
+        pytest.skip("MongoDB not available")
+    yield manager
+    manager.disconnect()
+
+
+def assert_round_trip(frames, retrieved):
+    """Check retrieved frames match the saved ones in order, up to JPEG loss."""
+    assert len(retrieved) == len(frames)
+    for frame, retrieved_frame in zip(frames, retrieved):
+        assert retrieved_frame is not None
+        assert retrieved_frame.shape == frame.shape
+        assert np.mean(cv2.absdiff(frame, retrieved_frame)) < MAX_MEAN_DIFF
+
+
+def test_base64_bulk_round_trip(db_manager):
+    frame_db = FrameDatabase(db_manager)
+    frames = create_test_frames()
+    metadatas = [{"test_id": f"bulk_base64_{i}"} for i in range(len(frames))]
+
+    uuids = frame_db.save_frames_bulk(frames, metadatas, workers=2)
+    try:
+        assert len(uuids) == len(frames)
+        assert_round_trip(frames, frame_db.get_frames(uuids, workers=2))
+
+        metadata = {doc["_id"]: doc for doc in frame_db.get_many_metadata(uuids)}
+        assert [metadata[frame_uuid]["metadata"]["test_id"] for frame_uuid in uuids] == \
+            [m["test_id"] for m in metadatas]
+    finally:
+        assert frame_db.delete_frames_bulk(uuids) == len(uuids)
+
+
+def test_file_bulk_round_trip(db_manager, tmp_path):
+    frame_db = FrameDatabaseV2(db_manager, str(tmp_path))
+    frames = create_test_frames()
+
+    uuids = frame_db.save_frames_bulk(frames, workers=2)
+    try:
+        assert len(uuids) == len(frames)
+        assert_round_trip(frames, frame_db.get_frames(uuids, workers=2))
+    finally:
+        assert frame_db.delete_frames_bulk(uuids) == len(uuids)
+
+
+def test_file_bulk_preencoded_round_trip(db_manager, tmp_path):
+    frame_db = FrameDatabaseV2(db_manager, str(tmp_path))
+    frames = create_test_frames()
+    jpegs = [cv2.imencode('.jpg', frame)[1].tobytes() for frame in frames]
+
+    uuids = frame_db.save_frames_bulk(frames, jpeg_frames=jpegs)
+    try:
+        assert_round_trip(frames, frame_db.get_frames(uuids))
+    finally:
+        frame_db.delete_frames_bulk(uuids)
+
+
+def test_get_frames_keeps_order_and_missing(db_manager, tmp_path):
+    frame_db = FrameDatabaseV2(db_manager, str(tmp_path))
+    frames = create_test_frames(3)
+
+    uuids = frame_db.save_frames_bulk(frames)
+    try:
+        retrieved = frame_db.get_frames([uuids[2], "missing-frame", uuids[0]])
+        assert retrieved[1] is None
+        assert_round_trip([frames[2], frames[0]], [retrieved[0], retrieved[2]])
+    finally:
+        frame_db.delete_frames_bulk(uuids)
+
+
+def test_packed_round_trip(db_manager, tmp_path):
+    frame_db = FrameDatabaseV2(db_manager, str(tmp_path))
+    frames = create_test_frames()
+    jpegs = [cv2.imencode('.jpg', frame)[1].tobytes() for frame in frames]
+
+    uuids = frame_db.save_frames_packed(jpegs, [frame.shape for frame in frames])
+    try:
+        assert len(uuids) == len(frames)
+        assert_round_trip(frames, frame_db.get_frames_packed(uuids, workers=2))
+    finally:
+        frame_db.delete_frames_bulk(uuids, delete_files=False)
+        frame_db.file_storage.delete_all_packs()
+
+
+@pytest.mark.skipif(not HAS_LMDB, reason="lmdb not installed")
+def test_lmdb_bulk_round_trip(db_manager, tmp_path):
+    frame_db = FrameDatabaseV2(db_manager, str(tmp_path), storage_backend="lmdb")
+    frames = create_test_frames()
+
+    uuids = frame_db.save_frames_bulk(frames, workers=2)
+    try:
+        assert len(uuids) == len(frames)
+        assert_round_trip(frames, frame_db.get_frames(uuids, workers=2))
+
+        # Pack files only exist for the files backend
+        with pytest.raises(ValueError):
+            frame_db.save_frames_packed([b""], [frames[0].shape])
+    finally:
+        assert frame_db.delete_frames_bulk(uuids) == len(uuids)
+        frame_db.file_storage.close()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
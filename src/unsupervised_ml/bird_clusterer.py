@@ -5,20 +5,62 @@ Bird Clustering module for grouping similar bird objects.
 import numpy as np
 import pandas as pd
 from sklearn.cluster import AgglomerativeClustering
-from sklearn.preprocessing import StandardScaler
 from sklearn.manifold import TSNE
+from sklearn.decomposition import PCA
 from sklearn.metrics import silhouette_score
+from sklearn.metrics.pairwise import euclidean_distances, pairwise_distances_chunked
+from sklearn.neighbors import kneighbors_graph
+from joblib import Parallel, delayed
 from scipy.cluster.hierarchy import dendrogram, linkage, fcluster
-from scipy.spatial.distance import pdist
+from scipy.spatial.distance import pdist, squareform
+from scipy.sparse import csr_matrix
 try:
     from umap import UMAP
     HAS_UMAP = True
 except ImportError:
     HAS_UMAP = False
+try:
+    import openTSNE
+    HAS_OPENTSNE = True
+except ImportError:
+    HAS_OPENTSNE = False
+try:
+    import faiss
+    HAS_FAISS = True
+except ImportError:
+    HAS_FAISS = False
+try:
+    import fastcluster
+    HAS_FASTCLUSTER = True
+except ImportError:
+    HAS_FASTCLUSTER = False
+try:
+    from threadpoolctl import threadpool_limits
+    HAS_THREADPOOLCTL = True
+except ImportError:
+    HAS_THREADPOOLCTL = False
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from typing import Dict, List, Tuple, Optional
 import logging
+import os
+import tempfile
+from pathlib import Path
 from config_loader import load_clustering_config, ClusteringConfig
 
+# Features are reduced to this many PCA components before t-SNE
+TSNE_PCA_COMPONENTS = 50
+
+# Above this many points, full O(N²) linkage is replaced by agglomerative
+# clustering restricted to a k-nearest-neighbour graph
+KNN_CLUSTERING_MIN_POINTS = 10000
+KNN_NEIGHBORS = 30  # graph size when connectivity_k is 0
+HNSW_M = 32
+
+# Linkage methods fastcluster can compute from the vectors without a
+# pairwise distance matrix (average linkage still needs one)
+VECTOR_LINKAGE_METHODS = ('ward', 'single', 'centroid', 'median')
+
 class BirdClusterer:
     """Clustering algorithms for grouping similar bird images."""
     
@@ -27,39 +69,86 @@ class BirdClusterer:
         self.config = config if config is not None else load_clustering_config()
         
         self.random_state = 42  # Will be configurable in YAML
-        self.scaler = StandardScaler()
+        self.feature_mean_ = None
+        self.feature_scale_ = None
         self.clusterer = None
         self.cluster_labels_ = None
         self.features_scaled_ = None
         self.features_2d_ = None
         self.metadata_ = None
+        self.object_ids_ = None
+        self.confidences_ = None
+        self._linkage_cache = {}  # linkage method -> linkage matrix of features_scaled_
+        self._connectivity_ = None  # kNN graph of features_scaled_
         
-        # Set up logging
-        log_level = getattr(logging, self.config.log_level.upper(), logging.INFO)
-        logging.basicConfig(level=log_level)
+        # Set up logging (handlers are configured by the application, e.g. cluster_server)
         self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(getattr(logging, self.config.log_level.upper(), logging.INFO))
     
     def preprocess_features(self, features: np.ndarray) -> np.ndarray:
-        """Preprocess features by scaling."""
-        self.logger.info(f"Preprocessing features of shape {features.shape}")
-        return self.scaler.fit_transform(features)
+        """
+        Preprocess features by scaling to zero mean and unit variance.
+        
+        Standardizes in float32 on a single working copy (the caller's array
+        is left untouched), halving memory compared with StandardScaler's
+        float64 output. Per-feature mean and scale are kept on the instance.
+        With config.scratch_dir set, the working copy is memory-mapped.
+        """
+        self.logger.info("Preprocessing features of shape %s", features.shape)
+        
+        if self.config.scratch_dir:
+            scaled = self._scratch_array(features.shape, np.float32)
+            scaled[:] = features
+        else:
+            scaled = np.array(features, dtype=np.float32)
+        self.feature_mean_ = scaled.mean(axis=0)
+        self.feature_scale_ = scaled.std(axis=0)
+        self.feature_scale_[self.feature_scale_ == 0] = 1.0  # constant features, as StandardScaler
+        
+        np.subtract(scaled, self.feature_mean_, out=scaled)
+        np.divide(scaled, self.feature_scale_, out=scaled)
+        return scaled
     
     def reduce_dimensions(self, features: np.ndarray, method: str = 'tsne', 
                          n_components: int = 2) -> np.ndarray:
-        """Reduce dimensionality for visualization."""
-        self.logger.info(f"Reducing dimensions using {method} to {n_components}D")
+        """
+        Reduce dimensionality for visualization.
         
-        if method == 'tsne':
-            reducer = TSNE(n_components=n_components, random_state=self.random_state, 
-                          perplexity=min(30, len(features)-1))
-        elif method == 'umap' and HAS_UMAP:
-            reducer = UMAP(n_components=n_components, random_state=self.random_state,
-                          n_neighbors=min(15, len(features)-1))
-        else:
-            # Fallback to t-SNE
-            reducer = TSNE(n_components=n_components, random_state=self.random_state, 
-                          perplexity=min(30, len(features)-1))
+        Args:
+            method: 'tsne', 'umap' (falls back to t-SNE without umap-learn) or
+                'pca' (linear, much faster on large datasets)
+        """
+        self.logger.info("Reducing dimensions using %s to %sD", method, n_components)
+        
+        # Neighbourhood sizes must stay below the number of samples; UMAP
+        # needs at least 2 neighbours
+        n_samples = features.shape[0]
+        perplexity = min(30, n_samples - 1)
+        n_neighbors = max(2, min(15, n_samples - 1))
         
+        if method == 'pca':
+            return PCA(n_components=n_components, random_state=self.random_state).fit_transform(features)
+        
+        if method == 'umap' and HAS_UMAP:
+            reducer = UMAP(n_components=n_components, random_state=self.random_state,
+                          n_neighbors=n_neighbors)
+            return reducer.fit_transform(features)
+        
+        # t-SNE (also the fallback): its neighbour search is far cheaper on a
+        # PCA projection than on the raw 512D+ features
+        pca_components = min(TSNE_PCA_COMPONENTS, n_samples)
+        if features.shape[1] > pca_components:
+            features = PCA(n_components=pca_components, random_state=self.random_state).fit_transform(features)
+        
+        if HAS_OPENTSNE:
+            # Multi-threaded FFT-interpolated t-SNE (FIt-SNE) on approximate neighbours
+            reducer = openTSNE.TSNE(n_components=n_components, random_state=self.random_state,
+                                    perplexity=perplexity, n_jobs=-1,
+                                    neighbors='annoy', negative_gradient_method='fft')
+            return np.asarray(reducer.fit(features))
+        
+        reducer = TSNE(n_components=n_components, random_state=self.random_state, 
+                      perplexity=perplexity)
         return reducer.fit_transform(features)
     
     def cluster_ward_distance(self, features: np.ndarray, distance_threshold: Optional[float] = None) -> np.ndarray:
@@ -72,18 +161,19 @@ class BirdClusterer:
         if distance_threshold is None:
             distance_threshold = self.config.ward_balanced
             
-        self.logger.info(f"Performing Ward linkage clustering with distance_threshold={distance_threshold}")
+        self.logger.info("Performing Ward linkage clustering with distance_threshold=%s", distance_threshold)
         
         clusterer = AgglomerativeClustering(
             n_clusters=None, 
             distance_threshold=distance_threshold,
             linkage='ward',
-            metric='euclidean'  # Ward requires Euclidean distance
+            metric='euclidean',  # Ward requires Euclidean distance
+            connectivity=self._get_connectivity(features)
         )
         labels = clusterer.fit_predict(features)
         
-        n_clusters = len(set(labels))
-        self.logger.info(f"Ward linkage found {n_clusters} bird species clusters")
+        n_clusters = clusterer.n_clusters_
+        self.logger.info("Ward linkage found %d bird species clusters", n_clusters)
         
         self.clusterer = clusterer
         return labels
@@ -98,44 +188,149 @@ class BirdClusterer:
         if distance_threshold is None:
             distance_threshold = self.config.average_balanced
             
-        self.logger.info(f"Performing Average linkage clustering with distance_threshold={distance_threshold}")
+        self.logger.info("Performing Average linkage clustering with distance_threshold=%s", distance_threshold)
         
         clusterer = AgglomerativeClustering(
             n_clusters=None,
             distance_threshold=distance_threshold, 
             linkage='average',
-            metric='euclidean'
+            metric='euclidean',
+            connectivity=self._get_connectivity(features)
         )
         labels = clusterer.fit_predict(features)
         
-        n_clusters = len(set(labels))
-        self.logger.info(f"Average linkage found {n_clusters} bird species clusters")
+        n_clusters = clusterer.n_clusters_
+        self.logger.info("Average linkage found %d bird species clusters", n_clusters)
+        
+        self.clusterer = clusterer
+        return labels
+    
+    def knn_connectivity(self, features: np.ndarray, n_neighbors: Optional[int] = None) -> csr_matrix:
+        """
+        Build a sparse k-nearest-neighbour graph of the features.
+        
+        Uses a FAISS HNSW index when available (approximate, O(N log N)),
+        otherwise sklearn's exact kneighbors_graph.
+        """
+        if n_neighbors is None:
+            n_neighbors = self.config.connectivity_k or KNN_NEIGHBORS
+        n_neighbors = min(n_neighbors, len(features) - 1)
+        
+        if not HAS_FAISS:
+            return kneighbors_graph(features, n_neighbors=n_neighbors, include_self=False,
+                                    n_jobs=self.config.n_jobs)
+        
+        points = np.ascontiguousarray(features, dtype=np.float32)
+        index = faiss.IndexHNSWFlat(points.shape[1], HNSW_M)
+        index.add(points)
+        _, neighbors = index.search(points, n_neighbors + 1)  # first hit is usually the point itself
+        
+        rows = np.repeat(np.arange(len(points)), neighbors.shape[1])
+        cols = neighbors.ravel()
+        keep = (cols >= 0) & (cols != rows)
+        return csr_matrix((np.ones(keep.sum(), dtype=np.float32), (rows[keep], cols[keep])),
+                          shape=(len(points), len(points)))
+    
+    def _get_connectivity(self, features: np.ndarray) -> Optional[csr_matrix]:
+        """Get the kNN graph built by fit_predict if it belongs to these features."""
+        if self._connectivity_ is not None and self._connectivity_.shape[0] == len(features):
+            return self._connectivity_
+        return None
+    
+    def cluster_knn_distance(self, features: np.ndarray, linkage_method: str = 'average',
+                             distance_threshold: Optional[float] = None) -> np.ndarray:
+        """
+        Perform hierarchical clustering restricted to a k-nearest-neighbour graph.
+        Scales to large datasets where full linkage (O(N²) memory) is infeasible;
+        only neighbouring points can be merged directly.
+        """
+        if distance_threshold is None:
+            distance_threshold = self.config.average_balanced if linkage_method == 'average' else self.config.ward_balanced
+        
+        self.logger.info("Performing kNN-graph %s clustering with distance_threshold=%s",
+                         linkage_method, distance_threshold)
+        
+        connectivity = self._get_connectivity(features)
+        if connectivity is None:
+            connectivity = self.knn_connectivity(features)
+        
+        clusterer = AgglomerativeClustering(
+            n_clusters=None,
+            distance_threshold=distance_threshold,
+            linkage=linkage_method,
+            metric='euclidean',
+            connectivity=connectivity
+        )
+        labels = clusterer.fit_predict(features)
+        
+        n_clusters = clusterer.n_clusters_
+        self.logger.info("kNN-graph %s linkage found %d bird species clusters", linkage_method, n_clusters)
         
         self.clusterer = clusterer
         return labels
     
     def evaluate_clustering(self, features: np.ndarray, labels: np.ndarray) -> Dict[str, float]:
         """Evaluate clustering quality."""
-        n_clusters = len(set(labels))
+        # Cluster and noise counts from one pass over the labels; noise (-1)
+        # sorts first. Hierarchical clustering assigns every point, so it has none
+        unique_labels, counts = np.unique(labels, return_counts=True)
+        has_noise = unique_labels.size > 0 and unique_labels[0] == -1
+        n_clusters = int(unique_labels.size - has_noise)
         metrics = {
             'n_clusters': n_clusters,
-            'n_noise': 0,  # Hierarchical clustering doesn't have noise points
+            'n_noise': int(counts[0]) if has_noise else 0,
             'n_points': len(labels)
         }
         
-        # For hierarchical clustering, all points are assigned to clusters (no noise points)
         if n_clusters < 2:
             metrics['silhouette_score'] = -1.0  # Invalid clustering
             metrics['error'] = 'Less than 2 clusters found'
+        elif n_clusters == len(labels) or n_clusters > self.config.max_species * 4:
+            # Degenerate partitions are never chosen; skip the O(N²) silhouette
+            metrics['silhouette_score'] = -1.0
+            metrics['error'] = 'Too many clusters found'
         else:
             try:
-                metrics['silhouette_score'] = silhouette_score(features, labels)
+                # Above silhouette_sample_size points the score is estimated on a
+                # random sample; n_jobs parallelizes the chunked distance computation
+                sample_size = None
+                if len(labels) > self.config.silhouette_sample_size:
+                    sample_size = self.config.silhouette_sample_size
+                    metrics['silhouette_sample_size'] = sample_size
+                metrics['silhouette_score'] = silhouette_score(
+                    np.asarray(features, dtype=np.float32), labels, metric='euclidean',
+                    sample_size=sample_size, random_state=self.random_state, n_jobs=self.config.n_jobs)
             except Exception as e:
-                self.logger.warning(f"Silhouette score calculation failed: {e}")
+                self.logger.warning("Silhouette score calculation failed: %s", e)
                 metrics['silhouette_score'] = -1.0
         
         return metrics
     
+    def _deduplicate(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Group feature vectors that are equal after rounding to config.dedup_tol.
+        
+        Returns:
+            (indices of one representative per group, group of every row)
+        """
+        quantized = np.round(features / self.config.dedup_tol).astype(np.int32)
+        _, representatives, inverse = np.unique(quantized, axis=0, return_index=True, return_inverse=True)
+        return representatives, inverse.ravel()
+    
+    def _set_metadata(self, metadata: List[Dict]) -> None:
+        """
+        Store the metadata, plus its per-object columns as arrays for plots and summaries.
+        
+        Fitting only needs the features, so metadata without these keys gets
+        the dendrogram's Bird_<i> ids and NaN confidences (skipped by the
+        summary statistics) instead of failing.
+        """
+        self.metadata_ = metadata
+        self.object_ids_ = np.array([meta.get('object_id', f'Bird_{i}') for i, meta in enumerate(metadata)],
+                                    dtype=object)
+        self.confidences_ = np.fromiter((meta.get('confidence', np.nan) for meta in metadata),
+                                        dtype=np.float64, count=len(metadata))
+    
     def fit_predict(self, features: np.ndarray, metadata: List[Dict], 
                    method: str = 'ward_distance', **kwargs) -> Tuple[np.ndarray, Dict]:
         """
@@ -144,49 +339,247 @@ class BirdClusterer:
         Args:
             features: SimCLR features (typically 512D from ResNet-18)
             metadata: Bird object metadata
-            method: 'ward_distance' (primary) or 'average_distance' (alternate)
+            method: 'ward_distance' (primary), 'average_distance' (alternate) or
+                'hnsw_agglomerative' (average linkage on a kNN graph; used
+                automatically for more than KNN_CLUSTERING_MIN_POINTS points)
             **kwargs: distance_threshold (default 75.0 for ResNet50 2048D features)
         """
         self.features_scaled_ = self.preprocess_features(features)
-        self.metadata_ = metadata
+        self._set_metadata(metadata)
+        self._linkage_cache = {}
+        
+        # Near-identical detections (e.g. consecutive frames) are clustered
+        # once through a representative and expanded back afterwards
+        cluster_features = self.features_scaled_
+        inverse = None
+        if self.config.deduplicate:
+            representatives, inverse = self._deduplicate(self.features_scaled_)
+            cluster_features = self.features_scaled_[representatives]
+            self.logger.info("Clustering %d distinct feature vectors of %d", len(cluster_features), len(features))
+        
+        # The kNN graph depends only on the features: build it once per fit
+        self._connectivity_ = None
+        if len(cluster_features) > 1 and (self.config.connectivity_k > 0
+                                          or len(cluster_features) > KNN_CLUSTERING_MIN_POINTS):
+            self._connectivity_ = self.knn_connectivity(cluster_features)
         
         distance_threshold = kwargs.get('distance_threshold', self.config.ward_balanced)
         
-        if method == 'ward_distance':
-            labels = self.cluster_ward_distance(self.features_scaled_, distance_threshold=distance_threshold)
+        if len(cluster_features) < 2 and method in ('ward_distance', 'average_distance', 'hnsw_agglomerative'):
+            # All detections collapsed onto one vector: there is nothing to
+            # merge, and the linkage routines need at least two points
+            labels = np.zeros(len(cluster_features), dtype=int)
+        elif method == 'hnsw_agglomerative':
+            labels = self.cluster_knn_distance(cluster_features, 'average', distance_threshold=distance_threshold)
+        elif len(cluster_features) > KNN_CLUSTERING_MIN_POINTS and method in ('ward_distance', 'average_distance'):
+            linkage_method = 'ward' if method == 'ward_distance' else 'average'
+            labels = self.cluster_knn_distance(cluster_features, linkage_method, distance_threshold=distance_threshold)
+        elif method == 'ward_distance':
+            labels = self.cluster_ward_distance(cluster_features, distance_threshold=distance_threshold)
         elif method == 'average_distance':
-            labels = self.cluster_average_distance(self.features_scaled_, distance_threshold=distance_threshold)
+            labels = self.cluster_average_distance(cluster_features, distance_threshold=distance_threshold)
         else:
-            raise ValueError(f"Unsupported clustering method: {method}. Use 'ward_distance' or 'average_distance'")
+            raise ValueError(f"Unsupported clustering method: {method}. "
+                             f"Use 'ward_distance', 'average_distance' or 'hnsw_agglomerative'")
         
+        if inverse is not None:
+            labels = labels[inverse]
         self.cluster_labels_ = labels
         
         # Generate 2D representation for visualization
-        self.features_2d_ = self.reduce_dimensions(self.features_scaled_, method='tsne')
+        self.features_2d_ = self.reduce_dimensions(self.features_scaled_, method=self.config.reduction_method)
         
         # Evaluate clustering
         metrics = self.evaluate_clustering(self.features_scaled_, labels)
         
         return labels, metrics
     
+    def fit_predict_from_linkage(self, features_scaled: np.ndarray, metadata: List[Dict],
+                                 method: str = 'ward_distance', distance_threshold: Optional[float] = None,
+                                 linkage_cache: Optional[Dict[str, np.ndarray]] = None,
+                                 features_2d: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Dict]:
+        """
+        Fit by cutting a linkage tree of already scaled features.
+        
+        Equivalent to fit_predict, but lets several clusterers of the same
+        features share the scaling, the linkage trees and the 2D embedding.
+        
+        Args:
+            features_scaled: Features already passed through preprocess_features
+            metadata: Bird object metadata
+            method: 'ward_distance' (primary) or 'average_distance' (alternate)
+            distance_threshold: Distance at which to cut the tree
+            linkage_cache: Linkage method -> linkage matrix dict shared between clusterers
+            features_2d: Precomputed 2D representation for visualization
+        """
+        if method == 'ward_distance':
+            linkage_method = 'ward'
+        elif method == 'average_distance':
+            linkage_method = 'average'
+        else:
+            raise ValueError(f"Unsupported clustering method: {method}. Use 'ward_distance' or 'average_distance'")
+        
+        if distance_threshold is None:
+            distance_threshold = self.config.ward_balanced
+        
+        self.features_scaled_ = features_scaled
+        self._set_metadata(metadata)
+        self._linkage_cache = linkage_cache if linkage_cache is not None else {}
+        
+        if len(features_scaled) > KNN_CLUSTERING_MIN_POINTS:
+            # A full linkage tree would not fit in memory
+            labels = self.cluster_knn_distance(features_scaled, linkage_method, distance_threshold=distance_threshold)
+        else:
+            # fcluster labels start at 1; sklearn's start at 0
+            labels = fcluster(self.get_linkage(linkage_method), t=distance_threshold, criterion='distance') - 1
+            self.logger.info("%s linkage found %d bird species clusters at distance_threshold=%s",
+                             linkage_method.capitalize(), labels.max() + 1, distance_threshold)
+        self.cluster_labels_ = labels
+        
+        if features_2d is None:
+            features_2d = self.reduce_dimensions(features_scaled, method=self.config.reduction_method)
+        self.features_2d_ = features_2d
+        
+        metrics = self.evaluate_clustering(features_scaled, labels)
+        
+        return labels, metrics
+    
     def get_cluster_summary(self) -> pd.DataFrame:
         """Get summary statistics for each cluster."""
         if self.cluster_labels_ is None or self.metadata_ is None:
             raise ValueError("Must fit model first")
         
-        df = pd.DataFrame(self.metadata_)
-        df['cluster'] = self.cluster_labels_
+        # Per-cluster reductions with bincount rather than building a
+        # DataFrame from every metadata dict; labels are shifted to start at 0
+        # so noise labels (-1) get a bin too
+        labels = np.asarray(self.cluster_labels_, dtype=np.intp)
+        if len(labels) == 0:
+            return pd.DataFrame(columns=['n_objects', 'confidence_mean', 'confidence_std', 'frame_id_nunique'],
+                                index=pd.Index([], name='cluster'))
+        
+        label_offset = min(int(labels.min()), 0)
+        labels = labels - label_offset
+        n_labels = int(labels.max()) + 1
+        
+        counts = np.bincount(labels, minlength=n_labels)
+        
+        # Missing confidences (NaN) are skipped, as pandas' mean and std do
+        has_confidence = ~np.isnan(self.confidences_)
+        confidences = self.confidences_[has_confidence]
+        confidence_labels = labels[has_confidence]
+        confidence_counts = np.bincount(confidence_labels, minlength=n_labels)
+        sums = np.bincount(confidence_labels, weights=confidences, minlength=n_labels)
+        sums_sq = np.bincount(confidence_labels, weights=confidences ** 2, minlength=n_labels)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = sums / confidence_counts
+            # Sample standard deviation (ddof=1, as pandas); NaN for singletons
+            variances = (sums_sq - confidence_counts * means ** 2) / (confidence_counts - 1)
+            stds = np.sqrt(np.maximum(variances, 0.0))
+        stds[confidence_counts < 2] = np.nan
+        
+        # Distinct frames per cluster: count the unique (label, frame) pairs
+        frame_codes, frame_uniques = pd.factorize(pd.Series([meta.get('frame_id') for meta in self.metadata_]))
+        n_frames = max(len(frame_uniques), 1)
+        has_frame = frame_codes >= 0  # missing frame ids are not counted, as nunique
+        pairs = np.unique(labels[has_frame].astype(np.int64) * n_frames + frame_codes[has_frame])
+        frame_counts = np.bincount(pairs // n_frames, minlength=n_labels)
+        
+        present = np.flatnonzero(counts)
+        summary = pd.DataFrame({
+            'n_objects': counts[present],
+            'confidence_mean': means[present],
+            'confidence_std': stds[present],
+            'frame_id_nunique': frame_counts[present],
+        }, index=pd.Index(present + label_offset, name='cluster')).round(3)
         
-        summary = df.groupby('cluster').agg({
-            'object_id': 'count',
-            'confidence': ['mean', 'std'],
-            'frame_id': 'nunique',
-        }).round(3)
+        return summary
+    
+    def _scratch_array(self, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        """
+        Allocate an array backed by an anonymous file in config.scratch_dir, so
+        the OS can page it out instead of holding it in RAM. The file is
+        removed as soon as the array is released.
+        """
+        # Empty files cannot be memory-mapped
+        if 0 in shape:
+            return np.empty(shape, dtype=dtype)
         
-        summary.columns = ['_'.join(col).strip() for col in summary.columns.values]
-        summary = summary.rename(columns={'object_id_count': 'n_objects'})
+        Path(self.config.scratch_dir).mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryFile(dir=self.config.scratch_dir) as scratch_file:
+            return np.memmap(scratch_file, dtype=dtype, mode='w+', shape=shape)
+    
+    def _condensed_distances(self, features: np.ndarray) -> np.ndarray:
+        """
+        Condensed Euclidean distance vector of the features.
         
-        return summary
+        Expands ||a - b||² = ||a||² + ||b||² - 2a·b so the bulk of the work is a
+        float32 matrix product (BLAS) instead of pdist's per-pair float64 loop.
+        With config.scratch_dir set, the N×N matrix is never held at once:
+        row blocks are written straight into a memory-mapped condensed vector.
+        """
+        points = np.asarray(features, dtype=np.float32)
+        if len(points) < 2:
+            return np.empty(0, dtype=np.float64)
+        
+        if not self.config.scratch_dir:
+            distances = euclidean_distances(points)
+            np.fill_diagonal(distances, 0.0)
+            return squareform(distances, checks=False)
+        
+        n = len(points)
+        condensed = self._scratch_array((n * (n - 1) // 2,), np.float64)
+        row = 0
+        for block in pairwise_distances_chunked(points, metric='euclidean', n_jobs=self.config.n_jobs):
+            for distances in block:
+                # Upper triangle of row i starts at n*i - i*(i+1)/2 in condensed form
+                start = n * row - row * (row + 1) // 2
+                condensed[start:start + n - row - 1] = distances[row + 1:]
+                row += 1
+        return condensed
+    
+    def get_linkage(self, linkage_method: str = 'ward') -> np.ndarray:
+        """
+        Get the linkage matrix of the scaled features, computing it once per
+        linkage method. The tree does not depend on the distance threshold,
+        so every threshold can be cut from the same matrix.
+        
+        Uses fastcluster when available; for Ward its linkage_vector never
+        materializes the O(N²) pairwise distance matrix.
+        
+        Refuses above KNN_CLUSTERING_MIN_POINTS points, where the tree is
+        too large to build; those datasets are clustered with
+        cluster_knn_distance instead. This also covers get_dendrogram_data
+        and tune_distance_threshold, which cut this tree.
+        """
+        if self.features_scaled_ is None:
+            raise ValueError("Must fit model first")
+        
+        if len(self.features_scaled_) > KNN_CLUSTERING_MIN_POINTS:
+            raise ValueError(f"A full {linkage_method} linkage tree of {len(self.features_scaled_)} points "
+                             f"would not fit in memory (limit {KNN_CLUSTERING_MIN_POINTS}); "
+                             "use cluster_knn_distance for datasets this large")
+        
+        if linkage_method not in self._linkage_cache:
+            self.logger.info("Computing %s linkage matrix", linkage_method)
+            if linkage_method in VECTOR_LINKAGE_METHODS:
+                if HAS_FASTCLUSTER:
+                    # fastcluster works in float64; convert once instead of per call
+                    points = np.ascontiguousarray(self.features_scaled_, dtype=np.float64)
+                    linkage_matrix = fastcluster.linkage_vector(points, method=linkage_method, metric='euclidean')
+                else:
+                    linkage_matrix = linkage(self.features_scaled_, method=linkage_method, metric='euclidean')
+            else:
+                distances = self._condensed_distances(self.features_scaled_)
+                linkage_fn = fastcluster.linkage if HAS_FASTCLUSTER else linkage
+                linkage_matrix = linkage_fn(distances, method=linkage_method)
+                del distances
+            if self.config.scratch_dir:
+                mapped = self._scratch_array(linkage_matrix.shape, linkage_matrix.dtype)
+                mapped[:] = linkage_matrix
+                linkage_matrix = mapped
+            self._linkage_cache[linkage_method] = linkage_matrix
+        return self._linkage_cache[linkage_method]
     
     def get_dendrogram_data(self, linkage_method: str = 'ward') -> Dict:
         """
@@ -196,35 +589,57 @@ class BirdClusterer:
             linkage_method: 'ward' (primary) or 'average' (alternate)
             
         Returns:
-            Dictionary with linkage matrix, labels, and suggested thresholds
+            Dictionary with linkage matrix (float32 ndarray; convert with
+            .tolist() only at the JSON boundary), labels, and suggested thresholds
         """
         if self.features_scaled_ is None:
             raise ValueError("Must fit model first")
         
-        # Compute linkage matrix using Euclidean distance
-        linkage_matrix = linkage(self.features_scaled_, method=linkage_method, metric='euclidean')
+        # Linkage matrix using Euclidean distance (shared with threshold tuning)
+        linkage_matrix = self.get_linkage(linkage_method)
         
         # Analyze distances to suggest good thresholds
         distances = linkage_matrix[:, 2]  # Third column contains distances
-        distance_gaps = np.diff(np.sort(distances))
+        sorted_distances = np.sort(distances)
+        distance_gaps = np.diff(sorted_distances)
         
         # Find largest gaps in distance (good threshold candidates)
-        gap_indices = np.argsort(distance_gaps)[-5:]  # Top 5 gaps
-        suggested_thresholds = [float(np.sort(distances)[i]) for i in gap_indices]
+        # Top 5 gaps; argpartition selects them in O(N) without a full sort
+        n_gaps = min(5, distance_gaps.size)
+        gap_indices = np.argpartition(distance_gaps, -n_gaps)[-n_gaps:] if n_gaps else []
+        suggested_thresholds = [float(sorted_distances[i]) for i in gap_indices]
         
         return {
-            'linkage_matrix': linkage_matrix.tolist(),
+            'linkage_matrix': linkage_matrix.astype(np.float32),
             'labels': [meta.get('object_id', f'Bird_{i}') for i, meta in enumerate(self.metadata_)],
             'method': linkage_method,
             'suggested_thresholds': sorted(suggested_thresholds),
             'distance_stats': {
-                'min_distance': float(distances.min()),
-                'max_distance': float(distances.max()),
+                'min_distance': float(sorted_distances[0]),
+                'max_distance': float(sorted_distances[-1]),
                 'mean_distance': float(distances.mean()),
                 'std_distance': float(distances.std())
             }
         }
     
+    def _eval_threshold(self, linkage_matrix: np.ndarray, threshold: float) -> Optional[Dict]:
+        """Cut the linkage tree at one threshold and evaluate the clustering."""
+        try:
+            # fcluster labels start at 1
+            labels = fcluster(linkage_matrix, t=threshold, criterion='distance') - 1
+            
+            metrics = self.evaluate_clustering(self.features_scaled_, labels)
+            
+            return {
+                'labels': labels,
+                'metrics': metrics,
+                'n_clusters': metrics['n_clusters']
+            }
+            
+        except Exception as e:
+            self.logger.warning("Failed threshold %s: %s", threshold, e)
+            return None
+    
     def tune_distance_threshold(self, method: str = 'ward_distance', 
                               threshold_range: Tuple[float, float] = (0.5, 3.0),
                               n_thresholds: int = 10) -> Dict[float, Dict]:
@@ -245,27 +660,23 @@ class BirdClusterer:
         results = {}
         thresholds = np.linspace(threshold_range[0], threshold_range[1], n_thresholds)
         
-        self.logger.info(f"Tuning distance threshold for {method} over {n_thresholds} values")
+        self.logger.info("Tuning distance threshold for %s over %d values", method, n_thresholds)
         
-        for threshold in thresholds:
-            try:
-                if method == 'ward_distance':
-                    labels = self.cluster_ward_distance(self.features_scaled_, distance_threshold=threshold)
-                elif method == 'average_distance':
-                    labels = self.cluster_average_distance(self.features_scaled_, distance_threshold=threshold)
-                else:
-                    continue
-                    
-                metrics = self.evaluate_clustering(self.features_scaled_, labels)
-                
-                results[float(threshold)] = {
-                    'labels': labels,
-                    'metrics': metrics,
-                    'n_clusters': metrics['n_clusters']
-                }
-                
-            except Exception as e:
-                self.logger.warning(f"Failed threshold {threshold}: {e}")
+        if method == 'ward_distance':
+            linkage_matrix = self.get_linkage('ward')
+        elif method == 'average_distance':
+            linkage_matrix = self.get_linkage('average')
+        else:
+            return results
+        
+        # Thresholds are independent cuts of the same tree; silhouette scoring
+        # dominates and releases the GIL, so threads avoid copying the features
+        evaluations = Parallel(n_jobs=self.config.n_jobs, prefer='threads')(
+            delayed(self._eval_threshold)(linkage_matrix, threshold) for threshold in thresholds)
+        
+        for threshold, result in zip(thresholds, evaluations):
+            if result is not None:
+                results[float(threshold)] = result
                 
         return results
 
@@ -279,10 +690,18 @@ class ClusteringExperiment:
         self.results = {}
         self.config = config if config is not None else load_clustering_config()
         
-        # Set up logging
-        log_level = getattr(logging, self.config.log_level.upper(), logging.INFO)
-        logging.basicConfig(level=log_level)
+        # Set up logging (handlers are configured by the application, e.g. cluster_server)
         self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(getattr(logging, self.config.log_level.upper(), logging.INFO))
+        
+        # Scaling, the linkage trees and the 2D embedding do not depend on
+        # the method's threshold: compute them once and share them with every
+        # clusterer the experiment runs (linkage trees are filled in lazily)
+        self._base_clusterer = BirdClusterer(config=self.config)
+        self._features_scaled = self._base_clusterer.preprocess_features(self.features)
+        self._features_2d = self._base_clusterer.reduce_dimensions(self._features_scaled,
+                                                                   method=self.config.reduction_method)
+        self._linkage_cache = {}
     
     def run_all_methods(self) -> Dict[str, Dict]:
         """
@@ -304,29 +723,54 @@ class ClusteringExperiment:
             'average_permissive': {'method': 'average_distance', 'distance_threshold': self.config.average_permissive},
         }
         
-        for name, params in methods.items():
-            try:
-                clusterer = BirdClusterer(config=self.config)
-                method = params.pop('method')
-                labels, metrics = clusterer.fit_predict(self.features, self.metadata, 
-                                                       method=method, **params)
-                
-                self.results[name] = {
-                    'labels': labels,
-                    'metrics': metrics,
-                    'clusterer': clusterer,
-                    'method': method,
-                    'params': params
-                }
-                
-                self.logger.info(f"Completed {name}: {metrics.get('n_clusters', 0)} clusters")
-                
-            except Exception as e:
-                self.logger.error(f"Failed {name}: {e}")
-                self.results[name] = {'error': str(e)}
+        # The methods are independent and their heavy lifting runs in C code
+        # that releases the GIL, so they run on threads. BLAS/OpenMP pools are
+        # limited to one thread each to avoid oversubscribing the cores
+        max_workers = min(len(methods), os.cpu_count() or 1)
+        limits = threadpool_limits(limits=1) if HAS_THREADPOOLCTL and max_workers > 1 else nullcontext()
+        with limits, ThreadPoolExecutor(max_workers=max_workers) as executor:
+            if len(self._features_scaled) <= KNN_CLUSTERING_MIN_POINTS:
+                # Build each linkage tree once up front so concurrent methods
+                # sharing a tree do not both compute it
+                self._base_clusterer.features_scaled_ = self._features_scaled
+                self._base_clusterer._linkage_cache = self._linkage_cache
+                try:
+                    list(executor.map(self._base_clusterer.get_linkage, ('ward', 'average')))
+                except Exception as e:
+                    self.logger.warning("Precomputing linkage trees failed: %s", e)
+            
+            futures = {name: executor.submit(self._run_one, name, params) for name, params in methods.items()}
+            for name, future in futures.items():
+                self.results[name] = future.result()
         
         return self.results
     
+    def _run_one(self, name: str, params: Dict) -> Dict:
+        """Run a single method configuration on the shared scaled features."""
+        try:
+            clusterer = BirdClusterer(config=self.config)
+            clusterer.feature_mean_ = self._base_clusterer.feature_mean_
+            clusterer.feature_scale_ = self._base_clusterer.feature_scale_
+            params = dict(params)
+            method = params.pop('method')
+            labels, metrics = clusterer.fit_predict_from_linkage(self._features_scaled, self.metadata,
+                                                                 method=method, linkage_cache=self._linkage_cache,
+                                                                 features_2d=self._features_2d, **params)
+            
+            self.logger.info("Completed %s: %s clusters", name, metrics.get('n_clusters', 0))
+            
+            return {
+                'labels': labels,
+                'metrics': metrics,
+                'clusterer': clusterer,
+                'method': method,
+                'params': params
+            }
+            
+        except Exception as e:
+            self.logger.error("Failed %s: %s", name, e)
+            return {'error': str(e)}
+    
     def get_best_method(self) -> Tuple[str, Dict]:
         """
         Get the best performing clustering method for bird species identification.
@@ -4,10 +4,36 @@ Web server for bird clustering visualization and analysis.
 
 import os
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
+from werkzeug.exceptions import NotFound
+from werkzeug.http import http_date
+from werkzeug.utils import safe_join
+import numpy as np
+import base64
+import datetime
+import hashlib
+import json
 import logging
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+try:
+    from whitenoise import WhiteNoise
+    HAS_WHITENOISE = True
+except ImportError:
+    HAS_WHITENOISE = False
 
 # Add project root to path
 project_root = Path(__file__).resolve().parent.parent.parent.parent
@@ -40,13 +66,60 @@ logger = logging.getLogger(__name__)
 # Global variables for caching
 cached_features = None
 cached_metadata = None
+cached_meta_index = {}  # object_id -> row index into cached_metadata
+cached_confidences = None  # confidence of each cached_metadata row
 cached_clusterer = None
+cached_objects_json = None  # /api/objects response body for cached_clusterer
+cached_objects_etag = None  # content hash of cached_objects_json
 cached_visualizer = None
 cached_config = clustering_config
 
+# Bird thumbnails, cached by browsers for a day and revalidated with
+# If-Modified-Since / ETag afterwards
+OBJECTS_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "objects"
+IMAGE_MAX_AGE = 86400
+
+# Total size of the full-size bird images kept in memory by load_bird_image
+IMAGE_CACHE_BYTES = 32 * 1024 * 1024
+
+# Small WebP copies of the bird images for the dashboard grid (shown at
+# 60x60; twice that for high-DPI screens)
+THUMBNAILS_DIR = OBJECTS_DIR.parent / "thumbnails"
+THUMBNAIL_SIZE = (120, 120)
+THUMBNAIL_QUALITY = 70
+
+# Served in place of missing thumbnails; encoded once at import
+PLACEHOLDER_SVG = '''<svg xmlns="http://www.w3.org/2000/svg" width="60" height="60">
+            <rect width="60" height="60" fill="#333"/>
+            <text x="30" y="35" text-anchor="middle" fill="white" font-size="12">🐦</text>
+        </svg>'''.encode('utf-8')
+SVG_HEADERS = {'Content-Type': 'image/svg+xml'}
+
+# Most bird IDs a single /api/birds request may ask for
+MAX_BATCH_IDS = 256
+
+# Decimal places kept for the 2D scatter coordinates in /api/objects
+COORD_DECIMALS = 3
+
+# With WhiteNoise, WebP thumbnails are streamed by the middleware without
+# entering Flask; /api/bird-thumbnail stays as the fallback for new images
+BIRD_STATIC_PREFIX = "static/birds/"
+if HAS_WHITENOISE:
+    app.wsgi_app = WhiteNoise(app.wsgi_app, root=str(THUMBNAILS_DIR), prefix=BIRD_STATIC_PREFIX,
+                              max_age=IMAGE_MAX_AGE)
+
+# Rendered dashboard, reused until the clustering state changes
+_dashboard_cache = {'key': None, 'html': None}
+
+# object_id -> (JPEG bytes, ETag), least recently used first
+_image_cache = OrderedDict()
+_image_cache_state = {'bytes': 0}
+_image_cache_lock = threading.Lock()
+
 def initialize_system():
     """Initialize the clustering system with data and models."""
-    global cached_features, cached_metadata, cached_clusterer, cached_visualizer, cached_config
+    global cached_features, cached_metadata, cached_meta_index, cached_confidences
+    global cached_clusterer, cached_objects_json, cached_objects_etag, cached_visualizer, cached_config
     
     logger.info("Initializing bird clustering system...")
     
@@ -66,6 +139,17 @@ def initialize_system():
             
             cached_features = features
             cached_metadata = metadata
+            _dashboard_cache['key'] = None
+            clear_image_cache()
+            cached_meta_index = {meta['object_id']: i for i, meta in enumerate(metadata)}
+            cached_confidences = np.fromiter((meta['confidence'] for meta in metadata),
+                                             dtype=np.float64, count=len(metadata))
+            
+            if HAS_PIL:
+                # Built in the background so startup doesn't wait on image
+                # decoding; until a thumbnail exists the full image is served
+                threading.Thread(target=create_thumbnails, args=(list(cached_meta_index),),
+                                 daemon=True).start()
             
             logger.info(f"Loaded {len(features)} bird objects for clustering")
             
@@ -76,6 +160,9 @@ def initialize_system():
             
             if best_result:
                 cached_clusterer = best_result['clusterer']
+                # The payload only changes on re-initialization: serialize it once
+                cached_objects_json = serialize_objects(metadata, cached_clusterer)
+                cached_objects_etag = hashlib.blake2b(cached_objects_json, digest_size=16).hexdigest()
                 logger.info(f"Best clustering method: {best_method}")
                 
                 cached_visualizer = ClusterVisualizer(cached_clusterer, 
@@ -125,33 +212,42 @@ def dashboard():
     if cached_clusterer is None or cached_metadata is None:
         return "System not initialized", 500
     
-    # Group birds by cluster
-    clusters = {}
-    for i, meta in enumerate(cached_metadata):
-        cluster_id = int(cached_clusterer.cluster_labels_[i])
-        if cluster_id not in clusters:
-            clusters[cluster_id] = []
-        
-        clusters[cluster_id].append({
-            'object_id': meta['object_id'],
-            'confidence': float(meta['confidence']),
-            'frame_id': meta['frame_id'],
-            'index': i
-        })
+    cache_key = (id(cached_clusterer), id(cached_metadata))
+    if _dashboard_cache['key'] == cache_key:
+        return _dashboard_cache['html']
+    
+    # Group birds by cluster: a stable sort by label lays each cluster out
+    # contiguously (in original order), so per-cluster stats are segment
+    # reductions instead of Python loops
+    labels = np.asarray(cached_clusterer.cluster_labels_)
+    order = np.argsort(labels, kind='stable')
+    cluster_ids, starts, counts = np.unique(labels[order], return_index=True, return_counts=True)
+    sorted_confidences = cached_confidences[order]
+    sums = np.add.reduceat(sorted_confidences, starts)
+    mins = np.minimum.reduceat(sorted_confidences, starts)
+    maxs = np.maximum.reduceat(sorted_confidences, starts)
     
-    # Calculate cluster statistics
+    clusters = {}
     cluster_stats = {}
-    for cluster_id, birds in clusters.items():
+    for k, cluster_id in enumerate(cluster_ids.tolist()):
+        members = order[starts[k]:starts[k] + counts[k]].tolist()
+        clusters[cluster_id] = [{
+            'object_id': cached_metadata[i]['object_id'],
+            'confidence': float(cached_confidences[i]),
+            'frame_id': cached_metadata[i]['frame_id'],
+            'index': i
+        } for i in members]
+        
+        # Calculate cluster statistics
         cluster_stats[cluster_id] = {
-            'count': len(birds),
-            'avg_confidence': sum(bird['confidence'] for bird in birds) / len(birds),
-            'confidence_range': [
-                min(bird['confidence'] for bird in birds),
-                max(bird['confidence'] for bird in birds)
-            ]
+            'count': int(counts[k]),
+            'avg_confidence': float(sums[k] / counts[k]),
+            'confidence_range': [float(mins[k]), float(maxs[k])]
         }
     
     html = create_cluster_dashboard_html(clusters, cluster_stats)
+    _dashboard_cache['key'] = cache_key
+    _dashboard_cache['html'] = html
     return html
 
 @app.route('/scatter')
@@ -160,48 +256,149 @@ def scatter():
     if cached_visualizer is None:
         return "System not initialized."
     
-    fig = cached_visualizer.create_scatter_plot(save_html=False)
-    return fig.to_html(include_plotlyjs='cdn')
+    # The plot is drawn from exactly the data in the objects payload
+    return conditional_response(cached_visualizer.get_html(), 'text/html', f"{cached_objects_etag}-scatter")
 
 
 @app.route('/api/objects')
 def api_objects():
     """Get all objects with cluster information."""
-    if cached_clusterer is None:
+    if cached_clusterer is None or cached_objects_json is None:
         return jsonify({'error': 'System not initialized'})
     
+    return conditional_response(cached_objects_json, 'application/json', cached_objects_etag)
+
+def conditional_response(body, mimetype, etag):
+    """Build a response that becomes 304 Not Modified if the client has this ETag."""
+    response = app.response_class(body, mimetype=mimetype)
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+def serialize_objects(metadata, clusterer):
+    """Serialize all objects with their cluster and 2D position to JSON bytes."""
+    labels = clusterer.cluster_labels_
+    features_2d = clusterer.features_2d_
+    if features_2d is not None:
+        # Scatter coordinates don't need full float64 precision over the wire
+        features_2d = np.round(features_2d, COORD_DECIMALS)
+    
+    if HAS_ORJSON:
+        # orjson encodes the NumPy scalars directly, no per-value casts
+        if features_2d is not None:
+            data = [{**meta, 'cluster': labels[i], 'x': features_2d[i, 0], 'y': features_2d[i, 1]}
+                    for i, meta in enumerate(metadata)]
+        else:
+            data = [{**meta, 'cluster': labels[i]} for i, meta in enumerate(metadata)]
+        return orjson.dumps(data, default=json_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME)
+    
     data = []
-    for i, meta in enumerate(cached_metadata):
+    for i, meta in enumerate(metadata):
         obj_data = meta.copy()
-        obj_data['cluster'] = int(cached_clusterer.cluster_labels_[i])
+        obj_data['cluster'] = int(labels[i])
         
-        if cached_clusterer.features_2d_ is not None:
-            obj_data['x'] = float(cached_clusterer.features_2d_[i, 0])
-            obj_data['y'] = float(cached_clusterer.features_2d_[i, 1])
+        if features_2d is not None:
+            obj_data['x'] = float(features_2d[i, 0])
+            obj_data['y'] = float(features_2d[i, 1])
         
         data.append(obj_data)
     
-    return jsonify(data)
+    return json.dumps(data, default=json_default).encode('utf-8')
+
+def json_default(value):
+    """Encode values plain JSON can't, the way jsonify does (e.g. Mongo timestamps)."""
+    if isinstance(value, datetime.date):
+        return http_date(value)
+    return str(value)
 
 @app.route('/api/bird-image/<object_id>')
 def api_bird_image(object_id):
     """Serve bird image by object ID."""
-    import os
-    from pathlib import Path
-    
-    # Get project root and construct image path  
-    project_root = Path(__file__).parent.parent.parent
-    image_path = project_root / "data" / "objects" / f"{object_id}.jpg"
+    # Once initialized, unknown IDs (stale or probing URLs) never reach the filesystem
+    if cached_meta_index and object_id not in cached_meta_index:
+        return PLACEHOLDER_SVG, 404, SVG_HEADERS
     
-    if image_path.exists():
-        return send_file(str(image_path), mimetype='image/jpeg')
-    else:
+    try:
+        body, etag = load_bird_image(object_id)
+    except OSError:
         # Return a placeholder SVG if image not found
-        placeholder_svg = '''<svg xmlns="http://www.w3.org/2000/svg" width="60" height="60">
-            <rect width="60" height="60" fill="#333"/>
-            <text x="30" y="35" text-anchor="middle" fill="white" font-size="12">🐦</text>
-        </svg>'''
-        return placeholder_svg, 200, {'Content-Type': 'image/svg+xml'}
+        return PLACEHOLDER_SVG, 200, SVG_HEADERS
+    
+    # Conditional responses let repeat dashboard loads get 304 Not Modified
+    response = conditional_response(body, 'image/jpeg', etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = IMAGE_MAX_AGE
+    return response
+
+def load_bird_image(object_id):
+    """Read a bird's JPEG bytes and ETag, cached since object images never change once saved."""
+    with _image_cache_lock:
+        cached = _image_cache.get(object_id)
+        if cached is not None:
+            _image_cache.move_to_end(object_id)
+            return cached
+    
+    # Misses raise OSError and are not cached, so late-arriving files still load
+    path = safe_join(str(OBJECTS_DIR), f"{object_id}.jpg")
+    if path is None:
+        raise FileNotFoundError(object_id)
+    
+    body = Path(path).read_bytes()
+    entry = (body, hashlib.blake2b(body, digest_size=16).hexdigest())
+    if len(body) > IMAGE_CACHE_BYTES:
+        return entry
+    
+    with _image_cache_lock:
+        if object_id not in _image_cache:
+            _image_cache[object_id] = entry
+            _image_cache_state['bytes'] += len(body)
+        # Evict least recently used images until back under the byte budget
+        while _image_cache_state['bytes'] > IMAGE_CACHE_BYTES:
+            _, (evicted, _) = _image_cache.popitem(last=False)
+            _image_cache_state['bytes'] -= len(evicted)
+    
+    return entry
+
+def clear_image_cache():
+    """Drop all cached bird images, e.g. when the system is re-initialized."""
+    with _image_cache_lock:
+        _image_cache.clear()
+        _image_cache_state['bytes'] = 0
+
+@app.route('/api/bird-thumbnail/<object_id>')
+def api_bird_thumbnail(object_id):
+    """Serve a small WebP thumbnail of a bird, falling back to the full image."""
+    if cached_meta_index and object_id not in cached_meta_index:
+        return PLACEHOLDER_SVG, 404, SVG_HEADERS
+    
+    try:
+        return send_from_directory(THUMBNAILS_DIR, f"{object_id}.webp", mimetype='image/webp',
+                                   conditional=True, max_age=IMAGE_MAX_AGE)
+    except (NotFound, OSError):
+        return api_bird_image(object_id)
+
+def create_thumbnails(object_ids):
+    """Write the WebP thumbnails of the given birds that don't exist yet."""
+    try:
+        THUMBNAILS_DIR.mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor() as executor:
+            list(executor.map(create_thumbnail, object_ids))
+        logger.info(f"Thumbnails ready for {len(object_ids)} birds")
+    except Exception as e:
+        logger.error(f"Failed to create thumbnails: {e}")
+
+def create_thumbnail(object_id):
+    """Write the WebP thumbnail of a bird image unless it already exists."""
+    thumbnail_path = THUMBNAILS_DIR / f"{object_id}.webp"
+    if thumbnail_path.exists():
+        return
+    
+    try:
+        with Image.open(OBJECTS_DIR / f"{object_id}.jpg") as image:
+            image.thumbnail(THUMBNAIL_SIZE)
+            image.save(thumbnail_path, 'WEBP', quality=THUMBNAIL_QUALITY)
+    except OSError as e:
+        logger.debug(f"No thumbnail for {object_id}: {e}")
 
 @app.route('/api/bird-details/<object_id>')
 def api_bird_details(object_id):
@@ -210,204 +407,182 @@ def api_bird_details(object_id):
         return jsonify({'error': 'System not initialized'})
     
     # Find the bird in our metadata
-    for i, meta in enumerate(cached_metadata):
-        if meta['object_id'] == object_id:
-            return jsonify({
-                'object_id': meta['object_id'],
-                'frame_id': meta['frame_id'],
-                'confidence': float(meta['confidence']),
-                'cluster': int(cached_clusterer.cluster_labels_[i])
-            })
+    i = cached_meta_index.get(object_id)
+    if i is None:
+        return jsonify({'error': 'Bird not found'}), 404
     
-    return jsonify({'error': 'Bird not found'}), 404
+    return jsonify(bird_details(i))
 
-def create_cluster_dashboard_html(clusters, cluster_stats):
-    """Create interactive cluster dashboard HTML."""
+@app.route('/api/birds')
+def api_birds_batch():
+    """Get details for a comma-separated list of bird IDs (?ids=...) in one request."""
+    if cached_clusterer is None or cached_metadata is None:
+        return jsonify({'error': 'System not initialized'})
     
-    # Generate cluster cards HTML
-    cluster_cards = []
-    for cluster_id in sorted(clusters.keys()):
-        birds = clusters[cluster_id]
-        stats = cluster_stats[cluster_id]
-        
-        # Generate bird thumbnails for this cluster
-        bird_thumbnails = []
-        for bird in birds:
-            bird_thumbnails.append(f"""
-                <div class="bird-thumbnail" onclick="showBirdDetails('{bird['object_id']}')">
-                    <img src="/api/bird-image/{bird['object_id']}" alt="Bird {bird['object_id']}" 
-                         onerror="this.src='data:image/svg+xml,<svg xmlns=\"http://www.w3.org/2000/svg\" width=\"60\" height=\"60\"><rect width=\"60\" height=\"60\" fill=\"%23333\"/><text x=\"30\" y=\"35\" text-anchor=\"middle\" fill=\"white\" font-size=\"12\">🐦</text></svg>'">
-                    <div class="bird-info">
-                        <div class="confidence">{bird['confidence']:.3f}</div>
-                    </div>
-                </div>
-            """)
-        
-        cluster_cards.append(f"""
-            <div class="cluster-card">
-                <div class="cluster-header">
-                    <h3>🐦 Cluster {cluster_id}</h3>
-                    <div class="cluster-stats">
-                        <span class="stat">Birds: {stats['count']}</span>
-                        <span class="stat">Avg Confidence: {stats['avg_confidence']:.3f}</span>
-                        <span class="stat">Range: {stats['confidence_range'][0]:.3f} - {stats['confidence_range'][1]:.3f}</span>
-                    </div>
-                </div>
-                <div class="birds-grid">
-                    {''.join(bird_thumbnails)}
-                </div>
-            </div>
-        """)
+    object_ids = request.args.get('ids', '').split(',')[:MAX_BATCH_IDS]
+    details = {}
+    for object_id in object_ids:
+        i = cached_meta_index.get(object_id)
+        if i is not None:
+            details[object_id] = bird_details(i)
     
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Bird Cluster Dashboard</title>
-        <style>
-            body {{
+    return jsonify(details)
+
+def bird_details(i):
+    """Get the details of the bird in row i of the cached metadata."""
+    meta = cached_metadata[i]
+    return {
+        'object_id': meta['object_id'],
+        'frame_id': meta['frame_id'],
+        'confidence': float(meta['confidence']),
+        'cluster': int(cached_clusterer.cluster_labels_[i])
+    }
+
+# Dashboard stylesheet, kept out of the per-request f-string
+_DASHBOARD_CSS = """
+            body {
                 font-family: Arial, sans-serif;
                 margin: 0;
                 padding: 20px;
                 background-color: #1a1a1a;
                 color: #ffffff;
-            }}
+            }
             
-            .container {{ 
+            .container { 
                 max-width: 1200px; 
                 margin: 0 auto; 
-            }}
+            }
             
-            h1 {{ 
+            h1 { 
                 color: #FF6B35; 
                 text-align: center; 
-            }}
+            }
             
-            .nav-links {{
+            .nav-links {
                 text-align: center;
                 margin: 20px 0;
                 padding: 10px;
                 background: #333;
                 border-radius: 8px;
-            }}
+            }
             
-            .nav-link {{
+            .nav-link {
                 color: #4CAF50;
                 text-decoration: none;
                 padding: 8px 16px;
                 border-radius: 4px;
                 font-weight: bold;
                 margin: 0 5px;
-            }}
+            }
             
-            .nav-link:hover {{
+            .nav-link:hover {
                 background: #4CAF50;
                 color: #1a1a1a;
-            }}
+            }
             
-            .nav-current {{
+            .nav-current {
                 color: #FF6B35;
                 font-weight: bold;
                 padding: 8px 16px;
-            }}
+            }
             
-            .nav-separator {{
+            .nav-separator {
                 color: #666;
                 margin: 0 10px;
-            }}
+            }
             
-            .dashboard-header {{
+            .dashboard-header {
                 text-align: center;
                 margin-bottom: 30px;
-            }}
+            }
             
-            .dashboard-summary {{
+            .dashboard-summary {
                 background: #2a2a2a;
                 padding: 20px;
                 border-radius: 8px;
                 margin-bottom: 30px;
                 text-align: center;
-            }}
+            }
             
-            .summary-stats {{
+            .summary-stats {
                 display: flex;
                 justify-content: center;
                 gap: 30px;
                 flex-wrap: wrap;
-            }}
+            }
             
-            .summary-stat {{
+            .summary-stat {
                 background: #333;
                 padding: 15px 20px;
                 border-radius: 8px;
                 min-width: 120px;
-            }}
+            }
             
-            .stat-number {{
+            .stat-number {
                 font-size: 24px;
                 font-weight: bold;
                 color: #4CAF50;
-            }}
+            }
             
-            .stat-label {{
+            .stat-label {
                 font-size: 12px;
                 color: #ccc;
                 margin-top: 5px;
-            }}
+            }
             
-            .clusters-container {{
+            .clusters-container {
                 display: grid;
                 gap: 20px;
                 grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
-            }}
+            }
             
-            .cluster-card {{
+            .cluster-card {
                 background: #2a2a2a;
                 border-radius: 12px;
                 padding: 20px;
                 border: 2px solid #333;
                 transition: border-color 0.3s ease;
-            }}
+            }
             
-            .cluster-card:hover {{
+            .cluster-card:hover {
                 border-color: #4CAF50;
-            }}
+            }
             
-            .cluster-header {{
+            .cluster-header {
                 display: flex;
                 justify-content: space-between;
                 align-items: center;
                 margin-bottom: 15px;
                 flex-wrap: wrap;
-            }}
+            }
             
-            .cluster-header h3 {{
+            .cluster-header h3 {
                 margin: 0;
                 color: #4CAF50;
                 font-size: 18px;
-            }}
+            }
             
-            .cluster-stats {{
+            .cluster-stats {
                 display: flex;
                 gap: 15px;
                 flex-wrap: wrap;
-            }}
+            }
             
-            .stat {{
+            .stat {
                 background: #333;
                 padding: 5px 10px;
                 border-radius: 4px;
                 font-size: 12px;
                 color: #ccc;
-            }}
+            }
             
-            .birds-grid {{
+            .birds-grid {
                 display: grid;
                 grid-template-columns: repeat(auto-fill, minmax(80px, 1fr));
                 gap: 10px;
-            }}
+            }
             
-            .bird-thumbnail {{
+            .bird-thumbnail {
                 background: #333;
                 border-radius: 8px;
                 padding: 8px;
@@ -415,32 +590,32 @@ def create_cluster_dashboard_html(clusters, cluster_stats):
                 cursor: pointer;
                 transition: all 0.3s ease;
                 position: relative;
-            }}
+            }
             
-            .bird-thumbnail:hover {{
+            .bird-thumbnail:hover {
                 background: #4CAF50;
                 transform: translateY(-2px);
-            }}
+            }
             
-            .bird-thumbnail img {{
+            .bird-thumbnail img {
                 width: 60px;
                 height: 60px;
                 object-fit: cover;
                 border-radius: 4px;
                 background: #444;
-            }}
+            }
             
-            .bird-info {{
+            .bird-info {
                 margin-top: 5px;
-            }}
+            }
             
-            .confidence {{
+            .confidence {
                 font-size: 10px;
                 color: #ccc;
                 font-weight: bold;
-            }}
+            }
             
-            .modal {{
+            .modal {
                 display: none;
                 position: fixed;
                 z-index: 1000;
@@ -449,9 +624,9 @@ def create_cluster_dashboard_html(clusters, cluster_stats):
                 width: 100%;
                 height: 100%;
                 background-color: rgba(0,0,0,0.8);
-            }}
+            }
             
-            .modal-content {{
+            .modal-content {
                 background-color: #2a2a2a;
                 margin: 5% auto;
                 padding: 20px;
@@ -459,20 +634,97 @@ def create_cluster_dashboard_html(clusters, cluster_stats):
                 width: 80%;
                 max-width: 500px;
                 color: white;
-            }}
+            }
             
-            .close {{
+            .close {
                 color: #aaa;
                 float: right;
                 font-size: 28px;
                 font-weight: bold;
                 cursor: pointer;
-            }}
+            }
             
-            .close:hover {{
+            .close:hover {
                 color: #fff;
-            }}
-        </style>
+            }
+"""
+
+# Fallback image shown when a bird thumbnail fails to load
+_THUMBNAIL_PLACEHOLDER = 'this.src=\'data:image/svg+xml,<svg xmlns="http://www.w3.org/2000/svg" width="60" height="60"><rect width="60" height="60" fill="%23333"/><text x="30" y="35" text-anchor="middle" fill="white" font-size="12">🐦</text></svg>\''
+
+def inline_image_src(object_id):
+    """Get a bird's thumbnail (or full image) as a base64 data URL, or None if neither can be read."""
+    for path, mimetype in ((THUMBNAILS_DIR / f"{object_id}.webp", 'image/webp'),
+                           (OBJECTS_DIR / f"{object_id}.jpg", 'image/jpeg')):
+        try:
+            with open(path, 'rb') as f:
+                return f"data:{mimetype};base64," + base64.b64encode(f.read()).decode('ascii')
+        except OSError:
+            continue
+    return None
+
+def create_cluster_dashboard_html(clusters, cluster_stats):
+    """Create interactive cluster dashboard HTML."""
+    
+    # Inline thumbnails turn one request per bird into a single (larger) page
+    inline_thumbnails = cached_config.inline_thumbnails if cached_config else False
+    
+    # Generate cluster cards HTML
+    cluster_cards = []
+    for cluster_id in sorted(clusters.keys()):
+        birds = clusters[cluster_id]
+        stats = cluster_stats[cluster_id]
+        
+        # Generate bird thumbnails for this cluster; only the object ID and
+        # confidence vary per bird, the rest comes from module constants
+        bird_thumbnails = []
+        append_thumbnail = bird_thumbnails.append
+        for bird in birds:
+            object_id = bird['object_id']
+            inline_src = inline_image_src(object_id) if inline_thumbnails else None
+            if inline_src is not None:
+                image_src = inline_src
+                image_fallback = _THUMBNAIL_PLACEHOLDER
+            elif HAS_WHITENOISE:
+                # Thumbnails written after startup are not indexed by
+                # WhiteNoise: retry those once through the Flask route
+                image_src = f"/{BIRD_STATIC_PREFIX}{object_id}.webp"
+                image_fallback = f"this.onerror=null;this.src='/api/bird-thumbnail/{object_id}'"
+            else:
+                image_src = f"/api/bird-thumbnail/{object_id}"
+                image_fallback = _THUMBNAIL_PLACEHOLDER
+            append_thumbnail(f"""
+                <div class="bird-thumbnail" data-object-id="{object_id}" onclick="showBirdDetails('{object_id}')">
+                    <img src="{image_src}" alt="Bird {object_id}" 
+                         onerror="{image_fallback}">
+                    <div class="bird-info">
+                        <div class="confidence">{bird['confidence']:.3f}</div>
+                    </div>
+                </div>
+            """)
+        
+        cluster_cards.append(f"""
+            <div class="cluster-card">
+                <div class="cluster-header">
+                    <h3>🐦 Cluster {cluster_id}</h3>
+                    <div class="cluster-stats">
+                        <span class="stat">Birds: {stats['count']}</span>
+                        <span class="stat">Avg Confidence: {stats['avg_confidence']:.3f}</span>
+                        <span class="stat">Range: {stats['confidence_range'][0]:.3f} - {stats['confidence_range'][1]:.3f}</span>
+                    </div>
+                </div>
+                <div class="birds-grid">
+                    {''.join(bird_thumbnails)}
+                </div>
+            </div>
+        """)
+    
+    html = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Bird Cluster Dashboard</title>
+        <style>{_DASHBOARD_CSS}        </style>
     </head>
     <body>
         <div class="container">
@@ -544,6 +796,34 @@ def create_cluster_dashboard_html(clusters, cluster_stats):
         </div>
         
         <script>
+            const birdDetailsCache = {{}};
+            
+            function loadBirdDetails(objectId) {{
+                if (birdDetailsCache[objectId]) {{
+                    return Promise.resolve(birdDetailsCache[objectId]);
+                }}
+                
+                // Fetch the details of the clicked bird's whole cluster in one
+                // request, so further clicks in that cluster need none
+                const thumbnail = document.querySelector(`.bird-thumbnail[data-object-id="${{objectId}}"]`);
+                const grid = thumbnail ? thumbnail.closest('.birds-grid') : null;
+                const ids = grid
+                    ? Array.from(grid.querySelectorAll('.bird-thumbnail'), el => el.dataset.objectId)
+                          .filter(id => id !== objectId).slice(0, {MAX_BATCH_IDS - 1})
+                    : [];
+                ids.push(objectId);
+                
+                return fetch(`/api/birds?ids=${{encodeURIComponent(ids.join(','))}}`)
+                    .then(response => response.json())
+                    .then(data => {{
+                        Object.assign(birdDetailsCache, data);
+                        if (!birdDetailsCache[objectId]) {{
+                            throw new Error('Bird not found');
+                        }}
+                        return birdDetailsCache[objectId];
+                    }});
+            }}
+            
             function showBirdDetails(objectId) {{
                 const modal = document.getElementById('birdModal');
                 const details = document.getElementById('birdDetails');
@@ -552,8 +832,7 @@ def create_cluster_dashboard_html(clusters, cluster_stats):
                 modal.style.display = 'block';
                 
                 // Load bird details
-                fetch(`/api/bird-details/${{objectId}}`)
-                    .then(response => response.json())
+                loadBirdDetails(objectId)
                     .then(data => {{
                         details.innerHTML = `
                             <h3>🐦 Bird Details</h3>
@@ -587,6 +866,17 @@ def create_cluster_dashboard_html(clusters, cluster_stats):
     
     return html
 
+def create_app():
+    """
+    App factory for WSGI servers (see serve.py). With gunicorn --preload the
+    clustering runs once in the master and forked workers share the cached
+    arrays copy-on-write.
+    """
+    if cached_config and cached_config.auto_initialize and cached_clusterer is None:
+        logger.info("Auto-initializing system...")
+        initialize_system()
+    return app
+
 if __name__ == '__main__':
     # Use configuration for server settings
     config = cached_config if cached_config else load_clustering_config()
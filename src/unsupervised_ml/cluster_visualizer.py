@@ -19,6 +19,12 @@ class ClusterVisualizer:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # The clusterer is fitted and not refitted, so its plot data and the
+        # rendered scatter page are built once (a new clusterer gets a new
+        # visualizer)
+        self._df = None
+        self._scatter_html = None
+        
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         
@@ -28,19 +34,8 @@ class ClusterVisualizer:
     def create_scatter_plot(self, title: str = "Bird Clustering Results", 
                            save_html: bool = True) -> go.Figure:
         """Create interactive scatter plot of clustering results."""
-        if self.clusterer.features_2d_ is None:
-            raise ValueError("2D features not available. Run clustering first.")
-        
-        df = pd.DataFrame({
-            'x': self.clusterer.features_2d_[:, 0],
-            'y': self.clusterer.features_2d_[:, 1],
-            'cluster': self.clusterer.cluster_labels_,
-            'object_id': [meta['object_id'] for meta in self.clusterer.metadata_],
-            'confidence': [meta['confidence'] for meta in self.clusterer.metadata_],
-        })
-        
         fig = px.scatter(
-            df, x='x', y='y', 
+            self._get_dataframe(), x='x', y='y', 
             color='cluster',
             hover_data=['object_id', 'confidence'],
             title=title,
@@ -56,6 +51,28 @@ class ClusterVisualizer:
         
         return fig
     
+    def get_html(self) -> str:
+        """Get the scatter plot as an HTML page, rendering it only once."""
+        if self._scatter_html is None:
+            fig = self.create_scatter_plot(save_html=False)
+            self._scatter_html = fig.to_html(include_plotlyjs='cdn')
+        return self._scatter_html
+    
+    def _get_dataframe(self) -> pd.DataFrame:
+        """Get the per-object plot data, building it on first use."""
+        if self.clusterer.features_2d_ is None:
+            raise ValueError("2D features not available. Run clustering first.")
+        
+        if self._df is None:
+            self._df = pd.DataFrame({
+                'x': self.clusterer.features_2d_[:, 0],
+                'y': self.clusterer.features_2d_[:, 1],
+                'cluster': self.clusterer.cluster_labels_,
+                'object_id': self.clusterer.object_ids_,
+                'confidence': self.clusterer.confidences_,
+            })
+        return self._df
+    
     
     
     def save_all_visualizations(self, similarity_threshold: float = 0.8):
@@ -29,11 +29,19 @@ class ClusteringConfig:
     average_balanced: float
     average_permissive: float
     
+    # kNN connectivity graph for hierarchical clustering (0 = unconstrained)
+    connectivity_k: int
+    
+    # Cluster near-duplicate feature vectors once
+    deduplicate: bool
+    dedup_tol: float
+    
     # Evaluation settings
     min_species: int
     max_species: int
     sweet_spot_min: int
     sweet_spot_max: int
+    silhouette_sample_size: int
     
     # Scoring weights
     silhouette_weight: float
@@ -53,6 +61,7 @@ class ClusteringConfig:
     port: int
     debug_mode: bool
     auto_initialize: bool
+    inline_thumbnails: bool
     
     # Data management
     mongodb_uri: str
@@ -63,6 +72,7 @@ class ClusteringConfig:
     max_objects_per_batch: int
     cache_features: bool
     n_jobs: int
+    scratch_dir: Optional[str]
     
     # Logging
     log_level: str
@@ -141,11 +151,19 @@ class ConfigLoader:
                 average_balanced=average_config.get('balanced_threshold', 70.0),
                 average_permissive=average_config.get('permissive_threshold', 85.0),
                 
+                # Connectivity
+                connectivity_k=clustering_config.get('connectivity_k', 0),
+                
+                # Deduplication
+                deduplicate=clustering_config.get('deduplicate', False),
+                dedup_tol=clustering_config.get('dedup_tol', 0.01),
+                
                 # Evaluation
                 min_species=ideal_range.get('min_species', 2),
                 max_species=ideal_range.get('max_species', 6),
                 sweet_spot_min=ideal_range.get('sweet_spot_min', 2),
                 sweet_spot_max=ideal_range.get('sweet_spot_max', 6),
+                silhouette_sample_size=eval_config.get('silhouette_sample_size', 2000),
                 
                 # Scoring
                 silhouette_weight=scoring_weights.get('silhouette_weight', 1.0),
@@ -165,6 +183,7 @@ class ConfigLoader:
                 port=web_config.get('port', 3002),
                 debug_mode=web_config.get('debug_mode', False),
                 auto_initialize=web_config.get('auto_initialize', False),
+                inline_thumbnails=web_config.get('inline_thumbnails', False),
                 
                 # Data
                 mongodb_uri=data_config.get('mongodb_uri', 'mongodb://localhost:27017/'),
@@ -175,6 +194,7 @@ class ConfigLoader:
                 max_objects_per_batch=perf_config.get('max_objects_per_batch', 100),
                 cache_features=perf_config.get('cache_features', True),
                 n_jobs=perf_config.get('n_jobs', -1),
+                scratch_dir=perf_config.get('scratch_dir'),
                 
                 # Logging
                 log_level=log_config.get('level', 'INFO'),
@@ -220,12 +240,20 @@ class ConfigLoader:
         if not (config.average_conservative <= config.average_balanced <= config.average_permissive):
             self.logger.warning("Average thresholds not in ascending order (conservative ≤ balanced ≤ permissive)")
         
+        if config.connectivity_k < 0:
+            raise ValueError("connectivity_k must not be negative")
+        if config.dedup_tol <= 0:
+            raise ValueError("dedup_tol must be positive")
+        
         # Validate species ranges
         if config.min_species < 1:
             raise ValueError("min_species must be at least 1")
         if config.max_species <= config.min_species:
             raise ValueError("max_species must be greater than min_species")
             
+        if config.silhouette_sample_size < 2:
+            raise ValueError("silhouette_sample_size must be at least 2")
+            
         # Validate confidence
         if not (0.0 <= config.min_confidence <= 1.0):
             raise ValueError("min_confidence must be between 0.0 and 1.0")
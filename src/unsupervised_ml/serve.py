@@ -0,0 +1,49 @@
+"""
+Production entry point for the bird clustering server.
+
+Runs cluster_server under gunicorn when it is installed, falling back to
+Flask's threaded development server otherwise.
+"""
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+from config_loader import load_clustering_config
+
+# Threads per gunicorn worker; thumbnail requests are I/O-bound
+THREADS_PER_WORKER = 4
+
+
+def main():
+    config = load_clustering_config()
+    bind = f"{config.host}:{config.port}"
+    
+    gunicorn = shutil.which("gunicorn")
+    if gunicorn is None:
+        print("gunicorn not found, falling back to the Flask development server")
+        from cluster_server import create_app
+        create_app().run(host=config.host, port=config.port, debug=config.debug_mode, threaded=True)
+        return
+    
+    # /initialize only updates the worker that serves it, so several workers
+    # are only safe when the clustering is preloaded at startup
+    workers = (os.cpu_count() or 1) if config.auto_initialize else 1
+    
+    print(f"🔬 Starting Bird Clustering Server on http://{bind} "
+          f"({workers} workers x {THREADS_PER_WORKER} threads)")
+    
+    os.chdir(Path(__file__).resolve().parent)
+    os.execv(gunicorn, [
+        gunicorn,
+        "--workers", str(workers),
+        "--threads", str(THREADS_PER_WORKER),
+        "--bind", bind,
+        "--preload",
+        "cluster_server:create_app()",
+    ])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,6 +18,7 @@ import os
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import json
+from collections import Counter
 from config_loader import load_clustering_config, ClusteringConfig
 
 class BirdDataset(Dataset):
@@ -194,10 +195,13 @@ class SupervisedBirdTrainer:
             self.logger.error("No valid image paths found")
             return False
             
-        self.logger.info(f"Found {len(image_paths)} images with {len(set(labels))} clusters")
+        # Per-cluster sample counts in a single pass over the labels
+        label_counts = dict(Counter(labels))
+        
+        self.logger.info(f"Found {len(image_paths)} images with {len(label_counts)} clusters")
         
         # Create model with correct number of classes
-        n_classes = self.n_classes_override if self.n_classes_override is not None else len(set(labels))
+        n_classes = self.n_classes_override if self.n_classes_override is not None else len(label_counts)
         self.model = BirdClassifier(
             n_classes=n_classes,
             model_name=self.config.model_name,
@@ -207,7 +211,6 @@ class SupervisedBirdTrainer:
         self.logger.info(f"Created model with {n_classes} classes")
         
         # Check if stratified split is possible (each class needs at least 2 samples)
-        label_counts = {label: labels.count(label) for label in set(labels)}
         min_class_size = min(label_counts.values())
         can_stratify = min_class_size >= 2
         
@@ -246,7 +249,7 @@ class SupervisedBirdTrainer:
             )
             
             # Check if we can do stratified split for validation
-            train_label_counts = {label: train_labels.count(label) for label in set(train_labels)}
+            train_label_counts = Counter(train_labels)
             can_stratify_val = min(train_label_counts.values()) >= 2
             
             if len(train_paths) >= 4 and can_stratify_val:
@@ -298,7 +301,7 @@ class SupervisedBirdTrainer:
             'train_size': len(train_dataset),
             'val_size': len(val_dataset),
             'test_size': len(test_dataset),
-            'cluster_distribution': {str(label): labels.count(label) for label in set(labels)}
+            'cluster_distribution': {str(label): count for label, count in label_counts.items()}
         }
         
         return True
@@ -0,0 +1,100 @@
+"""
+Tests for BirdClusterer.
+
+Checks that cutting a shared linkage tree (fit_predict_from_linkage, used by
+ClusteringExperiment and the cluster server) partitions the birds exactly as
+fit_predict does, plus edge cases of the summary and distance helpers.
+"""
+
+import os
+import sys
+import dataclasses
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("scipy")
+pytest.importorskip("pandas")
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scipy.cluster.hierarchy import linkage
+from bird_clusterer import BirdClusterer
+from config_loader import load_clustering_config
+
+# Three well-separated blobs of birds
+N_PER_CLUSTER = 20
+N_FEATURES = 16
+
+
+@pytest.fixture
+def config():
+    """Repo configuration with a fast 2D reduction and no connectivity graph."""
+    return dataclasses.replace(load_clustering_config(), reduction_method='pca', connectivity_k=0,
+                               deduplicate=False, scratch_dir=None)
+
+
+@pytest.fixture
+def birds():
+    """Features and metadata of three separated clusters of birds."""
+    rng = np.random.default_rng(0)
+    centers = rng.normal(scale=10.0, size=(3, N_FEATURES))
+    features = np.vstack([center + rng.normal(size=(N_PER_CLUSTER, N_FEATURES)) for center in centers])
+    metadata = [{'object_id': f"bird_{i}", 'frame_id': f"frame_{i // 2}", 'confidence': 0.5 + (i % 5) / 10}
+                for i in range(len(features))]
+    return features, metadata
+
+
+def canonical(labels):
+    """Relabel clusters by order of first appearance, so partitions compare equal."""
+    _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    return np.argsort(np.argsort(first))[inverse]
+
+
+@pytest.mark.parametrize('method, linkage_method', [('ward_distance', 'ward'),
+                                                     ('average_distance', 'average')])
+def test_fit_predict_from_linkage_matches_fit_predict(config, birds, method, linkage_method):
+    features, metadata = birds
+
+    shared = BirdClusterer(config)
+    features_scaled = shared.preprocess_features(features)
+
+    # Cut in the middle of the gap where the three blobs are merged
+    heights = linkage(features_scaled, linkage_method)[:, 2]
+    threshold = float((heights[-3] + heights[-2]) / 2)
+
+    labels_linkage, _ = shared.fit_predict_from_linkage(features_scaled, metadata, method=method,
+                                                        distance_threshold=threshold)
+    labels_direct, _ = BirdClusterer(config).fit_predict(features, metadata, method=method,
+                                                         distance_threshold=threshold)
+
+    assert len(np.unique(labels_linkage)) == 3
+    np.testing.assert_array_equal(canonical(labels_linkage), canonical(labels_direct))
+
+
+def test_cluster_summary_with_noise_labels(config, birds):
+    features, metadata = birds
+    clusterer = BirdClusterer(config)
+    clusterer.fit_predict(features, metadata)
+
+    labels = np.zeros(len(features), dtype=int)
+    labels[:5] = -1
+    clusterer.cluster_labels_ = labels
+
+    summary = clusterer.get_cluster_summary()
+
+    assert list(summary.index) == [-1, 0]
+    assert summary.loc[-1, 'n_objects'] == 5
+    assert summary.loc[0, 'n_objects'] == len(features) - 5
+    assert summary.loc[-1, 'frame_id_nunique'] == 3  # birds 0-4 are in frames 0, 1 and 2
+
+
+def test_condensed_distances_single_point(config, tmp_path):
+    clusterer = BirdClusterer(dataclasses.replace(config, scratch_dir=str(tmp_path)))
+
+    assert clusterer._condensed_distances(np.zeros((1, N_FEATURES))).shape == (0,)
+    assert clusterer._scratch_array((0,), np.float64).shape == (0,)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,92 @@
+"""
+Tests for the cluster server's JSON endpoints.
+
+Fills the server's caches with a small clustering result directly, so no
+MongoDB or feature extraction is needed, and checks /api/objects and the
+batched /api/birds endpoint.
+"""
+
+import os
+import sys
+import json
+from datetime import datetime
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import cluster_server
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client for a server holding three clustered birds."""
+    metadata = [{'object_id': f"bird_{i}", 'frame_id': f"frame_{i}", 'confidence': 0.9 - i / 10,
+                 'timestamp': datetime(2024, 5, 1, 12, 0, i)}
+                for i in range(3)]
+    clusterer = SimpleNamespace(cluster_labels_=np.array([0, 1, 0]),
+                                features_2d_=np.array([[0.123456, -1.0], [2.5, 3.987654], [-0.5, 0.0]]))
+
+    objects_json = cluster_server.serialize_objects(metadata, clusterer)
+    monkeypatch.setattr(cluster_server, 'cached_metadata', metadata)
+    monkeypatch.setattr(cluster_server, 'cached_meta_index', {meta['object_id']: i for i, meta in enumerate(metadata)})
+    monkeypatch.setattr(cluster_server, 'cached_clusterer', clusterer)
+    monkeypatch.setattr(cluster_server, 'cached_objects_json', objects_json)
+    monkeypatch.setattr(cluster_server, 'cached_objects_etag', "test-etag")
+
+    return cluster_server.app.test_client()
+
+
+def test_api_objects_serializes_metadata(client):
+    response = client.get('/api/objects')
+    objects = response.get_json()
+
+    assert response.status_code == 200
+    assert [obj['object_id'] for obj in objects] == ['bird_0', 'bird_1', 'bird_2']
+    assert [obj['cluster'] for obj in objects] == [0, 1, 0]
+    # Coordinates are rounded to COORD_DECIMALS for transport
+    assert objects[0]['x'] == 0.123 and objects[1]['y'] == 3.988
+    # Mongo timestamps are encoded as HTTP dates, as jsonify does
+    assert objects[2]['timestamp'] == 'Wed, 01 May 2024 12:00:02 GMT'
+
+
+def test_api_objects_without_orjson(client, monkeypatch):
+    monkeypatch.setattr(cluster_server, 'HAS_ORJSON', False)
+    objects = json.loads(cluster_server.serialize_objects(cluster_server.cached_metadata,
+                                                          cluster_server.cached_clusterer))
+
+    assert objects == client.get('/api/objects').get_json()
+
+
+def test_api_objects_not_modified(client):
+    response = client.get('/api/objects', headers={'If-None-Match': '"test-etag"'})
+
+    assert response.status_code == 304
+
+
+def test_api_birds_batch(client):
+    response = client.get('/api/birds?ids=bird_2,unknown,bird_0')
+    details = response.get_json()
+
+    assert response.status_code == 200
+    assert set(details) == {'bird_0', 'bird_2'}
+    assert details['bird_2'] == {'object_id': 'bird_2', 'frame_id': 'frame_2',
+                                 'confidence': pytest.approx(0.7), 'cluster': 0}
+    assert details == {object_id: client.get(f'/api/bird-details/{object_id}').get_json()
+                       for object_id in details}
+
+
+def test_api_birds_batch_is_capped(client, monkeypatch):
+    monkeypatch.setattr(cluster_server, 'MAX_BATCH_IDS', 1)
+
+    details = client.get('/api/birds?ids=bird_0,bird_1').get_json()
+
+    assert list(details) == ['bird_0']
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))